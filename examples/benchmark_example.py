@@ -0,0 +1,249 @@
+if __name__ == "__main__":
+    import sys
+    import os
+
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import random
+import time
+from functools import partial
+from datetime import date, timedelta
+from ortools.sat.python import cp_model
+from frjmp.model.adapter import DailyAdapter, ShiftAdapter, WeeklyAdapter
+from frjmp.model.sets.need import Need
+from frjmp.model.sets.phase import Phase
+from frjmp.model.sets.unit import Unit, UnitType
+from frjmp.model.sets.position import Position
+from frjmp.model.sets.job import Job
+from frjmp.model.problem import Problem
+from frjmp.model.heuristic import build_greedy_plan
+from frjmp.model.parameters.positions_configuration import PositionsConfiguration
+from frjmp.model.parameters.position_unit_model import PositionsUnitTypeDependency
+from frjmp.model.multiresolution import CoarseToFineSolver
+
+
+def symmetric_instance(n_groups=3, group_size=3, n_positions=9):
+    """Groups of units with identical job sequences alternating between two needs."""
+    a_need = Need("A")
+    b_need = Need("B")
+    a_phase = Phase("Phase A", a_need)
+    b_phase = Phase("Phase B", b_need)
+    unit_type = UnitType("Type")
+    origin = date(2025, 1, 1)
+    time_adapter = DailyAdapter(origin)
+
+    gate = Position("Gate", [a_need, b_need])
+    positions = (
+        [gate]
+        + [Position(f"A{i}", [a_need]) for i in range(n_positions)]
+        + [Position(f"B{i}", [b_need]) for i in range(n_positions)]
+    )
+    jobs = []
+    for g in range(n_groups):
+        for u in range(group_size):
+            unit = Unit(f"Unit {g}-{u}", unit_type)
+            start = g
+            for k in range(4):
+                phase = a_phase if k % 2 == 0 else b_phase
+                end = start + 3
+                jobs.append(
+                    Job(
+                        unit,
+                        phase,
+                        time_adapter,
+                        origin + timedelta(days=start),
+                        origin + timedelta(days=end),
+                    )
+                )
+                start = end + 1
+
+    conf = PositionsConfiguration(positions)
+    pos_unit_dep = PositionsUnitTypeDependency([unit_type], positions)
+    return jobs, conf, pos_unit_dep, time_adapter
+
+
+def shift_instance(n_units=10, jobs_per_unit=4, n_positions=12, seed=0):
+    """Random job sequences planned in shifts over a couple of months."""
+    rnd = random.Random(seed)
+    a_need = Need("A")
+    b_need = Need("B")
+    phases = [Phase("Phase A", a_need), Phase("Phase B", b_need)]
+    unit_type = UnitType("Type")
+    time_adapter = ShiftAdapter(
+        (date(2025, 1, 1), "Morning"), ["Morning", "Evening", "Night"]
+    )
+
+    positions = [
+        Position(f"P{i}", [a_need, b_need] if i % 3 else [a_need])
+        for i in range(n_positions)
+    ]
+    jobs = []
+    for u in range(n_units):
+        unit = Unit(f"Unit {u}", unit_type)
+        start = rnd.randint(0, 20)
+        for _ in range(jobs_per_unit):
+            end = start + rnd.randint(6, 60)
+            jobs.append(
+                Job(
+                    unit,
+                    rnd.choice(phases),
+                    time_adapter,
+                    time_adapter.from_tick(start),
+                    time_adapter.from_tick(end),
+                )
+            )
+            start = end + 1
+
+    conf = PositionsConfiguration(positions)
+    pos_unit_dep = PositionsUnitTypeDependency([unit_type], positions)
+    return jobs, conf, pos_unit_dep, time_adapter
+
+
+def tight_instance(n_units=12, n_positions=8, horizon=60, seed=0):
+    """
+    Random jobs kept only while every need still fits in the positions covering it, so
+    the positions are close to full most of the time.
+    """
+    rnd = random.Random(seed)
+    a_need = Need("A")
+    b_need = Need("B")
+    phases = [Phase("Phase A", a_need), Phase("Phase B", b_need)]
+    unit_type = UnitType("Type")
+    origin = date(2025, 1, 1)
+    time_adapter = DailyAdapter(origin)
+
+    positions = [
+        Position(f"P{i}", [a_need, b_need] if i % 2 else [a_need])
+        for i in range(n_positions)
+    ]
+    capacity = {"A": n_positions, "B": n_positions // 2}
+    demand = {"A": [0] * (horizon + 1), "B": [0] * (horizon + 1)}
+    total = [0] * (horizon + 1)
+    jobs = []
+    for u in range(n_units):
+        unit = Unit(f"Unit {u}", unit_type)
+        start = rnd.randint(0, 5)
+        while start < horizon:
+            end = min(horizon, start + rnd.randint(2, 12))
+            phase = rnd.choice(phases)
+            need = phase.required_need.name
+            days = range(start, end + 1)
+            if all(
+                demand[need][d] < capacity[need] and total[d] < n_positions
+                for d in days
+            ):
+                for d in days:
+                    demand[need][d] += 1
+                    total[d] += 1
+                jobs.append(
+                    Job(
+                        unit,
+                        phase,
+                        time_adapter,
+                        origin + timedelta(days=start),
+                        origin + timedelta(days=end),
+                    )
+                )
+            start = end + 1 + rnd.randint(0, 2)
+
+    conf = PositionsConfiguration(positions)
+    pos_unit_dep = PositionsUnitTypeDependency([unit_type], positions)
+    return jobs, conf, pos_unit_dep, time_adapter
+
+
+class FirstSolutions(cp_model.CpSolverSolutionCallback):
+    """Wall time and objective of every solution found."""
+
+    def __init__(self):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self.start = time.time()
+        self.solutions = []
+
+    def on_solution_callback(self):
+        self.solutions.append(
+            (round(time.time() - self.start, 2), self.ObjectiveValue())
+        )
+
+
+def run_coarse_to_fine(instance, coarse_adapter, to_coarse, time_limit=60):
+    """Fine solve hinted with a coarse plan vs. hinted with the greedy plan."""
+    results = {}
+    for name in ("greedy", "coarse_to_fine"):
+        jobs, conf, pos_unit_dep, time_adapter = instance()
+        problem = Problem(jobs, conf, pos_unit_dep, time_adapter)
+        problem.build_model()
+        start = time.time()
+        if name == "greedy":
+            problem.add_pattern_hints(build_greedy_plan(problem).patterns)
+        else:
+            driver = CoarseToFineSolver(problem, coarse_adapter, to_coarse)
+            problem.add_pattern_hints(driver.solve_coarse(coarse_time_limit=10))
+        callback = FirstSolutions()
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit
+        status = solver.Solve(problem.model, callback)
+        results[name] = dict(
+            status=solver.StatusName(status),
+            objective=solver.ObjectiveValue(),
+            hint_time=round(callback.start - start, 2),
+            first=callback.solutions[0],
+            best=callback.solutions[-1],
+        )
+    return results
+
+
+def run(instance, time_limit=120, **solver_properties):
+    """Build and solve an instance with the given Problem solver properties."""
+    jobs, conf, pos_unit_dep, time_adapter = instance()
+    problem = Problem(jobs, conf, pos_unit_dep, time_adapter)
+    for name, value in solver_properties.items():
+        setattr(problem, name, value)
+    problem.build_model()
+
+    solver = cp_model.CpSolver()
+    problem.configure_solver(solver)
+    solver.parameters.max_time_in_seconds = time_limit
+    callback = FirstSolutions()
+    status = solver.Solve(problem.model, callback)
+    return dict(
+        status=solver.StatusName(status),
+        objective=solver.ObjectiveValue(),
+        bound=solver.BestObjectiveBound(),
+        wall_time=round(time.time() - callback.start, 2),
+        first=callback.solutions[0] if callback.solutions else None,
+    )
+
+
+if __name__ == "__main__":
+    # Symmetry breaking: same optimum, shorter proof.
+    for symmetry_breaking in (False, True):
+        result = run(
+            symmetric_instance,
+            USE_GREEDY_HINT=False,
+            USE_SYMMETRY_BREAKING=symmetry_breaking,
+        )
+        print(f"USE_SYMMETRY_BREAKING={symmetry_breaking}: {result}")
+
+    # Capacity cuts on tight instances: (time, objective) of the first solution.
+    for seed in range(3):
+        for capacity_cuts in (False, True):
+            result = run(
+                partial(tight_instance, seed=seed),
+                time_limit=60,
+                USE_CAPACITY_CUTS=capacity_cuts,
+            )
+            print(f"seed={seed} USE_CAPACITY_CUTS={capacity_cuts}: {result}")
+
+    # Chronological decision strategy vs. default search.
+    for strategy in ("default", "chronological", "chronological_fixed"):
+        result = run(
+            partial(tight_instance, seed=0), time_limit=60, SEARCH_STRATEGY=strategy
+        )
+        print(f"SEARCH_STRATEGY={strategy}: {result}")
+
+    # Coarse-to-fine: shift plan hinted with a weekly plan. (time, objective) pairs.
+    results = run_coarse_to_fine(
+        shift_instance, WeeklyAdapter(date(2025, 1, 1)), lambda value: value[0]
+    )
+    for name, result in results.items():
+        print(f"{name}: {result}")
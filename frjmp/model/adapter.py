@@ -79,10 +79,6 @@ class MinuteStepAdapter:
 
 
 class WeeklyAdapter(DailyAdapter):
-    def validate_time_value_type(self, value: Any, name: str = "value") -> None:
-        if not isinstance(value, int):
-            raise TypeError(f"{name} must be int. Got {value}")
-
     def to_tick(self, d: date) -> int:
         return super().to_tick(d) // 7
 
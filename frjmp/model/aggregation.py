@@ -0,0 +1,271 @@
+from collections import defaultdict
+from typing import Dict, List
+
+from frjmp.model.constraints.symmetry import find_equivalent_positions
+from frjmp.model.parameters.position_unit_model import (
+    Pattern,
+    PositionsUnitTypeDependency,
+)
+from frjmp.model.parameters.positions_configuration import PositionsConfiguration
+from frjmp.model.sets.job import Job
+from frjmp.model.sets.position import Position
+from frjmp.model.sets.unit import Unit, UnitType
+
+
+class PositionAggregation:
+    """
+    Presolve stage pooling interchangeable positions into one capacity resource.
+
+    Positions grouped by find_equivalent_positions (same needs, only used in single
+    position patterns, not referenced by triggers, paths or the OUT gate) with capacity 1
+    are pooled, unless a fixed variable references them. The pooled problem (`pooled`) is
+    a regular Problem where each class is one position with capacity = class size and the
+    single patterns of the class are one pattern, so it has far fewer assigned_vars,
+    movement_in_position_vars and hops.
+
+    Units staying in a pool are not moved by the units entering or leaving it. With
+    capacity 1 positions a unit entering a concrete position never finds a staying unit
+    there, so the pooled problem has the same optimal objective as the concrete one.
+
+    `disaggregate` splits a pooled plan back onto the concrete positions: units staying in
+    a pool keep their position and units entering it take a free one, which always exists
+    because the pool capacity is respected.
+    """
+
+    def __init__(self, problem):
+        self.concrete = problem
+        positions = problem.positions
+        _, fixed_positions = problem.fixed_units_and_positions()
+        # Final conditions name concrete positions the disaggregation could not honor.
+        if problem.final_conditions is not None:
+            for assigned in problem.final_conditions["assignments"].values():
+                fixed_positions.update(position.name for position in assigned)
+        classes = find_equivalent_positions(
+            positions,
+            problem.positions_configuration,
+            problem.unit_types,
+            fixed_positions,
+        )
+        self.classes: List[List[str]] = [
+            [positions[p_idx].name for p_idx in indices]
+            for indices in classes
+            if positions[indices[0]].capacity == 1
+        ]
+
+        # Concrete position name -> pooled Position.
+        by_name = {p.name: p for p in positions}
+        self.pool_of: Dict[str, Position] = {}
+        self.members: Dict[str, List[str]] = {}  # pool name -> concrete position names
+        for names in self.classes:
+            first = by_name[names[0]]
+            pool = Position("/".join(names), first.available_needs, len(names))
+            self.members[pool.name] = names
+            for name in names:
+                self.pool_of[name] = pool
+
+        conf = problem.positions_configuration
+        pooled_conf = PositionsConfiguration(
+            self._pooled_list(conf.positions),
+            out_position=conf.out_position,
+            triggers=dict(conf.triggers),
+            out_paths=dict(conf.out_paths),
+            in_paths=dict(conf.in_paths),
+        )
+
+        # Pooled UnitTypes keep the pattern order, so allowed_patterns[0] is still the gate.
+        self.unit_types: Dict[UnitType, UnitType] = {}  # concrete -> pooled
+        self.to_pooled = {}  # (concrete UnitType, k_idx) -> pooled k_idx
+        self.concrete_pattern = {}  # (concrete UnitType, position name) -> k_idx of [p]
+        for unit_type in problem.unit_types:
+            pooled_type = UnitType(unit_type.name)
+            pooled_index = {}  # pattern position names -> pooled k_idx
+            for k_idx, pattern in enumerate(unit_type.allowed_patterns):
+                pooled_positions = self._pooled_list(pattern.positions)
+                key = tuple(p.name for p in pooled_positions)
+                if key not in pooled_index:
+                    pooled_index[key] = len(pooled_type.allowed_patterns)
+                    pooled_type.add_pattern(Pattern(pooled_positions))
+                self.to_pooled[(unit_type, k_idx)] = pooled_index[key]
+                if len(pattern.positions) == 1:
+                    name = pattern.positions[0].name
+                    if name in self.pool_of:
+                        self.concrete_pattern[(unit_type, name)] = k_idx
+            self.unit_types[unit_type] = pooled_type
+        pooled_dependency = PositionsUnitTypeDependency(
+            list(self.unit_types.values()),
+            self._pooled_list(problem.pos_unit_model_dependency.available_positions),
+        )
+
+        # Same jobs (already trimmed) on Units of the pooled types.
+        self.units: Dict[str, Unit] = {}
+        jobs = []
+        for job in problem.jobs:
+            unit = self.units.get(job.unit.name)
+            if unit is None:
+                unit = Unit(job.unit.name, self.unit_types[job.unit.type])
+                self.units[unit.name] = unit
+            jobs.append(Job(unit, job.phase, problem.time_adapter, job.start, job.end))
+
+        initial_conditions = None
+        if problem.initial_conditions is not None:
+            initial_conditions = dict(problem.initial_conditions)
+            initial_conditions["assignments"] = {
+                self.units.get(unit.name, unit): self._pooled_list(assigned)
+                for unit, assigned in problem.initial_conditions["assignments"].items()
+            }
+        final_conditions = None
+        if problem.final_conditions is not None:
+            # Their positions are never pooled (see above).
+            final_conditions = dict(problem.final_conditions)
+            final_conditions["assignments"] = {
+                self.units.get(unit.name, unit): assigned
+                for unit, assigned in problem.final_conditions["assignments"].items()
+            }
+
+        pooled = problem.__class__(
+            jobs,
+            pooled_conf,
+            pooled_dependency,
+            problem.time_adapter,
+            t_last=problem.time_adapter.from_tick(problem.t_last_tick),
+            initial_conditions=initial_conditions,
+            final_conditions=final_conditions,
+            timeline=(
+                problem.compressed_ticks,
+                problem.tick_to_index,
+                problem.index_to_tick,
+                problem.index_to_value,
+            ),
+        )
+        # Solver properties overridden on the instance.
+        for name, value in vars(problem).items():
+            if name.isupper():
+                setattr(pooled, name, value)
+        pooled.USE_POSITION_AGGREGATION = False
+        pooled.pooled_positions = set(self.members)
+        self.pooled = pooled
+        self._translate_fixed_variables()
+
+    def _pooled_list(self, positions: List[Position]) -> List[Position]:
+        """Replace pooled positions by their pool (once), keeping the order."""
+        result, seen = [], set()
+        for position in positions:
+            position = self.pool_of.get(position.name, position)
+            if position.name not in seen:
+                seen.add(position.name)
+                result.append(position)
+        return result
+
+    def _translate_fixed_variables(self):
+        """Fix the pooled counterpart of every fixed variable of the concrete problem."""
+        concrete, pooled = self.concrete, self.pooled
+        if not concrete.fixed_variables:
+            return
+        pooled_index = pooled.positions_configuration.index_map
+        pos_map = {
+            p_idx: pooled_index[self.pool_of.get(p.name, p).name]
+            for p_idx, p in enumerate(concrete.positions)
+        }
+
+        lookup = {}  # concrete var index -> pooled var
+        for j_idx, t_map in concrete.pattern_assigned_vars.items():
+            unit_type = concrete.jobs[j_idx].unit.type
+            for t_idx, k_map in t_map.items():
+                for k_idx, var in k_map.items():
+                    pooled_k = self.to_pooled[(unit_type, k_idx)]
+                    lookup[var.Index()] = pooled.pattern_assigned_vars[j_idx][t_idx][
+                        pooled_k
+                    ]
+        for j_idx, p_map in concrete.assigned_vars.items():
+            for p_idx, t_map in p_map.items():
+                for t_idx, var in t_map.items():
+                    pooled_map = pooled.assigned_vars[j_idx][pos_map[p_idx]]
+                    lookup[var.Index()] = pooled_map[t_idx]
+        for unit_name, t_map in concrete.unit_movement_vars.items():
+            for t_idx, var in t_map.items():
+                lookup[var.Index()] = pooled.unit_movement_vars[unit_name][t_idx]
+        for p_idx, t_map in concrete.movement_in_position_vars.items():
+            for t_idx, var in t_map.items():
+                pooled_map = pooled.movement_in_position_vars[pos_map[p_idx]]
+                lookup[var.Index()] = pooled_map[t_idx]
+
+        for var, value in concrete.fixed_variables:
+            pooled_var = lookup.get(var.Index())
+            if pooled_var is None:
+                raise ValueError(
+                    f"Fixed variable {var} has no counterpart in the pooled problem. "
+                    "Disable USE_POSITION_AGGREGATION to fix it."
+                )
+            pooled.add_fixed_bool_var(pooled_var, value)
+
+    def disaggregate(
+        self, patterns: Dict[int, Dict[int, int]]
+    ) -> Dict[int, Dict[int, int]]:
+        """
+        Split a pooled plan back onto the concrete positions.
+
+        Args:
+            patterns: Plan of the pooled problem, patterns[j_idx][t_idx] = pooled k_idx.
+
+        Returns:
+            Plan of the concrete problem, patterns[j_idx][t_idx] = k_idx.
+        """
+        concrete = self.concrete
+        from_pooled = {}  # (concrete UnitType, pooled k_idx) -> concrete k_idx
+        for (unit_type, k_idx), pooled_k in self.to_pooled.items():
+            from_pooled.setdefault((unit_type, pooled_k), k_idx)
+
+        def pool_name(unit_type, pooled_k):
+            pattern = self.unit_types[unit_type].allowed_patterns[pooled_k]
+            name = pattern.positions[0].name
+            return name if name in self.members else None
+
+        # Units starting in a pool (initial conditions) keep their concrete position.
+        t0_idx = concrete.tick_to_index[concrete.t0_tick]
+        initial = {}
+        if concrete.initial_conditions is not None:
+            for unit, assigned in concrete.initial_conditions["assignments"].items():
+                for position in assigned:
+                    if position.name in self.pool_of:
+                        initial[unit.name] = position.name
+
+        active = defaultdict(list)  # t_idx -> [j_idx]
+        for j_idx, t_map in patterns.items():
+            for t_idx in t_map:
+                active[t_idx].append(j_idx)
+
+        result = defaultdict(dict)
+        held = {}  # unit name -> (t_idx, concrete position name) of its last pool stay
+        for t_idx in sorted(active):
+            occupied = defaultdict(set)  # pool name -> concrete positions taken at t
+            entering = []
+            for j_idx in sorted(active[t_idx]):
+                job = concrete.jobs[j_idx]
+                unit_type = job.unit.type
+                pooled_k = patterns[j_idx][t_idx]
+                pool = pool_name(unit_type, pooled_k)
+                if pool is None:
+                    result[j_idx][t_idx] = from_pooled[(unit_type, pooled_k)]
+                    continue
+
+                previous = held.get(job.unit.name)
+                if previous is not None and previous[0] == t_idx - 1:
+                    name = previous[1]
+                elif t_idx == t0_idx:
+                    name = initial.get(job.unit.name)
+                else:
+                    name = None
+                if name is None or self.pool_of[name].name != pool:
+                    entering.append((j_idx, pool))
+                    continue
+                occupied[pool].add(name)
+                held[job.unit.name] = (t_idx, name)
+                result[j_idx][t_idx] = self.concrete_pattern[(unit_type, name)]
+
+            for j_idx, pool in entering:
+                job = concrete.jobs[j_idx]
+                name = next(n for n in self.members[pool] if n not in occupied[pool])
+                occupied[pool].add(name)
+                held[job.unit.name] = (t_idx, name)
+                result[j_idx][t_idx] = self.concrete_pattern[(job.unit.type, name)]
+        return dict(result)
@@ -0,0 +1,147 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Set
+
+
+@dataclass
+class MovementLowerBound:
+    """
+    Lower bound on the total number of unit movements, computed before solving.
+
+    Attributes:
+        total: Sum of the per unit bounds.
+        per_unit: Unit name -> lower bound of its movements.
+        arrivals: Movements forced by units entering after the first time step.
+        departures: Movements forced by units leaving before the last time step.
+        changes: Movements forced by consecutive jobs with no common pattern.
+    """
+
+    total: int = 0
+    per_unit: Dict[str, int] = field(default_factory=dict)
+    arrivals: int = 0
+    departures: int = 0
+    changes: int = 0
+
+    def __str__(self):
+        return (
+            f"Movement lower bound {self.total} ({self.arrivals} arrivals, "
+            f"{self.departures} departures, {self.changes} pattern changes)."
+        )
+
+
+def _job_patterns(problem, job) -> Set[int]:
+    """k_idx of the patterns whose positions all cover the job need."""
+    unit_type = job.unit.type
+    if problem.presolve is not None:
+        candidates = problem.presolve.usable_patterns[unit_type]
+    else:
+        candidates = range(len(unit_type.allowed_patterns))
+    need = job.phase.required_need.name
+    return {
+        k_idx
+        for k_idx in candidates
+        if all(
+            need in {n.name for n in position.available_needs}
+            for position in unit_type.allowed_patterns[k_idx].positions
+        )
+    }
+
+
+def _contour_patterns(problem, conditions, tick) -> Dict[str, int]:
+    """Unit name -> k_idx fixed by the contour conditions at tick."""
+    if conditions is None:
+        return {}
+    return {
+        problem.jobs[j_idx].unit.name: k_idx
+        for j_idx, k_idx in problem.contour_patterns(conditions, tick, "contour")
+    }
+
+
+def _backward_changes(block_patterns, final_k: int) -> int:
+    """Pattern changes of the greedy grouping from the end of a block ending in final_k."""
+    changes = 0
+    common = block_patterns[-1] & {final_k}
+    for patterns in reversed(block_patterns[:-1]):
+        if common & patterns:
+            common = common & patterns
+        else:
+            changes += 1
+            common = patterns
+    return changes
+
+
+def compute_movement_lower_bound(problem) -> MovementLowerBound:
+    """
+    Lower bound on the movements of any plan of the problem, from the jobs and the
+    pattern compatibility data only.
+
+    The time steps of each unit are split in blocks of consecutive steps with an active
+    job. Every block starting after the first time step is an arrival and every block
+    ending before the last one is a departure (one movement each). Inside a block the unit
+    has to change pattern at least once per group of consecutive jobs with no pattern in
+    common: jobs are grouped greedily while the intersection of their patterns is not empty
+    (greedy grouping gives the fewest groups). A unit with initial conditions starts with
+    its initial pattern as the only candidate. With final conditions the last block is
+    also grouped backwards from the final pattern and the larger count is kept.
+
+    Cascades (gate, triggers) and capacity are ignored, so the bound is valid for any plan
+    but can be far from the optimum on congested instances.
+    """
+    ticks = problem.compressed_ticks
+    table = problem.job_table
+    last_step = problem.num_time_steps - 1
+    by_unit = defaultdict(list)  # unit name -> [(first, last, j_idx)]
+    for j_idx, job in enumerate(problem.jobs):
+        first = bisect_left(ticks, table.start_ticks[j_idx])
+        last = bisect_right(ticks, table.end_ticks[j_idx]) - 1
+        if first <= last:
+            by_unit[job.unit.name].append((first, last, j_idx))
+
+    initial = _contour_patterns(problem, problem.initial_conditions, problem.t0_tick)
+    final = _contour_patterns(
+        problem, problem.final_conditions, problem.index_to_tick[last_step]
+    )
+
+    bound = MovementLowerBound()
+    for unit_name, steps in sorted(by_unit.items()):
+        steps.sort()
+        unit_bound = 0
+        block_last = None
+        common = None  # Patterns shared by the current group of jobs.
+        block_patterns, block_changes = [], 0
+        for first, last, j_idx in steps:
+            patterns = _job_patterns(problem, problem.jobs[j_idx])
+            if block_last is None or first > block_last + 1:
+                # New block.
+                if block_last is not None and block_last < last_step:
+                    bound.departures += 1
+                    unit_bound += 1
+                if first > 0:
+                    bound.arrivals += 1
+                    unit_bound += 1
+                common = patterns
+                if first == 0 and unit_name in initial:
+                    common = patterns & {initial[unit_name]}
+                block_patterns, block_changes = [], 0
+            elif common & patterns:
+                common = common & patterns
+            else:
+                bound.changes += 1
+                unit_bound += 1
+                block_changes += 1
+                common = patterns
+            block_patterns.append(patterns)
+            block_last = max(block_last or 0, last)
+        if block_last < last_step:
+            bound.departures += 1
+            unit_bound += 1
+        elif unit_name in final:
+            # Grouping backwards from the final pattern is a bound of the last block too.
+            extra = _backward_changes(block_patterns, final[unit_name]) - block_changes
+            if extra > 0:
+                bound.changes += extra
+                unit_bound += extra
+        bound.per_unit[unit_name] = unit_bound
+        bound.total += unit_bound
+    return bound
@@ -0,0 +1,309 @@
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from dataclasses import asdict
+from typing import Dict, Optional
+
+import numpy as np
+import ortools
+from ortools.sat.python import cp_model
+
+from frjmp.model.bounds import MovementLowerBound
+from frjmp.model.presolve import FixedReduction
+from frjmp.model.spec import ProblemSpec
+
+CACHE_VERSION = 1
+
+# Properties only read by solve(), they do not change the built model.
+SOLVE_PROPERTIES = (
+    "SOLVERTIMELIMIT",
+    "STEPTIMELIMIT",
+    "DETERMINISTICTIMELIMIT",
+    "PRINT_SOLUTIONS",
+    "USE_GREEDY_HINT",
+    "USE_POSITION_AGGREGATION",
+)
+
+# Variable families stored as index maps: name -> depth of the nested dicts.
+FAMILIES = {
+    "assigned_vars": 3,  # j_idx -> p_idx -> t_idx
+    "pattern_assigned_vars": 3,  # j_idx -> t_idx -> k_idx
+    "unit_movement_vars": 2,  # unit -> t_idx (unit as its position in the dict)
+    "movement_in_position_vars": 2,  # p_idx -> t_idx
+}
+
+
+def _index_rows(nested: Dict, depth: int) -> np.ndarray:
+    """Rows (key_1, ..., key_depth, variable index) of nested variable dicts, in order."""
+    rows = []
+
+    def walk(d, prefix, level):
+        for position, (key, value) in enumerate(d.items()):
+            # Non integer keys (unit names) are stored as their position in the dict.
+            key = key if isinstance(key, int) else position
+            if level == depth:
+                rows.append(prefix + (key, value.Index()))
+            else:
+                walk(value, prefix + (key,), level + 1)
+
+    walk(nested, (), 1)
+    return np.array(rows, dtype=np.int64).reshape(len(rows), depth + 1)
+
+
+def _literal(model: cp_model.CpModel, index: int):
+    if index < 0:  # Negated literal, Not().Index() is -index - 1.
+        return model.GetBoolVarFromProtoIndex(-index - 1).Not()
+    return model.GetIntVarFromProtoIndex(index)
+
+
+class ModelCache:
+    """
+    On-disk cache of built time-indexed models, keyed by a content hash of the inputs.
+
+    An entry (one npz file) holds the CpModelProto after build_model() and the variable
+    index maps of the Problem (assigned_vars, pattern_assigned_vars, unit_movement_vars,
+    movement_in_position_vars), plus what building sets on the Problem (fixed reduction,
+    movement lower bound, removed triggers, symmetry classes). On a hit the proto is
+    parsed into a new CpModel and the variable dicts are rebound to it by index, which is
+    much faster than adding the constraints again.
+
+        problem = Problem(jobs, configuration, dependency, adapter)
+        problem.model_cache = ModelCache("~/.cache/frjmp")
+        status, solver = problem.solve()  # Built, or loaded from the cache.
+
+    The key is the ProblemSpec content hash plus every model property (solve-only ones
+    such as SOLVERTIMELIMIT excluded), the compressed timeline, the fixed variables, the
+    pooled positions, the Problem class and the OR-Tools version. The index maps of the
+    entry are compared with the ones of the Problem before loading, so a stale entry is a
+    miss. Problems that already have constraints, an objective or hints before
+    build_model(), and the interval engine, are not cached.
+
+    The least recently used entries are deleted while the directory holds more than
+    max_bytes. Entries are written to a temporary file and renamed, so several processes
+    can share a directory.
+
+    Attributes:
+        hits, misses: Number of load() calls that found / did not find an entry.
+    """
+
+    def __init__(self, directory, max_bytes: int = 2**30):
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def key(self, problem) -> Optional[str]:
+        """Cache key of the problem model, None if it can not be cached."""
+        proto = problem.model.Proto()
+        if (
+            problem.MODEL_ENGINE != "time_indexed"
+            or len(proto.constraints) > 0
+            or proto.HasField("objective")
+            or proto.HasField("solution_hint")
+        ):
+            return None
+        try:
+            # The properties are added below without the solve-only ones.
+            spec = ProblemSpec.from_inputs(
+                problem.source_jobs,
+                problem.positions_configuration,
+                problem.pos_unit_model_dependency,
+                problem.time_adapter,
+                t_last=problem.time_adapter.from_tick(problem.t_last_tick),
+                initial_conditions=problem.initial_conditions,
+                final_conditions=problem.final_conditions,
+            )
+            content = {
+                "version": CACHE_VERSION,
+                "ortools": ortools.__version__,
+                "class": f"{type(problem).__module__}.{type(problem).__qualname__}",
+                "spec": spec.content_hash,
+                "properties": {
+                    name: getattr(problem, name)
+                    for name in dir(problem)
+                    if name.isupper() and name not in SOLVE_PROPERTIES
+                },
+                "ticks": list(problem.compressed_ticks),
+                "fixed": [
+                    (var.Index(), int(value)) for var, value in problem.fixed_variables
+                ],
+                "pooled": sorted(problem.pooled_positions),
+            }
+            text = json.dumps(content, sort_keys=True, separators=(",", ":"))
+        except (TypeError, ValueError):  # Inputs the spec or JSON can not describe.
+            return None
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def store(self, problem, key: str):
+        """Write the built model of the problem, then evict down to max_bytes."""
+        reduction = problem.fixed_reduction
+        meta = {
+            "fixed_variables": [
+                (var.Index(), int(value)) for var, value in problem.fixed_variables
+            ],
+            "reduction": {
+                "fixed": reduction.fixed,
+                "removed_patterns": reduction.removed_patterns,
+                "removed_assignments": reduction.removed_assignments,
+                "determined_movements": reduction.determined_movements,
+            },
+            "movement_lower_bound": (
+                asdict(problem.movement_lower_bound)
+                if problem.movement_lower_bound is not None
+                else None
+            ),
+            "removed_triggers": (
+                problem.presolve.removed_triggers
+                if problem.presolve is not None
+                else None
+            ),
+            "symmetry_classes": getattr(problem, "symmetry_classes", None),
+        }
+        arrays = {
+            name: _index_rows(getattr(problem, name), depth)
+            for name, depth in FAMILIES.items()
+        }
+        arrays["kept_patterns"] = _index_rows(reduction.pattern_assigned_vars, 3)[:, -1]
+        arrays["kept_assignments"] = _index_rows(reduction.assigned_vars, 3)[:, -1]
+        model = problem.model.Proto().SerializeToString()
+
+        handle, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                np.savez(
+                    file,
+                    model=np.frombuffer(model, dtype=np.uint8),
+                    meta=np.array(json.dumps(meta)),
+                    **arrays,
+                )
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def load(self, problem, key: str) -> bool:
+        """
+        Install the cached model on the problem (the problem is then built).
+
+        Returns:
+            False if there is no valid entry for key (the problem is not modified).
+        """
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                entry = {name: npz[name] for name in npz.files}
+        except (OSError, ValueError, zipfile.BadZipFile):
+            self.misses += 1
+            return False
+        if not all(
+            np.array_equal(entry[name], _index_rows(getattr(problem, name), depth))
+            for name, depth in FAMILIES.items()
+        ):
+            self.misses += 1
+            return False
+        try:
+            os.utime(path)  # Most recently used.
+        except OSError:
+            pass
+
+        meta = json.loads(str(entry["meta"]))
+        model = cp_model.CpModel()
+        model.Proto().ParseFromString(entry["model"].tobytes())
+        model.rebuild_var_and_constant_map()
+
+        problem._use_model(model)
+        problem.fixed_variables = [
+            (_literal(model, index), value) for index, value in meta["fixed_variables"]
+        ]
+
+        kept_patterns = set(entry["kept_patterns"].tolist())
+        kept_assignments = set(entry["kept_assignments"].tolist())
+        reduced_patterns, reduced_assignments = {}, {}
+        for j_idx, t_map in problem.pattern_assigned_vars.items():
+            reduced_patterns[j_idx] = {
+                t_idx: {
+                    k_idx: var
+                    for k_idx, var in k_map.items()
+                    if var.Index() in kept_patterns
+                }
+                for t_idx, k_map in t_map.items()
+            }
+            reduced_assignments[j_idx] = {}
+            for p_idx, t_dict in problem.assigned_vars.get(j_idx, {}).items():
+                kept = {
+                    t_idx: var
+                    for t_idx, var in t_dict.items()
+                    if var.Index() in kept_assignments
+                }
+                if kept:
+                    reduced_assignments[j_idx][p_idx] = kept
+        problem.fixed_reduction = FixedReduction(
+            reduced_assignments, reduced_patterns, **meta["reduction"]
+        )
+
+        if meta["movement_lower_bound"] is not None:
+            problem.movement_lower_bound = MovementLowerBound(
+                **meta["movement_lower_bound"]
+            )
+        if meta["removed_triggers"] is not None:
+            problem.presolve.removed_triggers = [
+                tuple(pair) for pair in meta["removed_triggers"]
+            ]
+        if meta["symmetry_classes"] is not None:
+            problem.symmetry_classes = meta["symmetry_classes"]
+        problem.objective_function = cp_model.LinearExpr.Sum(
+            [
+                var
+                for t_map in problem.unit_movement_vars.values()
+                for var in t_map.values()
+            ]
+        )
+        self.hits += 1
+        return True
+
+    @property
+    def size(self) -> int:
+        """Bytes used by the entries."""
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self):
+        """(last use time, size, path) of every entry."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".npz"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:  # Evicted by another process.
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        """Delete the least recently used entries until the cache fits in max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,253 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Dict
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from frjmp.model.problem import Problem
+from frjmp.model.spec import ProblemSpec
+from frjmp.model.streaming import PatternLayout
+
+CHECKPOINT_VERSION = 1
+
+
+@dataclass(frozen=True, eq=False)
+class Checkpoint:
+    """
+    Incumbent of an interrupted solve, enough to resume it in another process.
+
+    Attributes:
+        spec: ProblemSpec of the solved problem (properties included).
+        patterns: patterns[j_idx, t_idx] = k_idx of the incumbent (-1 where the job is not
+            active), int16 array of shape (jobs, time steps).
+        objective, bound: Objective value of the incumbent and best bound when written.
+        step: Number of solutions found so far.
+        elapsed: Seconds of the time budget used so far (every resumed run included).
+        time_limit: Time budget of the whole solve in seconds.
+    """
+
+    spec: ProblemSpec
+    patterns: np.ndarray
+    objective: float
+    bound: float
+    step: int
+    elapsed: float
+    time_limit: float
+
+    @property
+    def remaining_time(self) -> float:
+        return self.time_limit - self.elapsed
+
+    def pattern_plan(self) -> Dict[int, Dict[int, int]]:
+        """Pattern plan, patterns[j_idx][t_idx] = k_idx (like Problem.read_patterns)."""
+        plan = {}
+        for j_idx, t_idx in zip(*np.nonzero(self.patterns >= 0)):
+            plan.setdefault(int(j_idx), {})[int(t_idx)] = int(
+                self.patterns[j_idx, t_idx]
+            )
+        return plan
+
+    def save(self, path):
+        """
+        Write the checkpoint to a temporary file renamed over path, so a process killed
+        while writing leaves the previous checkpoint.
+        """
+        meta = {
+            "version": CHECKPOINT_VERSION,
+            "objective": self.objective,
+            "bound": self.bound,
+            "step": self.step,
+            "elapsed": self.elapsed,
+            "time_limit": self.time_limit,
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        handle, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                np.savez_compressed(
+                    file,
+                    patterns=self.patterns,
+                    meta=np.array(json.dumps(meta)),
+                    spec=np.array(self.spec.to_json()),
+                )
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path) -> "Checkpoint":
+        with np.load(path, allow_pickle=False) as npz:
+            meta = json.loads(str(npz["meta"]))
+            if meta.pop("version") != CHECKPOINT_VERSION:
+                raise ValueError(f"Unsupported checkpoint version in {path}.")
+            return cls(
+                spec=ProblemSpec.from_json(str(npz["spec"])),
+                patterns=npz["patterns"],
+                **meta,
+            )
+
+
+class Checkpointer:
+    """
+    Write the incumbent of Problem.solve() to a Checkpoint file every `interval` seconds,
+    so a solve killed by a restart can be continued with resume():
+
+        problem.checkpointer = Checkpointer("plan.npz", interval=60)
+        status, solver = problem.solve()
+        ...
+        problem, status, solver = resume("plan.npz")  # In the restarted process.
+
+    The solution callback only copies the pattern assignment values of each solution (one
+    byte per variable, like PlanStream). A background thread writes the latest incumbent
+    every interval (with the time used so far, even when no better solution was found) and
+    once more when the solve returns. Only time-indexed solves are checkpointed (not
+    aggregated solves).
+
+    Attributes:
+        written: Number of checkpoints written.
+    """
+
+    def __init__(self, path, interval: float = 60.0, checkpoint: Checkpoint = None):
+        """
+        Args:
+            checkpoint: Checkpoint being resumed (see resume). Its time is counted and its
+                incumbent is written until the solve finds a solution.
+        """
+        self.path = path
+        self.interval = interval
+        self.checkpoint = checkpoint
+        self.elapsed = checkpoint.elapsed if checkpoint is not None else 0.0
+        self.written = 0
+        self._latest = None  # (values, SolutionRecord) of the last solution.
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self, problem):
+        """Prepare the checkpoints of a solve of problem and start the writer."""
+        if problem.MODEL_ENGINE != "time_indexed":
+            raise ValueError("Checkpoints need the time_indexed MODEL_ENGINE.")
+        self._spec = ProblemSpec.from_problem(problem)
+        self._layout = PatternLayout(problem.pattern_assigned_vars)
+        slots = np.array(self._layout.slots, dtype=np.int64).reshape(-1, 2)
+        self._rows, self._cols = slots[:, 0], slots[:, 1]
+        self._shape = (len(problem.jobs), problem.num_time_steps)
+        self._time_limit = self.elapsed + problem.SOLVERTIMELIMIT
+        self._latest = None
+        self._started = time.monotonic()
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="solver-checkpoint-writer", daemon=True
+        )
+        self._thread.start()
+
+    def capture(self, callback, record):
+        """Solution callback side: keep the pattern values of the solution."""
+        values = bytes(map(callback.SolutionBooleanValue, self._layout.indices))
+        self._latest = (values, record)
+
+    def stop(self):
+        """Stop the writer and write the last incumbent."""
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+        self.elapsed += time.monotonic() - self._started
+
+    @contextmanager
+    def running(self, problem):
+        self.start(problem)
+        try:
+            yield self
+        finally:
+            self.stop()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self._write()
+        self._write()
+
+    def _write(self):
+        latest = self._latest
+        elapsed = self.elapsed + time.monotonic() - self._started
+        if latest is not None:
+            values, record = latest
+            patterns = np.full(self._shape, -1, dtype=np.int16)
+            patterns[self._rows, self._cols] = self._layout.pattern_array(values)
+            checkpoint = Checkpoint(
+                spec=self._spec,
+                patterns=patterns,
+                objective=record.objective,
+                bound=record.bound,
+                step=record.step,
+                elapsed=elapsed,
+                time_limit=self._time_limit,
+            )
+        elif self.checkpoint is not None:
+            checkpoint = replace(self.checkpoint, elapsed=elapsed)
+        else:
+            return
+        checkpoint.save(self.path)
+        self.written += 1
+
+
+def _complete_hints(problem, time_limit: float):
+    """
+    Replace the pattern hints of the problem by a full solution with those patterns, so the
+    solver starts from it (hints of the pattern families alone are often not repaired
+    before the search finds other solutions). The hints are kept if none is found.
+    """
+    solver = cp_model.CpSolver()
+    solver.parameters.fix_variables_to_their_hinted_value = True
+    solver.parameters.max_time_in_seconds = time_limit
+    if solver.Solve(problem.model) not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return
+    problem.model.ClearHints()
+    hint = problem.model.Proto().solution_hint
+    hint.vars.extend(range(len(problem.model.Proto().variables)))
+    hint.values.extend(solver.ResponseProto().solution)
+
+
+def resume(
+    path, interval: float = 60.0, problem_class=Problem
+) -> tuple[Problem, int, cp_model.CpSolver]:
+    """
+    Continue the solve of a checkpoint: rebuild its problem from the spec, install the
+    incumbent as solution hints (instead of the greedy hint) and solve for the remaining
+    time budget, checkpointing to the same file. Completing the hints into a full solution
+    takes at most min(5 s, a tenth of the remaining time).
+
+    Returns:
+        (problem, status, solver)
+
+    Raises:
+        ValueError: If the checkpoint has no time left (Checkpoint.load(path).pattern_plan()
+            is its plan) or does not match the rebuilt problem.
+    """
+    checkpoint = Checkpoint.load(path)
+    if checkpoint.remaining_time <= 0:
+        raise ValueError(f"Checkpoint {path} has no time left.")
+    problem = checkpoint.spec.build(problem_class)
+    if checkpoint.patterns.shape != (len(problem.jobs), problem.num_time_steps):
+        raise ValueError(f"Checkpoint {path} does not match its rebuilt problem.")
+    problem.USE_GREEDY_HINT = False
+    problem.build_model()
+
+    started = time.monotonic()
+    problem.add_pattern_hints(checkpoint.pattern_plan())
+    _complete_hints(problem, min(5, checkpoint.remaining_time / 10))
+    checkpoint = replace(
+        checkpoint, elapsed=checkpoint.elapsed + time.monotonic() - started
+    )
+    problem.SOLVERTIMELIMIT = max(checkpoint.remaining_time, 0)
+    problem.checkpointer = Checkpointer(path, interval, checkpoint)
+    status, solver = problem.solve()
+    return problem, status, solver
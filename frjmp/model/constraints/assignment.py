@@ -18,6 +18,7 @@ def add_job_assignment_constraints(
     compressed_ticks: list[int],
     dependency: PositionsUnitTypeDependency,
     time_adapter: TimeAdapter,
+    ranges: dict = None,
 ):
     """
     Link pattern assignment variables to position assignment variables.
@@ -26,6 +27,8 @@ def add_job_assignment_constraints(
         be assigned (assigned_var) to all the positions belonging to that pattern.
         This can raise a ValueError if the pattern contains a position that does
         not cover the job phase need.
+    With ranges (unit name -> list), the (first, end) constraint indices added for each
+    job are appended to the list of its unit (see Problem.update_jobs).
     """
     matrix = dependency.generate_matrix()
     unit_types = dependency.unit_types
@@ -34,6 +37,7 @@ def add_job_assignment_constraints(
     for j_idx, job in enumerate(jobs):
         model_idx = model_to_index[job.unit.type]
         n_patterns = len(matrix[model_idx])
+        first = len(model.Proto().constraints)
         for tick in compressed_ticks:
             if not (
                 time_adapter.to_tick(job.start) <= tick <= time_adapter.to_tick(job.end)
@@ -59,13 +63,16 @@ def add_job_assignment_constraints(
                     #     f"Pattern {k_idx} expects position {positions[p_idx]} for job {jobs[j_idx]} at time {t_idx}, "
                     #     f"but no assigned_var exists. Check either patterns or compatible positions (if needs are covered by the position)."
                     # )
-                terms = []
-                for k_idx in range(n_patterns):
-                    if matrix[model_idx][k_idx][p_idx] == 1:
-                        terms.append(pattern_assigned_vars[j_idx][t_idx][k_idx])
+                terms = [
+                    var
+                    for k_idx, var in pattern_assigned_vars[j_idx][t_idx].items()
+                    if matrix[model_idx][k_idx][p_idx] == 1
+                ]
 
                 if a_var is not None:
                     if terms:
                         model.Add(sum(terms) == a_var)
                     else:
                         model.Add(a_var == 0)
+        if ranges is not None:
+            ranges[job.unit.name].append((first, len(model.Proto().constraints)))
@@ -1,5 +1,6 @@
+from collections import defaultdict
 from ortools.sat.python import cp_model
-from typing import Dict, List
+from typing import Any, Dict, List
 
 from frjmp.model.sets.job import Job
 from frjmp.model.sets.position import Position
@@ -11,6 +12,7 @@ def add_position_capacity_constraints(
     positions: List[Position],
     jobs: List[Job],
     num_timesteps: int,
+    ranges: Dict[int, list] = None,
 ):
     """
     For each position and each time step, the number of assigned jobs must not exceed the position's capacity.
@@ -21,8 +23,11 @@ def add_position_capacity_constraints(
         positions: List of Position objects (must include `.capacity`)
         jobs: List of jobs
         num_timesteps: Total number of compressed time steps
+        ranges: p_idx -> list of the (first, end) indices of the constraints added for
+            the position (see Problem.update_jobs), filled if given.
     """
     for p_idx, position in enumerate(positions):
+        first = len(model.Proto().constraints)
         for t_idx in range(num_timesteps):
             active_vars = []
             for j_idx in range(len(jobs)):
@@ -34,3 +39,85 @@ def add_position_capacity_constraints(
 
             if active_vars:
                 model.Add(sum(active_vars) <= position.capacity)
+        if ranges is not None:
+            ranges[p_idx].append((first, len(model.Proto().constraints)))
+
+
+def add_need_capacity_cuts(
+    model: cp_model.CpModel,
+    assigned_vars: Dict[int, Dict[int, Dict[int, cp_model.IntVar]]],
+    positions: List[Position],
+    jobs: List[Job],
+    capacity_summary: Dict[int, Dict[str, Any]],
+):
+    """
+    Redundant aggregated capacity constraints per (need, t).
+
+    Every job requiring need N takes at least one position covering N, so the jobs with
+    another need can take at most capacity(N) - demand(N) of the capacity of the positions
+    covering N at t. Capacity and demand per need are the ones computed by
+    validate_capacity_feasibility (capacity_summary).
+
+    Args:
+        model: OR-Tools CP model
+        assigned_vars: assigned_var[j][p][t] = BoolVar indicating job j in position p at time t
+        positions: List of Position objects
+        jobs: List of jobs
+        capacity_summary: Output of validate_capacity_feasibility.
+    """
+    covering = defaultdict(set)  # need name -> p_idx of the positions covering it
+    for p_idx, position in enumerate(positions):
+        for need in position.available_needs:
+            covering[need.name].add(p_idx)
+
+    for t_idx, summary in capacity_summary.items():
+        for need_name, (capacity, demand) in summary["per_need"].items():
+            others = []
+            for j_idx, p_map in assigned_vars.items():
+                if jobs[j_idx].phase.required_need.name == need_name:
+                    continue
+                for p_idx in covering[need_name]:
+                    var = p_map.get(p_idx, {}).get(t_idx)
+                    if var is not None:
+                        others.append(var)
+            if others:
+                model.Add(sum(others) <= capacity - demand)
+
+
+def add_pattern_clique_cuts(
+    model: cp_model.CpModel,
+    pattern_assigned_vars: Dict[int, Dict[int, Dict[int, cp_model.IntVar]]],
+    positions: List[Position],
+    jobs: List[Job],
+):
+    """
+    Redundant capacity constraints on the pattern variables.
+
+    For each position and time step, the patterns containing the position (over all jobs)
+    can be used at most `capacity` times: an at-most-one clique for capacity 1 positions.
+    Overlapping patterns (sharing a capacity 1 position) exclude each other directly
+    instead of through the assignment variables.
+
+    Args:
+        model: OR-Tools CP model
+        pattern_assigned_vars: pattern_assigned_vars[j][t][k] = BoolVar of job j in pattern k
+        positions: List of Position objects
+        jobs: List of jobs
+    """
+    pos_index = {p.name: p_idx for p_idx, p in enumerate(positions)}
+    using = defaultdict(list)  # (p_idx, t_idx) -> pattern vars using the position
+    for j_idx, t_map in pattern_assigned_vars.items():
+        allowed_patterns = jobs[j_idx].unit.type.allowed_patterns
+        for t_idx, k_map in t_map.items():
+            for k_idx, var in k_map.items():
+                for position in allowed_patterns[k_idx].positions:
+                    using[(pos_index[position.name], t_idx)].append(var)
+
+    for (p_idx, t_idx), pattern_vars in using.items():
+        capacity = positions[p_idx].capacity
+        if len(pattern_vars) <= capacity:
+            continue
+        if capacity == 1:
+            model.AddAtMostOne(pattern_vars)
+        else:
+            model.Add(sum(pattern_vars) <= capacity)
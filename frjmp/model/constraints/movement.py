@@ -4,6 +4,7 @@ from collections import defaultdict
 from ortools.sat.python import cp_model
 from typing import Dict, List, Tuple, Set
 from collections import defaultdict
+from frjmp.model.presolve import prune_trigger_map
 
 
 def add_movement_detection_constraints(
@@ -15,7 +16,10 @@ def add_movement_detection_constraints(
     jobs: list[Job],
     num_timesteps: int,
     positions_configuration: PositionsConfiguration,
-):
+    pooled_positions: Set[int] = None,
+    usable_positions: Set[int] = None,
+    ranges: Dict[str, list] = None,
+) -> List[Tuple[int, int]]:
     """
     Adds movement detection constraints for all jobs.
 
@@ -25,12 +29,23 @@ def add_movement_detection_constraints(
         unit_movement_vars: movement detection variables [job][time]
         num_timesteps: number of time steps
         forced_movements: optional dict specifying forced movement times per job
+        pooled_positions: indices of positions standing for a pool of interchangeable
+            positions (see PositionAggregation). A movement in them does not force the
+            units staying in the pool to move.
+        usable_positions: indices of the positions some job can use (see
+            presolve_patterns_and_positions). Triggers involving only other positions
+            are skipped.
+        ranges: unit name -> list of the (first, end) indices of the constraints added
+            for the unit (see Problem.update_jobs), filled if given.
+
+    Returns:
+        (from, to) position indices of the skipped triggers.
     """
     add_unit_movement_constraint(
-        model, pattern_assigned_vars, unit_movement_vars, jobs, num_timesteps
+        model, pattern_assigned_vars, unit_movement_vars, jobs, num_timesteps, ranges
     )
 
-    add_movement_dependency_constraints(
+    removed_triggers = add_movement_dependency_constraints(
         model,
         movement_in_position_vars,
         unit_movement_vars,
@@ -38,6 +53,8 @@ def add_movement_detection_constraints(
         jobs,
         positions_configuration,
         num_timesteps,
+        usable_positions,
+        ranges,
     )
 
     link_unit_movements_to_position_movements(
@@ -46,7 +63,10 @@ def add_movement_detection_constraints(
         movement_in_position_vars,
         unit_movement_vars,
         jobs,
+        pooled_positions,
+        ranges,
     )
+    return removed_triggers
 
 
 def add_unit_movement_constraint(
@@ -55,6 +75,7 @@ def add_unit_movement_constraint(
     unit_movement_vars: dict[str, dict[int, cp_model.IntVar]],
     jobs: list,
     num_timesteps: int,
+    ranges: Dict[str, list] = None,
 ):
     from collections import defaultdict
 
@@ -64,6 +85,7 @@ def add_unit_movement_constraint(
         ac_to_jobs[job.unit.name].append(j_idx)
 
     for ac_name, job_idxs in ac_to_jobs.items():
+        first = len(model.Proto().constraints)
         for t in range(num_timesteps - 1):
             diffs: list[cp_model.BoolVar] = []
 
@@ -109,6 +131,8 @@ def add_unit_movement_constraint(
                 model.AddBoolOr(diffs).OnlyEnforceIf(mov)
                 # and keep its value in sync
                 model.AddMaxEquality(mov, diffs)
+        if ranges is not None:
+            ranges[ac_name].append((first, len(model.Proto().constraints)))
 
 
 def add_movement_dependency_constraints(
@@ -119,7 +143,9 @@ def add_movement_dependency_constraints(
     jobs: List,
     positions_configuration,
     num_timesteps: int,
-) -> None:
+    usable_positions: Set[int] = None,
+    ranges: Dict[str, list] = None,
+) -> List[Tuple[int, int]]:
     """
     When unit is movev from pattern k0 to pattern k1 every possition in k0 and k1
     register a position movement. Then each position movement might trigger more position
@@ -135,6 +161,8 @@ def add_movement_dependency_constraints(
               – every position triggered by (p_out, p_in) pairs must register movement
     Trigger logic uses a 3-D matrix:
         dep_matrix[i][j][k] == 1  ⇒  moving   i → j   triggers position k.
+    With usable_positions, triggers that can never matter are skipped (see
+    prune_trigger_map) and their (i, j) keys are returned.
     """
     # Dependency / trigger lookup
     dep_matrix, index_map = positions_configuration.generate_matrix()
@@ -147,6 +175,9 @@ def add_movement_dependency_constraints(
         for j in range(P)
         if any(dep_matrix[i][j])
     }
+    removed_triggers = []
+    if usable_positions is not None:
+        trigger_map, removed_triggers = prune_trigger_map(trigger_map, usable_positions)
 
     # helper: Pattern  →  list[int] (indices in 0‥P-1)
     def pattern_indices(pattern) -> List[int]:
@@ -185,6 +216,7 @@ def add_movement_dependency_constraints(
         # All jobs of this unit share the same UnitType
         unit_model = jobs[job_idxs[0]].unit.type
         allowed_patterns = unit_model.allowed_patterns  # list[Pattern]
+        first = len(model.Proto().constraints)
 
         for t in range(num_timesteps - 1):  # Can not evaluate t+1
             ac_mov_t = ac_mov_dict[t]
@@ -274,6 +306,10 @@ def add_movement_dependency_constraints(
                             movement_in_position_vars,
                             hop,
                         )
+        if ranges is not None:
+            ranges[ac_name].append((first, len(model.Proto().constraints)))
+
+    return removed_triggers
 
 
 def link_unit_movements_to_position_movements(
@@ -282,6 +318,8 @@ def link_unit_movements_to_position_movements(
     movement_in_position_vars,
     unit_movement_vars,
     jobs,
+    pooled_positions=None,
+    ranges=None,
 ):
     """
     An unit movement at t (between t and t+1) between position p and p' must enforce a position movement
@@ -292,7 +330,10 @@ def link_unit_movements_to_position_movements(
 
 
     This links unit-level movement to the spatial footprint of position-level movement.
+    The backward rule is skipped for pooled_positions: every unit in a pool has its own
+    concrete position, so a movement in the pool does not reach it.
     """
+    pooled_positions = pooled_positions or set()
 
     # 1) Group job‐indices by unit name
     unit_to_jobs: dict[str, list[int]] = defaultdict(list)
@@ -301,6 +342,7 @@ def link_unit_movements_to_position_movements(
 
     # 2) For each unit and each time‐slice t
     for ac_name, job_idxs in unit_to_jobs.items():
+        first = len(model.Proto().constraints)
         for t, ac_mov in unit_movement_vars[ac_name].items():
             # FORWARD: ac_mov + assignment to p at t or t+1 → movement in p at t
             for j in job_idxs:
@@ -319,8 +361,10 @@ def link_unit_movements_to_position_movements(
             # BACKWARD: movement in p at t + assignment to p at t → ac_mov
             for j in job_idxs:
                 for p, t_dict in assigned_vars.get(j, {}).items():
-                    if t in t_dict:
+                    if t in t_dict and p not in pooled_positions:
                         assigned = assigned_vars[j][p][t]
                         pos_mov = movement_in_position_vars[p][t]
                         # (assigned AND pos_mov) ⇒ ac_mov
                         model.AddBoolOr([assigned.Not(), pos_mov.Not(), ac_mov])
+        if ranges is not None:
+            ranges[ac_name].append((first, len(model.Proto().constraints)))
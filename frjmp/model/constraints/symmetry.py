@@ -0,0 +1,140 @@
+from collections import defaultdict
+from ortools.sat.python import cp_model
+from typing import Dict, List
+
+
+def find_equivalent_units(
+    jobs: list,
+    job_table,
+    pattern_assigned_vars: Dict[int, Dict[int, Dict[int, cp_model.IntVar]]],
+    excluded_units: set[str],
+) -> List[List[str]]:
+    """
+    Group interchangeable units: same UnitType and identical job sequences (same ticks and
+    needs). Units in `excluded_units` (e.g. referenced by fixed variables or initial
+    conditions) are never grouped.
+
+    Returns:
+        List of classes (unit names sorted) with at least two units.
+    """
+    sequences = defaultdict(list)
+    for j_idx, job in enumerate(jobs):
+        if pattern_assigned_vars.get(j_idx):
+            sequences[job.unit.name].append(
+                (
+                    job_table.start_ticks[j_idx],
+                    job_table.end_ticks[j_idx],
+                    job.phase.required_need.name,
+                )
+            )
+    unit_types = {job.unit.name: job.unit.type for job in jobs}
+
+    classes = defaultdict(list)
+    for unit_name, sequence in sequences.items():
+        if unit_name in excluded_units:
+            continue
+        classes[(unit_types[unit_name], tuple(sorted(sequence)))].append(unit_name)
+    return [sorted(names) for names in classes.values() if len(names) > 1]
+
+
+def find_equivalent_positions(
+    positions: list,
+    positions_configuration,
+    unit_types: list,
+    excluded_positions: set[str],
+) -> List[List[int]]:
+    """
+    Group interchangeable positions: same needs and capacity, only used in single
+    position patterns (so swapping them maps every pattern to another pattern), not
+    referenced by triggers or paths and not part of the OUT gate (allowed_patterns[0]).
+
+    Returns:
+        List of classes (position indices sorted) with at least two positions.
+    """
+    special = set(excluded_positions)
+    for relations in (
+        positions_configuration.triggers,
+        positions_configuration.out_paths,
+        positions_configuration.in_paths,
+    ):
+        for (from_pos, to_pos), involved in relations.items():
+            special.update({from_pos.name, to_pos.name})
+            special.update(p.name for p in involved)
+
+    single_pattern = defaultdict(set)  # position name -> unit types with a [p] pattern
+    for unit_type in unit_types:
+        if unit_type.allowed_patterns:
+            special.update(p.name for p in unit_type.allowed_patterns[0].positions)
+        for pattern in unit_type.allowed_patterns:
+            if len(pattern.positions) == 1:
+                single_pattern[pattern.positions[0].name].add(unit_type)
+            else:
+                special.update(p.name for p in pattern.positions)
+
+    classes = defaultdict(list)
+    for p_idx, position in enumerate(positions):
+        if position.name in special:
+            continue
+        signature = (
+            frozenset(need.name for need in position.available_needs),
+            position.capacity,
+            frozenset(single_pattern[position.name]),
+        )
+        classes[signature].append(p_idx)
+    return [indices for indices in classes.values() if len(indices) > 1]
+
+
+def add_symmetry_breaking_constraints(
+    model: cp_model.CpModel,
+    assigned_vars: Dict[int, Dict[int, Dict[int, cp_model.IntVar]]],
+    pattern_assigned_vars: Dict[int, Dict[int, Dict[int, cp_model.IntVar]]],
+    jobs: list,
+    unit_classes: List[List[str]],
+    position_classes: List[List[int]],
+):
+    """
+    Order interchangeable entities so only one of their permutations is explored.
+
+    - Positions: every permutation of a class is a symmetry, so the occupancy of the class
+      positions is made non-increasing at the busiest time step.
+    - Units: the pattern index of the first job of each unit is made non-decreasing.
+      Permuting units does not change position occupancy, so both orderings can always be
+      satisfied together (sort positions first, then units).
+    """
+    active = defaultdict(int)
+    for t_map in pattern_assigned_vars.values():
+        for t_idx in t_map:
+            active[t_idx] += 1
+
+    if position_classes and active:
+        t_star = max(active, key=active.get)
+        for indices in position_classes:
+            occupancy = [
+                sum(
+                    p_map[p_idx][t_star]
+                    for p_map in assigned_vars.values()
+                    if t_star in p_map.get(p_idx, {})
+                )
+                for p_idx in indices
+            ]
+            for occ, next_occ in zip(occupancy, occupancy[1:]):
+                model.Add(occ >= next_occ)
+
+    first_job = {}
+    for j_idx, job in enumerate(jobs):
+        t_map = pattern_assigned_vars.get(j_idx)
+        if not t_map:
+            continue
+        t_first = min(t_map)
+        current = first_job.get(job.unit.name)
+        if current is None or t_first < current[1]:
+            first_job[job.unit.name] = (j_idx, t_first)
+
+    for names in unit_classes:
+        pattern_index = []
+        for unit_name in names:
+            j_idx, t_first = first_job[unit_name]
+            k_map = pattern_assigned_vars[j_idx][t_first]
+            pattern_index.append(sum(k_idx * var for k_idx, var in k_map.items()))
+        for k_expr, next_k_expr in zip(pattern_index, pattern_index[1:]):
+            model.Add(k_expr <= next_k_expr)
@@ -0,0 +1,329 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+
+@dataclass
+class GreedyPlan:
+    """
+    Pattern plan built by `build_greedy_plan`.
+
+    Attributes:
+        patterns: patterns[j_idx][t_idx] = k_idx, same indexing as pattern_assigned_vars.
+        unassigned: (j_idx, t_idx) pairs for which no pattern with free capacity was found.
+        movements: Number of unit movements of the plan (only meaningful when complete).
+    """
+
+    patterns: Dict[int, Dict[int, int]]
+    unassigned: List[Tuple[int, int]] = field(default_factory=list)
+    movements: int = 0
+
+    @property
+    def complete(self) -> bool:
+        return not self.unassigned
+
+    def to_dataframe(self, problem) -> pd.DataFrame:
+        """Same columns as Solution.patterns so the plan can be used as a fallback."""
+        rows: List[Dict[str, Any]] = []
+        for j_idx, t_map in self.patterns.items():
+            job = problem.jobs[j_idx]
+            for t_idx, k_idx in t_map.items():
+                pattern = job.unit.type.allowed_patterns[k_idx]
+                rows.append(
+                    dict(
+                        job_idx=j_idx,
+                        job_unit_name=job.unit.name,
+                        job_phase=job.phase.name,
+                        t_idx=t_idx,
+                        time_value=problem.index_to_value[t_idx],
+                        pattern_idx=k_idx,
+                        pattern_positions=[p.name for p in pattern.positions],
+                    )
+                )
+        return (
+            pd.DataFrame(rows)
+            .sort_values(["t_idx", "job_idx", "pattern_idx"])
+            .reset_index(drop=True)
+        )
+
+
+def build_greedy_plan(problem) -> GreedyPlan:
+    """
+    Build a plan by sweeping the compressed time steps in order and assigning one pattern
+    per active job and time step, respecting Position.capacity.
+
+    At each time step jobs are handled in this order (ties: fewest candidate patterns first):
+        1. Jobs with a pattern fixed through problem.fixed_variables.
+        2. Jobs whose unit was already placed at t-1 (it keeps its previous pattern if it is
+           still valid and has room, so units are kept in place).
+        3. Jobs of units arriving at t.
+    Each job takes the first candidate pattern whose positions all have free capacity,
+    preferring patterns away from the OUT gate and positions that cover few needs. If none
+    fits, the jobs blocking a candidate are moved to another free pattern when possible.
+    Then the movement cascade of the model is followed: units staying in a position touched
+    by another unit's hop (or its triggers) are moved too. Jobs for which no pattern fits
+    are reported in GreedyPlan.unassigned instead of failing, so the partial plan can still
+    be used as a solver hint.
+
+    The cost is O(T · J_t · K · |pattern|), where J_t is the number of active jobs per step.
+    """
+    jobs = problem.jobs
+    pav = problem.pattern_assigned_vars
+    # Pattern matrix columns follow the dependency positions.
+    positions = problem.pos_unit_model_dependency.available_positions
+    capacity = [p.capacity for p in positions]
+
+    matrix = problem.pos_unit_model_dependency.generate_matrix()
+    model_index = {model: idx for idx, model in enumerate(problem.unit_types)}
+    pattern_positions = [
+        [tuple(p_idx for p_idx, used in enumerate(row) if used == 1) for row in mat]
+        for mat in matrix
+    ]
+
+    # Translate fixed variables (initial conditions, add_fixed_* calls) into restrictions.
+    forced: Dict[Tuple[int, int], int] = {}
+    banned = defaultdict(set)
+    required_positions = defaultdict(set)
+    banned_positions = defaultdict(set)
+    fixed_values = {var.Index(): value for var, value in problem.fixed_variables}
+    if fixed_values:
+        for j_idx, t_map in pav.items():
+            for t_idx, k_map in t_map.items():
+                for k_idx, var in k_map.items():
+                    value = fixed_values.get(var.Index())
+                    if value is None:
+                        continue
+                    if value:
+                        forced[(j_idx, t_idx)] = k_idx
+                    else:
+                        banned[(j_idx, t_idx)].add(k_idx)
+        for j_idx, p_map in problem.assigned_vars.items():
+            for p_idx, t_map in p_map.items():
+                for t_idx, var in t_map.items():
+                    value = fixed_values.get(var.Index())
+                    if value is None:
+                        continue
+                    if value:
+                        required_positions[(j_idx, t_idx)].add(p_idx)
+                    else:
+                        banned_positions[(j_idx, t_idx)].add(p_idx)
+
+    # Movement cascade data (see add_movement_dependency_constraints): a hop touches the
+    # positions left, the positions entered and the positions they trigger. Arrivals and
+    # departures go through the positions of allowed_patterns[0] (the "gate" to OUT).
+    dep_matrix, _ = problem.positions_configuration.generate_matrix()
+    trigger_map = {
+        (i, j): {k for k, v in enumerate(dep_matrix[i][j]) if v}
+        for i in range(len(dep_matrix))
+        for j in range(len(dep_matrix))
+        if any(dep_matrix[i][j])
+    }
+    gates = [set(rows[0]) if rows else set() for rows in pattern_positions]
+    # Units in a pool of positions are not reached by the movements in the pool.
+    pooled = {
+        p_idx for p_idx, p in enumerate(positions) if p.name in problem.pooled_positions
+    }
+
+    # Gate positions force a movement to any unit in them on every arrival/departure, and
+    # positions covering many needs are the most valuable ones: new placements prefer
+    # patterns avoiding the gates and built from positions covering few needs.
+    all_gates = set().union(*gates)
+    pattern_scores = [
+        [
+            (
+                bool(all_gates.intersection(row)),
+                sum(len(positions[p_idx].available_needs) for p_idx in row),
+            )
+            for row in mat
+        ]
+        for mat in pattern_positions
+    ]
+
+    active_jobs = defaultdict(list)  # t_idx -> [j_idx]
+    for j_idx, t_map in pav.items():
+        for t_idx in t_map:
+            active_jobs[t_idx].append(j_idx)
+
+    patterns: Dict[int, Dict[int, int]] = defaultdict(dict)
+    unassigned: List[Tuple[int, int]] = []
+    previous: Dict[str, Tuple[int, int]] = {}  # unit name -> (model_idx, k_idx) at t-1
+
+    for t_idx in range(problem.num_time_steps):
+        usage = [0] * len(capacity)
+        placed: Dict[int, int] = {}  # j_idx -> k_idx at t_idx
+        must_move = set()  # units that can not keep their previous pattern
+
+        def positions_of(j_idx):
+            return pattern_positions[model_index[jobs[j_idx].unit.type]]
+
+        def fits(positions):
+            return all(usage[p_idx] < capacity[p_idx] for p_idx in positions)
+
+        def place(j_idx, k_idx, sign=1):
+            for p_idx in positions_of(j_idx)[k_idx]:
+                usage[p_idx] += sign
+            if sign > 0:
+                placed[j_idx] = k_idx
+            else:
+                del placed[j_idx]
+
+        def candidates_of(j_idx):
+            key = (j_idx, t_idx)
+            if key in forced:
+                return [forced[key]]
+            candidates = list(pav[j_idx][t_idx])
+            if key in banned or key in required_positions or key in banned_positions:
+                required = required_positions.get(key, set())
+                forbidden = banned_positions.get(key, set())
+                candidates = [
+                    k_idx
+                    for k_idx in candidates
+                    if k_idx not in banned.get(key, ())
+                    and required.issubset(positions_of(j_idx)[k_idx])
+                    and forbidden.isdisjoint(positions_of(j_idx)[k_idx])
+                ]
+            scores = pattern_scores[model_index[jobs[j_idx].unit.type]]
+            candidates.sort(key=lambda k_idx: scores[k_idx])
+            unit_name = jobs[j_idx].unit.name
+            prev = previous.get(unit_name, (None, None))[1]
+            if prev in candidates:
+                candidates.remove(prev)
+                if unit_name not in must_move:
+                    candidates.insert(0, prev)
+            return candidates
+
+        def relocate_blockers(positions):
+            """Try to free the full positions of `positions` by moving one placed job each."""
+            moved = []
+            for p_idx in positions:
+                if usage[p_idx] < capacity[p_idx]:
+                    continue
+                for j2, k2 in list(placed.items()):
+                    if (j2, t_idx) in forced or p_idx not in positions_of(j2)[k2]:
+                        continue
+                    place(j2, k2, -1)
+                    for alt in candidates_of(j2):
+                        alt_positions = positions_of(j2)[alt]
+                        if (
+                            alt != k2
+                            and fits(alt_positions)
+                            and not (set(alt_positions) & set(positions))
+                        ):
+                            place(j2, alt)
+                            moved.append((j2, k2, alt))
+                            break
+                    else:
+                        place(j2, k2)
+                        continue
+                    break
+                if usage[p_idx] >= capacity[p_idx]:
+                    # Undo the relocations, this pattern can not be freed.
+                    for j2, k2, alt in reversed(moved):
+                        place(j2, alt, -1)
+                        place(j2, k2)
+                    return False
+            return True
+
+        def assign(j_idx, candidates):
+            chosen = next((k for k in candidates if fits(positions_of(j_idx)[k])), None)
+            if chosen is None:
+                chosen = next(
+                    (
+                        k
+                        for k in candidates
+                        if relocate_blockers(positions_of(j_idx)[k])
+                    ),
+                    None,
+                )
+            if chosen is None:
+                unassigned.append((j_idx, t_idx))
+                return
+            place(j_idx, chosen)
+
+        jobs_t = [(j_idx, candidates_of(j_idx)) for j_idx in active_jobs[t_idx]]
+        # Forced first, then units already in place, then arrivals; most constrained first.
+        jobs_t.sort(
+            key=lambda item: (
+                (
+                    0
+                    if (item[0], t_idx) in forced
+                    else (1 if jobs[item[0]].unit.name in previous else 2)
+                ),
+                len(item[1]),
+            )
+        )
+        for j_idx, candidates in jobs_t:
+            assign(j_idx, candidates)
+
+        # Units staying in a position touched by a hop between t-1 and t must move as well,
+        # which may touch other positions: repeat until no staying unit is touched.
+        while t_idx > 0:
+            current = {
+                jobs[j_idx].unit.name: (model_index[jobs[j_idx].unit.type], k_idx)
+                for j_idx, k_idx in placed.items()
+            }
+            touched = set()
+            for unit_name in set(previous) | set(current):
+                before, after = previous.get(unit_name), current.get(unit_name)
+                if before == after:
+                    continue
+                m_idx = (before or after)[0]
+                pos_k0 = pattern_positions[m_idx][before[1]] if before else gates[m_idx]
+                pos_k1 = pattern_positions[m_idx][after[1]] if after else gates[m_idx]
+                touched.update(pos_k0, pos_k1)
+                for p_out in pos_k0:
+                    for p_in in pos_k1:
+                        touched.update(trigger_map.get((p_out, p_in), ()))
+            touched -= pooled
+
+            violators = [
+                j_idx
+                for j_idx, k_idx in placed.items()
+                if previous.get(jobs[j_idx].unit.name) == current[jobs[j_idx].unit.name]
+                and touched.intersection(positions_of(j_idx)[k_idx])
+                and (j_idx, t_idx) not in forced
+            ]
+            if not violators:
+                break
+            for j_idx in violators:
+                must_move.add(jobs[j_idx].unit.name)
+                place(j_idx, placed[j_idx], -1)
+                assign(j_idx, candidates_of(j_idx))
+
+        for j_idx, k_idx in placed.items():
+            patterns[j_idx][t_idx] = k_idx
+        previous = {
+            jobs[j_idx].unit.name: (model_index[jobs[j_idx].unit.type], k_idx)
+            for j_idx, k_idx in placed.items()
+        }
+
+    plan = GreedyPlan(dict(patterns), unassigned)
+    plan.movements = sum(
+        len(moves) for moves in plan_unit_movements(problem, plan.patterns).values()
+    )
+    return plan
+
+
+def plan_unit_movements(
+    problem, patterns: Dict[int, Dict[int, int]]
+) -> Dict[str, List[int]]:
+    """
+    Time steps t (movement between t and t+1) at which each unit moves in a pattern plan.
+
+    Follows add_unit_movement_constraint: a unit moves when its pattern at t and t+1 differ,
+    including arriving (no pattern at t) and leaving (no pattern at t+1).
+    """
+    unit_patterns = defaultdict(dict)  # unit name -> t_idx -> k_idx
+    for j_idx, t_map in patterns.items():
+        unit_patterns[problem.jobs[j_idx].unit.name].update(t_map)
+
+    movements = {}
+    for unit_name, t_map in unit_patterns.items():
+        movements[unit_name] = [
+            t_idx
+            for t_idx in range(problem.num_time_steps - 1)
+            if t_map.get(t_idx) != t_map.get(t_idx + 1)
+        ]
+    return movements
@@ -0,0 +1,326 @@
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Tuple
+
+from frjmp.model.constraints.assignment import add_job_assignment_constraints
+from frjmp.model.constraints.capacity import add_position_capacity_constraints
+from frjmp.model.constraints.movement import add_movement_detection_constraints
+from frjmp.model.job_table import JobTable
+from frjmp.model.presolve import presolve_patterns_and_positions
+from frjmp.model.variables.assignment import create_assignment_variables
+from frjmp.model.variables.movement import create_unit_movement_variables
+from frjmp.model.variables.pattern_assignment import create_pattern_assignment_variables
+from frjmp.utils.validation_utils import (
+    validate_capacity_feasibility,
+    validate_non_overlapping_jobs_per_unit,
+)
+
+
+@dataclass
+class ConstraintRanges:
+    """
+    (first, end) indices of the constraints build_model added per group, so the
+    constraints of a unit or a position can be replaced when the jobs change.
+
+    Attributes:
+        units: Unit name -> ranges of the assignment and movement detection constraints
+            of its jobs.
+        positions: p_idx -> ranges of its capacity constraints.
+        lower_bound: Ranges of the movement lower bound constraints.
+    """
+
+    units: Dict[str, List[Tuple[int, int]]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    positions: Dict[int, List[Tuple[int, int]]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    lower_bound: List[Tuple[int, int]] = field(default_factory=list)
+
+    def copy(self) -> "ConstraintRanges":
+        return ConstraintRanges(
+            defaultdict(list, {key: list(r) for key, r in self.units.items()}),
+            defaultdict(list, {key: list(r) for key, r in self.positions.items()}),
+            list(self.lower_bound),
+        )
+
+
+def _clear(model, ranges: List[Tuple[int, int]]):
+    """Empty the constraints in ranges (an empty ConstraintProto is always true)."""
+    constraints = model.Proto().constraints
+    for first, end in ranges:
+        for index in range(first, end):
+            constraints[index].Clear()
+
+
+def _variable_indices(nested) -> set:
+    """Proto indices of the variables of nested variable dicts."""
+    if isinstance(nested, dict):
+        return set().union(*(_variable_indices(value) for value in nested.values()))
+    return {nested.Index()}
+
+
+def update_jobs_incrementally(problem, jobs: list) -> bool:
+    """
+    Replace the jobs of a built time-indexed problem by jobs, updating its model in place.
+
+    Jobs are matched by identity: jobs of problem.source_jobs missing from jobs are
+    removed and the new ones added. Only the touched families change:
+        - Variables are created for the added jobs. The variables of removed jobs stay in
+          the model with no constraint (units left with no job get their movements fixed
+          to 0).
+        - The assignment and movement detection constraints of the touched units, the
+          capacity constraints of the touched positions and the movement lower bound are
+          cleared (see ConstraintRanges) and added again.
+        - Overlaps and capacity are validated for the touched units and time steps only.
+    The timeline must not change: a step no job starts or ends at anymore can fall in
+    the gap between two jobs of a unit, which would then leave and come back.
+
+    Returns:
+        False, with the problem untouched, when the update needs a full rebuild: the
+        problem is not built (or was loaded from a ModelCache), a global family is used
+        (symmetry breaking, capacity cuts, a search strategy, position aggregation, the
+        event timeline), the time steps change (a new job starts or ends outside the
+        timeline, no job starts or ends at a step anymore or the horizon end moves), the
+        presolve needs new patterns or positions, or the touched jobs have fixed values
+        or contour conditions.
+
+    Raises:
+        ValueError: If the new jobs overlap or exceed the capacity of the positions.
+    """
+    ranges = problem.constraint_ranges
+    if (
+        not problem.model_built
+        or ranges is None
+        or problem.MODEL_ENGINE != "time_indexed"
+        or problem.USE_EVENT_TIMELINE
+        or problem.USE_SYMMETRY_BREAKING
+        or problem.USE_CAPACITY_CUTS
+        or problem.SEARCH_STRATEGY != "default"
+        or problem.pooled_positions
+    ):
+        return False
+
+    adapter = problem.time_adapter
+    old_table = problem.job_table
+    old_ids = {id(job) for job in problem.source_jobs}
+    new_ids = {id(job) for job in jobs}
+    touched_units = {
+        job.unit.name for job in problem.source_jobs if id(job) not in new_ids
+    } | {job.unit.name for job in jobs if id(job) not in old_ids}
+    validate_non_overlapping_jobs_per_unit(
+        [job for job in jobs if job.unit.name in touched_units], adapter
+    )
+
+    # --- Timeline --- #
+    if not problem.horizon_given:
+        if not jobs or (
+            max(adapter.to_tick(job.end) for job in jobs) != problem.t_last_tick
+        ):
+            return False
+    table = JobTable(jobs, adapter).trimmed(problem.t0_tick, problem.t_last_tick)
+    counts = table.tick_counts(problem.t0_tick, problem.t_last_tick)
+    counts[problem.t0_tick] += 1
+    if counts.keys() != problem.tick_to_index.keys():
+        return False
+
+    # --- Rows of the kept, removed and added jobs --- #
+    old_rows = {id(job): row for row, job in enumerate(old_table.jobs)}
+    kept = {}  # New row -> old row.
+    for row, job in enumerate(table.jobs):
+        if id(job) in old_rows:
+            kept[row] = old_rows[id(job)]
+    removed = sorted(set(range(len(old_table))) - set(kept.values()))
+    added = [row for row in range(len(table)) if row not in kept]
+    if not removed and not added:
+        problem.source_jobs = jobs
+        return True
+    views = table.views()
+    units = {old_table.jobs[row].unit.name for row in removed} | {
+        table.jobs[row].unit.name for row in added
+    }
+    if any(views[row].unit.type not in problem.unit_types for row in added):
+        return False
+    for conditions in (problem.initial_conditions, problem.final_conditions):
+        if conditions is not None and any(
+            unit.name in units for unit in conditions["assignments"]
+        ):
+            return False
+    if problem.fixed_variables:
+        fixed = {
+            index if index >= 0 else -index - 1
+            for index in (var.Index() for var, _ in problem.fixed_variables)
+        }
+        touched_vars = set()
+        for row in removed:
+            touched_vars |= _variable_indices(problem.assigned_vars.get(row, {}))
+            touched_vars |= _variable_indices(problem.pattern_assigned_vars[row])
+        for name in units:
+            touched_vars |= _variable_indices(problem.unit_movement_vars.get(name, {}))
+        if fixed & touched_vars:
+            return False
+
+    presolve = problem.presolve
+    if presolve is not None:
+        needed = presolve_patterns_and_positions(
+            views, problem.positions_configuration, problem.pos_unit_model_dependency
+        )
+        # The current presolve is kept: more patterns than needed is still exact.
+        if not needed.usable_positions <= presolve.usable_positions or any(
+            not set(k_list) <= set(presolve.usable_patterns.get(unit_type, ()))
+            for unit_type, k_list in needed.usable_patterns.items()
+        ):
+            return False
+
+    # Capacity of the time steps the touched jobs span.
+    touched_ticks = [old_table.start_ticks[row] for row in removed] + [
+        old_table.end_ticks[row] for row in removed
+    ]
+    touched_ticks += [table.start_ticks[row] for row in added]
+    touched_ticks += [table.end_ticks[row] for row in added]
+    low, high = min(touched_ticks), max(touched_ticks)
+    capacity_summary = validate_capacity_feasibility(
+        [
+            views[row]
+            for row in range(len(table))
+            if table.start_ticks[row] <= high and table.end_ticks[row] >= low
+        ],
+        problem.positions,
+        [tick for tick in problem.compressed_ticks if low <= tick <= high],
+        problem.tick_to_index,
+        adapter,
+        problem.index_to_value,
+    )
+
+    # --- Update the model --- #
+    model = problem.model
+    touched_positions = set()
+    for row in removed:
+        touched_positions.update(problem.assigned_vars.get(row, {}))
+    for name in units:
+        _clear(model, ranges.units.pop(name, []))
+    _clear(model, ranges.lower_bound)
+    ranges.lower_bound = []
+
+    usable_positions = usable_patterns = None
+    if presolve is not None:
+        usable_positions = presolve.usable_positions
+        usable_patterns = presolve.usable_patterns
+    added_jobs = [views[row] for row in added]
+    added_assigned = create_assignment_variables(
+        model,
+        added_jobs,
+        problem.positions,
+        problem.compressed_ticks,
+        problem.tick_to_index,
+        adapter,
+        usable_positions,
+    )
+    added_patterns = create_pattern_assignment_variables(
+        model,
+        added_jobs,
+        problem.compressed_ticks,
+        problem.tick_to_index,
+        problem.pos_unit_model_dependency,
+        added_assigned,
+        adapter,
+        usable_patterns,
+    )
+    for p_map in added_assigned.values():
+        touched_positions.update(p_map)
+    for p_idx in touched_positions:
+        _clear(model, ranges.positions.pop(p_idx, []))
+
+    def rows_of(old: dict, new: dict) -> dict:
+        return {
+            row: (old.get(kept[row], {}) if row in kept else new[added.index(row)])
+            for row in range(len(table))
+        }
+
+    problem.assigned_vars = rows_of(problem.assigned_vars, added_assigned)
+    problem.pattern_assigned_vars = rows_of(
+        problem.pattern_assigned_vars, added_patterns
+    )
+    reduction = problem.fixed_reduction
+    reduction = problem.fixed_reduction = replace(
+        reduction,
+        assigned_vars=rows_of(reduction.assigned_vars, added_assigned),
+        pattern_assigned_vars=rows_of(reduction.pattern_assigned_vars, added_patterns),
+    )
+
+    unit_movement_vars = problem.unit_movement_vars
+    remaining = {job.unit.name for job in views}
+    for name, t_map in create_unit_movement_variables(
+        model,
+        [job for job in added_jobs if job.unit.name not in unit_movement_vars],
+        problem.num_time_steps,
+    ).items():
+        unit_movement_vars[name] = t_map
+    variables = model.Proto().variables
+    for name in units - remaining:
+        for var in unit_movement_vars.pop(name, {}).values():
+            variables[var.Index()].domain[:] = [0, 0]
+
+    problem.source_jobs = jobs
+    problem.job_table = table
+    problem.jobs = views
+    problem.capacity_summary.update(capacity_summary)
+
+    # Constraints of the touched units, with their rows renumbered from 0.
+    unit_rows = [row for row, job in enumerate(views) if job.unit.name in units]
+    if unit_rows:
+        local_assigned = {
+            i: reduction.assigned_vars[row] for i, row in enumerate(unit_rows)
+        }
+        local_patterns = {
+            i: reduction.pattern_assigned_vars[row] for i, row in enumerate(unit_rows)
+        }
+        local_jobs = [views[row] for row in unit_rows]
+        add_job_assignment_constraints(
+            model,
+            local_assigned,
+            local_patterns,
+            local_jobs,
+            problem.positions,
+            problem.tick_to_index,
+            problem.compressed_ticks,
+            problem.pos_unit_model_dependency,
+            adapter,
+            ranges.units,
+        )
+        add_movement_detection_constraints(
+            model,
+            local_assigned,
+            local_patterns,
+            unit_movement_vars,
+            problem.movement_in_position_vars,
+            local_jobs,
+            num_timesteps=problem.num_time_steps,
+            positions_configuration=problem.positions_configuration,
+            usable_positions=usable_positions,
+            ranges=ranges.units,
+        )
+
+    if touched_positions:
+        position_ranges = defaultdict(list)
+        add_position_capacity_constraints(
+            model,
+            {
+                row: {
+                    p_idx: t_map
+                    for p_idx, t_map in p_map.items()
+                    if p_idx in touched_positions
+                }
+                for row, p_map in reduction.assigned_vars.items()
+            },
+            problem.positions,
+            views,
+            problem.num_time_steps,
+            position_ranges,
+        )
+        for p_idx in touched_positions:
+            ranges.positions[p_idx].extend(position_ranges[p_idx])
+
+    # Objective over the current units, and the lower bound of the new jobs.
+    problem.set_objective()
+    return True
@@ -0,0 +1,461 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.presolve import prune_trigger_map
+
+
+@dataclass
+class Block:
+    """Maximal run of consecutive time steps [first, last] in which a unit has a job."""
+
+    unit_name: str
+    unit_type: object
+    first: int
+    last: int
+    jobs: List[int]  # j_idx in time order
+    job_steps: Dict[int, Tuple[int, int]]  # j_idx -> (first, last) step
+    present: List[cp_model.IntVar] = field(default_factory=list)
+    starts: List[cp_model.IntVar] = field(default_factory=list)
+    ends: List[cp_model.IntVar] = field(default_factory=list)
+    # stays[s][k_idx] = presence literal of the stay of slot s in pattern k_idx.
+    stays: List[Dict[int, cp_model.IntVar]] = field(default_factory=list)
+    intervals: List[Dict[int, cp_model.IntervalVar]] = field(default_factory=list)
+
+
+class IntervalModel:
+    """
+    Segment-based formulation of the problem: every stay of a unit in a pattern is an
+    optional interval, instead of one variable per job × position × time step.
+
+    The time steps of each unit are split in blocks (maximal runs of consecutive steps
+    with an active job). A block is covered by a sequence of up to
+    `len(block jobs) + Problem.INTERVAL_EXTRA_STAYS` stay slots. Each present slot picks
+    one pattern (different from the previous slot), starts right after the previous slot
+    and the last one ends with the block. A pattern can only be used while it covers the
+    need of the active job. Plans needing more stays in a block are left out, so a small
+    INTERVAL_EXTRA_STAYS can exclude the optimum.
+
+    Constraints, following the time-indexed model:
+        - Capacity: AddNoOverlap (capacity 1) or AddCumulative over the stays using each
+          position.
+        - Movements: a unit moves when it changes slot, when a block starts after the
+          first time step (arrival) and when it ends before the last one (departure).
+          Movements per block = number of stays - 1 + arrival + departure.
+        - Cascade: a unit can not stay across a time step at which a position of its
+          pattern is touched by another unit: OUT gate positions (allowed_patterns[0]) on
+          every arrival/departure, triggered positions, and positions with capacity > 1
+          on every stay starting or ending there (units sharing them arrive and leave
+          together). Capacity 1 positions are covered by the NoOverlap.
+
+    Long jobs cost O(stays) variables instead of O(steps). Fixed variables
+    (add_fixed_*), symmetry breaking, capacity cuts and search strategies are not
+    available with this engine.
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.model = problem.model
+        self.num_time_steps = problem.num_time_steps
+        dependency = problem.pos_unit_model_dependency
+        dependency.generate_matrix()  # Make sure default patterns exist.
+
+        index_map = problem.positions_configuration.index_map
+        self.pattern_positions = {}  # (UnitType, k_idx) -> tuple of position indices
+        self.pattern_needs = {}  # (UnitType, k_idx) -> set of needs covered
+        self.usable_patterns = {}  # UnitType -> [k_idx]
+        for unit_type in problem.unit_types:
+            if problem.presolve is not None:
+                usable = problem.presolve.usable_patterns[unit_type]
+            else:
+                usable = range(len(unit_type.allowed_patterns))
+            self.usable_patterns[unit_type] = list(usable)
+            for k_idx, pattern in enumerate(unit_type.allowed_patterns):
+                self.pattern_positions[(unit_type, k_idx)] = tuple(
+                    index_map[p.name] for p in pattern.positions
+                )
+                needs = None
+                for position in pattern.positions:
+                    covered = {need.name for need in position.available_needs}
+                    needs = covered if needs is None else needs & covered
+                self.pattern_needs[(unit_type, k_idx)] = needs or set()
+
+        self.blocks = self._build_blocks()
+        for block in self.blocks:
+            self._create_block_variables(block)
+
+    # --- Variables --- #
+    def _build_blocks(self) -> List[Block]:
+        problem = self.problem
+        ticks = problem.compressed_ticks
+        table = problem.job_table
+        by_unit = defaultdict(list)
+        for j_idx, job in enumerate(problem.jobs):
+            first = bisect_left(ticks, table.start_ticks[j_idx])
+            last = bisect_right(ticks, table.end_ticks[j_idx]) - 1
+            if first <= last:
+                by_unit[job.unit.name].append((first, last, j_idx))
+
+        blocks = []
+        for unit_name, steps in sorted(by_unit.items()):
+            steps.sort()
+            unit_type = problem.jobs[steps[0][2]].unit.type
+            block = None
+            for first, last, j_idx in steps:
+                if block is None or first > block.last + 1:
+                    block = Block(unit_name, unit_type, first, last, [], {})
+                    blocks.append(block)
+                block.last = max(block.last, last)
+                block.jobs.append(j_idx)
+                block.job_steps[j_idx] = (first, last)
+        return blocks
+
+    def _forbidden_windows(self, block: Block, k_idx: int) -> List[Tuple[int, int]]:
+        """Merged step windows of the block jobs whose need pattern k_idx does not cover."""
+        needs = self.pattern_needs[(block.unit_type, k_idx)]
+        windows = []
+        for j_idx in block.jobs:
+            if self.problem.jobs[j_idx].phase.required_need.name in needs:
+                continue
+            first, last = block.job_steps[j_idx]
+            if windows and first <= windows[-1][1] + 1:
+                windows[-1] = (windows[-1][0], max(windows[-1][1], last))
+            else:
+                windows.append((first, last))
+        return windows
+
+    def _create_block_variables(self, block: Block):
+        model = self.model
+        first, last = block.first, block.last
+        n_slots = min(
+            len(block.jobs) + self.problem.INTERVAL_EXTRA_STAYS, last - first + 1
+        )
+        candidates = {}  # k_idx -> forbidden windows
+        for k_idx in self.usable_patterns[block.unit_type]:
+            windows = self._forbidden_windows(block, k_idx)
+            if windows != [(first, last)]:
+                candidates[k_idx] = windows
+        if not candidates:
+            job = self.problem.jobs[block.jobs[0]]
+            raise ValueError(f"No compatible pattern found for unit {job.unit.name}.")
+
+        name = f"{block.unit_name}_b{first}"
+        for s in range(n_slots):
+            present = model.NewBoolVar(f"stay_{name}_s{s}")
+            start = model.NewIntVar(
+                first, first if s == 0 else last, f"start_{name}_s{s}"
+            )
+            end = model.NewIntVar(first, last, f"end_{name}_s{s}")
+            size = model.NewIntVar(1, last - first + 1, f"size_{name}_s{s}")
+            block.present.append(present)
+            block.starts.append(start)
+            block.ends.append(end)
+
+            stays, intervals = {}, {}
+            for k_idx, windows in candidates.items():
+                x = model.NewBoolVar(f"stay_{name}_s{s}_k{k_idx}")
+                intervals[k_idx] = model.NewOptionalIntervalVar(
+                    start, size, end + 1, x, f"interval_{name}_s{s}_k{k_idx}"
+                )
+                stays[k_idx] = x
+                self._forbid_windows(start, end, x, windows, first, last)
+            block.stays.append(stays)
+            block.intervals.append(intervals)
+
+            model.Add(sum(stays.values()) == present)
+            # Absent slots are pinned to the block end.
+            model.Add(start == last).OnlyEnforceIf(present.Not())
+            model.Add(end == last).OnlyEnforceIf(present.Not())
+
+        model.Add(block.present[0] == 1)
+        for s in range(n_slots):
+            present, end = block.present[s], block.ends[s]
+            if s + 1 == n_slots:
+                model.Add(end == last).OnlyEnforceIf(present)
+                continue
+            nxt = block.present[s + 1]
+            model.AddImplication(nxt, present)
+            model.Add(block.starts[s + 1] == end + 1).OnlyEnforceIf(nxt)
+            model.Add(end == last).OnlyEnforceIf([present, nxt.Not()])
+            for k_idx, x in block.stays[s].items():
+                x_next = block.stays[s + 1].get(k_idx)
+                if x_next is not None:
+                    model.AddBoolOr([x.Not(), x_next.Not()])
+
+    def _forbid_windows(self, start, end, x, windows, first, last):
+        """A stay selected by x must not overlap any of the windows."""
+        for w_first, w_last in windows:
+            if w_first == first:
+                self.model.Add(start >= w_last + 1).OnlyEnforceIf(x)
+            elif w_last == last:
+                self.model.Add(end <= w_first - 1).OnlyEnforceIf(x)
+            else:
+                before = self.model.NewBoolVar("")
+                self.model.Add(end <= w_first - 1).OnlyEnforceIf([x, before])
+                self.model.Add(start >= w_last + 1).OnlyEnforceIf([x, before.Not()])
+
+    def _stays_of_position(self) -> Dict[int, List[Tuple[Block, int, int]]]:
+        """Position index -> [(block, slot, k_idx)] of the stays using it."""
+        stays = defaultdict(list)
+        for block in self.blocks:
+            for s, k_map in enumerate(block.stays):
+                for k_idx in k_map:
+                    for p_idx in self.pattern_positions[(block.unit_type, k_idx)]:
+                        stays[p_idx].append((block, s, k_idx))
+        return stays
+
+    def _not_spanning(self, block: Block, s: int, t, enforce: list):
+        """The stay of slot s does not cover both t and t + 1 (under enforce)."""
+        model = self.model
+        if isinstance(t, int):
+            if t < block.first or t >= block.last:
+                return
+        after = model.NewBoolVar("")
+        model.Add(block.starts[s] >= t + 1).OnlyEnforceIf(enforce + [after])
+        model.Add(block.ends[s] <= t).OnlyEnforceIf(enforce + [after.Not()])
+
+    # --- Constraints --- #
+    def add_constraints(self):
+        problem = self.problem
+        if problem.initial_conditions is not None:
+            self._apply_initial_conditions()
+        if problem.final_conditions is not None:
+            self._apply_final_conditions()
+        stays_of_position = self._stays_of_position()
+        self._add_capacity_constraints(stays_of_position)
+        self._add_shared_position_constraints(stays_of_position)
+        self._add_gate_constraints(stays_of_position)
+        self._add_trigger_constraints(stays_of_position)
+
+    def _add_capacity_constraints(self, stays_of_position):
+        for p_idx, stays in stays_of_position.items():
+            capacity = self.problem.positions[p_idx].capacity
+            intervals = []
+            for block, s, k_idx in stays:
+                if capacity == 0:
+                    self.model.Add(block.stays[s][k_idx] == 0)
+                    continue
+                intervals.append(block.intervals[s][k_idx])
+            if not intervals:
+                continue
+            if capacity == 1:
+                self.model.AddNoOverlap(intervals)
+            else:
+                self.model.AddCumulative(intervals, [1] * len(intervals), capacity)
+
+    def _add_shared_position_constraints(self, stays_of_position):
+        """
+        Units sharing a position with capacity > 1 arrive and leave together: any arrival
+        or departure touches the position and the units staying in it must move.
+        Pooled positions (see PositionAggregation) are skipped.
+        """
+        model = self.model
+        pooled = {
+            self.problem.positions_configuration.index_map[name]
+            for name in self.problem.pooled_positions
+        }
+        for p_idx, stays in stays_of_position.items():
+            if self.problem.positions[p_idx].capacity <= 1 or p_idx in pooled:
+                continue
+            for i, (block_a, s_a, k_a) in enumerate(stays):
+                for block_b, s_b, k_b in stays[i + 1 :]:
+                    if block_a.unit_name == block_b.unit_name:
+                        continue
+                    if block_a.last < block_b.first or block_b.last < block_a.first:
+                        continue
+                    x_a, x_b = block_a.stays[s_a][k_a], block_b.stays[s_b][k_b]
+                    start_a, end_a = block_a.starts[s_a], block_a.ends[s_a]
+                    start_b, end_b = block_b.starts[s_b], block_b.ends[s_b]
+                    a_first = model.NewBoolVar("")
+                    b_first = model.NewBoolVar("")
+                    same = model.NewBoolVar("")
+                    model.Add(end_a < start_b).OnlyEnforceIf(a_first)
+                    model.Add(end_b < start_a).OnlyEnforceIf(b_first)
+                    model.Add(start_a == start_b).OnlyEnforceIf(same)
+                    model.Add(end_a == end_b).OnlyEnforceIf(same)
+                    model.AddBoolOr([x_a.Not(), x_b.Not(), a_first, b_first, same])
+
+    def _arrival_departure_times(self) -> Dict[object, List[int]]:
+        """UnitType -> time steps t at which a unit of that type arrives/leaves (t, t+1)."""
+        times = defaultdict(set)
+        for block in self.blocks:
+            if block.first > 0:
+                times[block.unit_type].add(block.first - 1)
+            if block.last < self.num_time_steps - 1:
+                times[block.unit_type].add(block.last)
+        return {unit_type: sorted(t_set) for unit_type, t_set in times.items()}
+
+    def _add_gate_constraints(self, stays_of_position):
+        """Units in an OUT gate position can not stay across an arrival or departure."""
+        for unit_type, times in self._arrival_departure_times().items():
+            for p_idx in self.pattern_positions.get((unit_type, 0), ()):
+                for block, s, k_idx in stays_of_position.get(p_idx, []):
+                    x = block.stays[s][k_idx]
+                    lo = bisect_left(times, block.first)
+                    hi = bisect_left(times, block.last)
+                    for t in times[lo:hi]:
+                        self._not_spanning(block, s, t, [x])
+
+    def _add_trigger_constraints(self, stays_of_position):
+        """Units in a triggered position can not stay across the triggering movement."""
+        problem = self.problem
+        dep_matrix, _ = problem.positions_configuration.generate_matrix()
+        trigger_map = {
+            (i, j): {k for k, v in enumerate(dep_matrix[i][j]) if v}
+            for i in range(len(dep_matrix))
+            for j in range(len(dep_matrix))
+            if any(dep_matrix[i][j])
+        }
+        if problem.presolve is not None:
+            trigger_map, _ = prune_trigger_map(
+                trigger_map, problem.presolve.usable_positions
+            )
+        if not trigger_map:
+            return
+
+        def triggered(unit_type, k0, k1):
+            result = set()
+            for p_out in self.pattern_positions[(unit_type, k0)]:
+                for p_in in self.pattern_positions[(unit_type, k1)]:
+                    result.update(trigger_map.get((p_out, p_in), ()))
+            return result
+
+        def forbid(source, t, positions, enforce):
+            for q in positions:
+                for block, s, k_idx in stays_of_position.get(q, []):
+                    if block is source:
+                        continue
+                    if block.last < source.first - 1 or block.first > source.last + 1:
+                        continue
+                    self._not_spanning(block, s, t, enforce + [block.stays[s][k_idx]])
+
+        last_step = self.num_time_steps - 1
+        for block in self.blocks:
+            unit_type = block.unit_type
+            n_slots = len(block.stays)
+            # Arrival from the gate and departure to the gate.
+            for k_idx, x in block.stays[0].items():
+                if block.first > 0:
+                    positions = triggered(unit_type, 0, k_idx)
+                    forbid(block, block.first - 1, positions, [x])
+            if block.last < last_step:
+                for s in range(n_slots):
+                    is_last = [] if s + 1 == n_slots else [block.present[s + 1].Not()]
+                    for k_idx, x in block.stays[s].items():
+                        positions = triggered(unit_type, k_idx, 0)
+                        forbid(block, block.last, positions, [x] + is_last)
+            # Movements between consecutive slots.
+            for s in range(n_slots - 1):
+                for k0, x0 in block.stays[s].items():
+                    for k1, x1 in block.stays[s + 1].items():
+                        positions = triggered(unit_type, k0, k1)
+                        if k0 == k1 or not positions:
+                            continue
+                        forbid(block, block.ends[s], positions, [x0, x1])
+
+    def _apply_initial_conditions(self):
+        """Fix the pattern of the first slot of the units given in the initial conditions."""
+        problem = self.problem
+        t0_idx = problem.tick_to_index[problem.t0_tick]
+        first_blocks = {b.unit_name: b for b in self.blocks if b.first == t0_idx}
+        for j_idx, k_idx in problem.contour_patterns(
+            problem.initial_conditions, problem.t0_tick, "t0"
+        ):
+            block = first_blocks[problem.jobs[j_idx].unit.name]
+            self._check_contour_pattern(block, [block.stays[0]], k_idx)
+            self.model.Add(block.stays[0][k_idx] == 1)
+
+    def _apply_final_conditions(self):
+        """Fix the pattern of the last present slot of the units given in the final conditions."""
+        problem = self.problem
+        last_step = self.num_time_steps - 1
+        last_blocks = {b.unit_name: b for b in self.blocks if b.last == last_step}
+        for j_idx, k_idx in problem.contour_patterns(
+            problem.final_conditions, problem.index_to_tick[last_step], "t_last"
+        ):
+            block = last_blocks[problem.jobs[j_idx].unit.name]
+            self._check_contour_pattern(block, block.stays, k_idx)
+            # A slot in another pattern can not be the last present one.
+            for s, k_map in enumerate(block.stays):
+                nxt = block.present[s + 1] if s + 1 < len(block.stays) else None
+                for k, x in k_map.items():
+                    if k == k_idx:
+                        continue
+                    if nxt is None:
+                        self.model.Add(x == 0)
+                    else:
+                        self.model.AddImplication(x, nxt)
+
+    @staticmethod
+    def _check_contour_pattern(block: Block, slots, k_idx):
+        if not any(k_idx in k_map for k_map in slots):
+            raise ValueError(
+                f"No matching pattern found for unit {block.unit_name}: pattern {k_idx} "
+                f"can not be used at the contour of steps [{block.first}, {block.last}]."
+            )
+
+    # --- Objective --- #
+    def total_movements(self):
+        """Linear expression of the number of unit movements."""
+        last_step = self.num_time_steps - 1
+        terms, constant = [], 0
+        for block in self.blocks:
+            terms.extend(block.present)
+            constant += -1 + (block.first > 0) + (block.last < last_step)
+        return sum(terms) + constant
+
+    # --- Plans --- #
+    def read_patterns(self, solver) -> Dict[int, Dict[int, int]]:
+        """Pattern plan of the solver's solution: patterns[j_idx][t_idx] = k_idx."""
+        patterns = defaultdict(dict)
+        for block in self.blocks:
+            step_pattern = {}
+            for s, k_map in enumerate(block.stays):
+                if not solver.Value(block.present[s]):
+                    break
+                k_idx = next(k for k, x in k_map.items() if solver.Value(x))
+                for t_idx in range(
+                    solver.Value(block.starts[s]), solver.Value(block.ends[s]) + 1
+                ):
+                    step_pattern[t_idx] = k_idx
+            for j_idx, (first, last) in block.job_steps.items():
+                for t_idx in range(first, last + 1):
+                    patterns[j_idx][t_idx] = step_pattern[t_idx]
+        return dict(patterns)
+
+    def add_pattern_hints(self, patterns: Dict[int, Dict[int, int]]):
+        """
+        Hint the stays of a pattern plan. Blocks not fully planned, or needing more stays
+        than slots, are not hinted.
+        """
+        model = self.model
+        for block in self.blocks:
+            step_pattern = {}
+            for j_idx in block.jobs:
+                step_pattern.update(patterns.get(j_idx, {}))
+            if len(step_pattern) != block.last - block.first + 1:
+                continue
+            runs = []  # [k_idx, start, end]
+            for t_idx in range(block.first, block.last + 1):
+                k_idx = step_pattern[t_idx]
+                if runs and runs[-1][0] == k_idx:
+                    runs[-1][2] = t_idx
+                else:
+                    runs.append([k_idx, t_idx, t_idx])
+            if len(runs) > len(block.stays) or any(
+                k_idx not in block.stays[0] for k_idx, _, _ in runs
+            ):
+                continue
+            for s, k_map in enumerate(block.stays):
+                if s < len(runs):
+                    k_run, start, end = runs[s]
+                else:
+                    k_run, start, end = None, block.last, block.last
+                model.AddHint(block.present[s], int(s < len(runs)))
+                model.AddHint(block.starts[s], start)
+                model.AddHint(block.ends[s], end)
+                for k_idx, x in k_map.items():
+                    model.AddHint(x, int(k_idx == k_run))
@@ -0,0 +1,159 @@
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from frjmp.model.adapter import TimeAdapter
+from frjmp.model.sets.job import Job
+
+
+class JobView:
+    """Read-only view of a Job with overridden start/end values.
+
+    Used when a job has to be trimmed to a planning horizon without modifying the
+    caller's Job object. Exposes the same attributes used by the model (unit, phase,
+    start, end) and keeps a reference to the original job in `source`.
+    """
+
+    __slots__ = ("source", "start", "end")
+
+    def __init__(self, source: Job, start: Any, end: Any):
+        self.source = source
+        self.start = start
+        self.end = end
+
+    @property
+    def unit(self):
+        return self.source.unit
+
+    @property
+    def phase(self):
+        return self.source.phase
+
+    def __repr__(self):
+        return repr(self.source)
+
+
+class JobTable:
+    """Tick-level table of jobs: one row per job with its [start, end] ticks (inclusive).
+
+    Converting job values to ticks is done once here so that code that needs the job
+    time domains many times (scenarios, timeline compression, validations) can work
+    on plain integers instead of calling the TimeAdapter again and again.
+
+    Tables returned by `trimmed` share the Job objects of the original table and only
+    override their ticks, so trimming never modifies the caller's jobs.
+    """
+
+    def __init__(
+        self,
+        jobs: List[Job],
+        adapter: TimeAdapter,
+        start_ticks: Optional[List[int]] = None,
+        end_ticks: Optional[List[int]] = None,
+        source_indices: Optional[List[int]] = None,
+        overridden: Optional[List[bool]] = None,
+    ):
+        self.jobs = list(jobs)
+        self.adapter = adapter
+        if start_ticks is None:
+            start_ticks = [adapter.to_tick(job.start) for job in self.jobs]
+        if end_ticks is None:
+            end_ticks = [adapter.to_tick(job.end) for job in self.jobs]
+        self.start_ticks = start_ticks
+        self.end_ticks = end_ticks
+        # Index of each row in the job list the first table was built from.
+        self.source_indices = (
+            source_indices
+            if source_indices is not None
+            else list(range(len(self.jobs)))
+        )
+        # True for rows whose ticks differ from the job start/end values.
+        self.overridden = (
+            overridden if overridden is not None else [False] * len(self.jobs)
+        )
+        # Unit name -> (start ticks, rows) sorted by start, built on first active_row.
+        self._unit_index: Optional[Dict[str, Tuple[List[int], List[int]]]] = None
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def trimmed(self, start_tick: int, end_tick: int) -> "JobTable":
+        """
+        Return a new table restricted to the window [start_tick, end_tick].
+
+        - Jobs that end before start_tick or start after end_tick are dropped.
+        - Jobs overlapping the window bounds get their ticks clipped.
+        The jobs themselves are left untouched.
+        """
+        jobs, starts, ends, sources, overridden = [], [], [], [], []
+        for job, s, e, src, ovr in zip(
+            self.jobs,
+            self.start_ticks,
+            self.end_ticks,
+            self.source_indices,
+            self.overridden,
+        ):
+            if e < start_tick or s > end_tick:
+                continue
+            jobs.append(job)
+            starts.append(max(s, start_tick))
+            ends.append(min(e, end_tick))
+            sources.append(src)
+            overridden.append(ovr or s < start_tick or e > end_tick)
+        return JobTable(jobs, self.adapter, starts, ends, sources, overridden)
+
+    def views(self) -> list:
+        """
+        Job-like objects matching the table ticks.
+
+        Jobs whose ticks are not overridden are returned as they are; the rest are
+        wrapped in a JobView.
+        """
+        adapter = self.adapter
+        views = []
+        for job, s, e, ovr in zip(
+            self.jobs, self.start_ticks, self.end_ticks, self.overridden
+        ):
+            if ovr:
+                views.append(JobView(job, adapter.from_tick(s), adapter.from_tick(e)))
+            else:
+                views.append(job)
+        return views
+
+    def active_row(self, unit_name: str, tick: int) -> Optional[int]:
+        """
+        Row of the job of the unit active at tick ([start, end] inclusive), or None.
+
+        Jobs of a unit do not overlap, so the rows of each unit are sorted by start tick
+        once and every lookup is a bisect.
+        """
+        if self._unit_index is None:
+            rows_by_unit = defaultdict(list)
+            for row, (job, start) in enumerate(zip(self.jobs, self.start_ticks)):
+                rows_by_unit[job.unit.name].append((start, row))
+            self._unit_index = {}
+            for name, rows in rows_by_unit.items():
+                rows.sort()
+                self._unit_index[name] = ([s for s, _ in rows], [r for _, r in rows])
+
+        starts, rows = self._unit_index.get(unit_name, ([], []))
+        pos = bisect_right(starts, tick) - 1
+        if pos >= 0 and self.end_ticks[rows[pos]] >= tick:
+            return rows[pos]
+        return None
+
+    def tick_counts(self, start_tick: int, end_tick: int) -> Counter:
+        """
+        Count the boundary ticks of the jobs clipped to the window [start_tick, end_tick].
+
+        Jobs completely outside the window are ignored. A Counter (instead of a set) is
+        returned so callers can remove the ticks of a job later on and still know if some
+        other job keeps that tick alive in the compressed timeline.
+        """
+        counts = Counter()
+        for s, e in zip(self.start_ticks, self.end_ticks):
+            if e < start_tick or s > end_tick:
+                continue
+            counts[max(s, start_tick)] += 1
+            counts[min(e, end_tick)] += 1
+        return counts
@@ -0,0 +1,272 @@
+import math
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+from ortools.sat import cp_model_pb2
+from ortools.sat.python import cp_model
+
+from frjmp.model.heuristic import build_greedy_plan
+
+NEIGHBOURHOOD_TYPES = ("time_window", "unit_group", "trigger_group")
+
+
+@dataclass
+class LNSResult:
+    """
+    Outcome of a LargeNeighborhoodSearch run.
+
+    Attributes:
+        patterns: Best plan found, patterns[j_idx][t_idx] = k_idx.
+        objective: Objective value of that plan (None if no solution was found).
+        best_bound: Best objective bound found by the initial full solve.
+        history: One dict per neighbourhood solve (type, size, status, objective, improved,
+            gain, time).
+        stats: Per neighbourhood type statistics (attempts, improvements, gain, time).
+    """
+
+    patterns: Dict[int, Dict[int, int]]
+    objective: Optional[float]
+    best_bound: Optional[float]
+    history: List[dict] = field(default_factory=list)
+    stats: pd.DataFrame = None
+
+
+class LargeNeighborhoodSearch:
+    """
+    Large Neighborhood Search around a Problem.
+
+    The model is built once. Each iteration clones it, fixes the pattern_assigned_vars of
+    every (job, time) outside the chosen neighbourhood to the incumbent (by setting the
+    variable domains in the cloned proto) and re-solves with a short time limit.
+
+    Neighbourhood types:
+        - time_window: every job in a window of consecutive compressed time steps.
+        - unit_group: every time step of a set of units that share positions in the incumbent.
+        - trigger_group: jobs using positions linked by a trigger of the PositionsConfiguration.
+    """
+
+    def __init__(
+        self,
+        problem,
+        neighbourhood_size: float = 0.2,
+        neighbourhood_types: Tuple[str, ...] = NEIGHBOURHOOD_TYPES,
+        seed: int = 0,
+    ):
+        unknown = set(neighbourhood_types) - set(NEIGHBOURHOOD_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown neighbourhood types {unknown}.")
+        self.problem = problem
+        self.neighbourhood_size = neighbourhood_size
+        self.random = random.Random(seed)
+
+        # Trigger groups are only available when there are triggers.
+        pos_index = problem.positions_configuration.index_map
+        self.trigger_groups: List[Set[int]] = [
+            {pos_index[a.name], pos_index[b.name]}
+            | {pos_index[p.name] for p in triggered}
+            for (a, b), triggered in problem.positions_configuration.triggers.items()
+        ]
+        self.neighbourhood_types = [
+            n
+            for n in neighbourhood_types
+            if n != "trigger_group" or self.trigger_groups
+        ]
+
+        self.slots = [
+            (j_idx, t_idx)
+            for j_idx, t_map in problem.pattern_assigned_vars.items()
+            for t_idx in t_map
+        ]
+        self.pattern_positions = {}  # (unit type, k_idx) -> set of position indices
+        for unit_type in problem.unit_types:
+            for k_idx, pattern in enumerate(unit_type.allowed_patterns):
+                self.pattern_positions[(unit_type, k_idx)] = {
+                    pos_index[p.name] for p in pattern.positions
+                }
+
+    # --- Neighbourhoods --- #
+    def _time_window(self, incumbent) -> Set[Tuple[int, int]]:
+        n_steps = self.problem.num_time_steps
+        width = max(1, math.ceil(self.neighbourhood_size * n_steps))
+        start = self.random.randrange(0, max(1, n_steps - width + 1))
+        return {(j, t) for j, t in self.slots if start <= t < start + width}
+
+    def _positions_used(self, incumbent, j_idx, t_idx) -> Set[int]:
+        unit_type = self.problem.jobs[j_idx].unit.type
+        return self.pattern_positions[(unit_type, incumbent[j_idx][t_idx])]
+
+    def _unit_group(self, incumbent) -> Set[Tuple[int, int]]:
+        jobs = self.problem.jobs
+        target = max(1, math.ceil(self.neighbourhood_size * len(self.slots)))
+        units_by_position = defaultdict(set)
+        for j_idx, t_idx in self.slots:
+            for p_idx in self._positions_used(incumbent, j_idx, t_idx):
+                units_by_position[p_idx].add(jobs[j_idx].unit.name)
+
+        # Grow a group of units from a random position through shared positions.
+        positions = list(units_by_position)
+        frontier = [self.random.choice(positions)]
+        seen_positions, units = set(frontier), set()
+        free = set()
+        while frontier and len(free) < target:
+            p_idx = frontier.pop(0)
+            for unit_name in sorted(units_by_position[p_idx] - units):
+                units.add(unit_name)
+                for j_idx, t_idx in self.slots:
+                    if jobs[j_idx].unit.name != unit_name:
+                        continue
+                    free.add((j_idx, t_idx))
+                    for q_idx in self._positions_used(incumbent, j_idx, t_idx):
+                        if q_idx not in seen_positions:
+                            seen_positions.add(q_idx)
+                            frontier.append(q_idx)
+        return free
+
+    def _trigger_group(self, incumbent) -> Set[Tuple[int, int]]:
+        group = self.random.choice(self.trigger_groups)
+        return {
+            (j_idx, t_idx)
+            for j_idx, t_idx in self.slots
+            if self._positions_used(incumbent, j_idx, t_idx) & group
+        }
+
+    # --- Search --- #
+    def _read_patterns(self, solver) -> Dict[int, Dict[int, int]]:
+        return self.problem.read_patterns(solver)
+
+    def _fixed_clone(self, incumbent, free: Set[Tuple[int, int]]) -> cp_model.CpModel:
+        clone = self.problem.model.Clone()
+        proto_vars = clone.Proto().variables
+        for j_idx, t_map in self.problem.pattern_assigned_vars.items():
+            for t_idx, k_map in t_map.items():
+                if (j_idx, t_idx) in free:
+                    continue
+                chosen = incumbent[j_idx][t_idx]
+                for k_idx, var in k_map.items():
+                    value = int(k_idx == chosen)
+                    proto_vars[var.Index()].domain[:] = [value, value]
+        return clone
+
+    def run(
+        self,
+        iterations: int = 50,
+        time_limit: float = 60,
+        neighbourhood_time_limit: float = 5,
+        initial_time_limit: float = 10,
+    ) -> LNSResult:
+        """
+        Run the LNS loop.
+
+        Args:
+            iterations: Maximum number of neighbourhood solves.
+            time_limit: Wall time budget in seconds for the whole run (initial solve included).
+            neighbourhood_time_limit: Time limit of each neighbourhood solve.
+            initial_time_limit: Time limit of the initial full solve used as incumbent.
+
+        The solves use the solver properties of the problem (configure_solver) with these
+        time limits. The incumbent is hinted through the hints of the problem model,
+        which are restored when the run returns.
+        """
+        problem = self.problem
+        problem.build_model()
+        hints = cp_model_pb2.PartialVariableAssignment()
+        hints.CopyFrom(problem.model.Proto().solution_hint)
+        try:
+            return self._run(
+                iterations, time_limit, neighbourhood_time_limit, initial_time_limit
+            )
+        finally:
+            problem.model.Proto().solution_hint.CopyFrom(hints)
+
+    def _solver(self, time_limit: float) -> cp_model.CpSolver:
+        solver = cp_model.CpSolver()
+        self.problem.configure_solver(solver)
+        solver.parameters.max_time_in_seconds = time_limit
+        return solver
+
+    def _run(
+        self,
+        iterations: int,
+        time_limit: float,
+        neighbourhood_time_limit: float,
+        initial_time_limit: float,
+    ) -> LNSResult:
+        problem = self.problem
+        start_time = time.time()
+        greedy_plan = build_greedy_plan(problem)
+        problem.add_pattern_hints(greedy_plan.patterns)
+
+        solver = self._solver(min(initial_time_limit, time_limit))
+        status = solver.Solve(problem.model)
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            incumbent = self._read_patterns(solver)
+            objective = solver.ObjectiveValue()
+            best_bound = solver.BestObjectiveBound()
+        elif greedy_plan.complete:
+            # The full model did not get a solution in time: start from the greedy plan.
+            incumbent = greedy_plan.patterns
+            objective = greedy_plan.movements
+            best_bound = 0
+        else:
+            return LNSResult({}, None, None, stats=self._stats([]))
+        history = []
+
+        for _ in range(iterations):
+            remaining = time_limit - (time.time() - start_time)
+            if status == cp_model.OPTIMAL or objective <= best_bound or remaining <= 0:
+                break
+
+            kind = self.random.choice(self.neighbourhood_types)
+            free = getattr(self, f"_{kind}")(incumbent)
+            clone = self._fixed_clone(incumbent, free)
+            problem_hints = problem.model.Proto().solution_hint
+            clone.Proto().solution_hint.CopyFrom(problem_hints)
+
+            sub_solver = self._solver(min(neighbourhood_time_limit, remaining))
+            sub_status = sub_solver.Solve(clone)
+
+            gain = 0
+            new_objective = None
+            if sub_status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                new_objective = sub_solver.ObjectiveValue()
+                # Equal objective plans are accepted as well to diversify the search.
+                if new_objective <= objective:
+                    gain = objective - new_objective
+                    objective = new_objective
+                    incumbent = self._read_patterns(sub_solver)
+                    problem.add_pattern_hints(incumbent)
+
+            history.append(
+                dict(
+                    type=kind,
+                    size=len(free),
+                    status=sub_solver.StatusName(sub_status),
+                    objective=new_objective,
+                    improved=gain > 0,
+                    gain=gain,
+                    time=sub_solver.WallTime(),
+                )
+            )
+
+        return LNSResult(
+            incumbent, objective, best_bound, history, stats=self._stats(history)
+        )
+
+    def _stats(self, history: List[dict]) -> pd.DataFrame:
+        rows = []
+        for kind in self.neighbourhood_types:
+            runs = [h for h in history if h["type"] == kind]
+            rows.append(
+                dict(
+                    type=kind,
+                    attempts=len(runs),
+                    improvements=sum(h["improved"] for h in runs),
+                    gain=sum(h["gain"] for h in runs),
+                    time=sum(h["time"] for h in runs),
+                )
+            )
+        return pd.DataFrame(rows)
@@ -1,72 +1,313 @@
-import time
-import threading
+import asyncio
 import csv
+import inspect
+import json
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
 from ortools.sat.python import cp_model
 
 
+@dataclass
+class SolutionRecord:
+    """One improving solution, as seen by the solution callback."""
+
+    step: int
+    wall_time: float  # Solver wall time in seconds.
+    deterministic_time: float
+    objective: float
+    bound: float
+
+
+class SolutionSink:
+    """
+    Destination of the solution records. write() is only called by the background writer
+    of IncrementalSolverLogger, with the records batched in solution order.
+
+    The sink belongs to its creator, who closes it (or uses it as a context manager): the
+    logger does not close sinks it was given, so a sink can receive several solves.
+    """
+
+    def write(self, records: List[SolutionRecord]):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class MemorySink(SolutionSink):
+    """Keep the records in self.records."""
+
+    def __init__(self):
+        self.records: List[SolutionRecord] = []
+
+    def write(self, records):
+        self.records.extend(records)
+
+
+class CsvSink(SolutionSink):
+    """Write the records as CSV rows (the file is opened once and flushed per batch)."""
+
+    HEADER = [
+        "Iteration",
+        "Timestamp (ms)",
+        "Deterministic time",
+        "Objective Value",
+        "Bound Value",
+    ]
+
+    def __init__(self, path="logs/logs.csv"):
+        self._file = open(path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.HEADER)
+
+    def write(self, records):
+        self._writer.writerows(
+            [r.step, r.wall_time * 1000, r.deterministic_time, r.objective, r.bound]
+            for r in records
+        )
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class JsonlSink(SolutionSink):
+    """Write one JSON object (the SolutionRecord fields) per line."""
+
+    def __init__(self, path="logs/logs.jsonl"):
+        self._file = open(path, "w")
+
+    def write(self, records):
+        self._file.writelines(json.dumps(asdict(r)) + "\n" for r in records)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class LoopSink(SolutionSink):
+    """
+    Forward the records to an asyncio event loop: handler(record) runs on the loop thread
+    and awaitables it returns are scheduled as tasks. The records are also written to
+    `sink` if given (it is not closed with the LoopSink).
+    """
+
+    def __init__(self, loop, handler, sink: Optional[SolutionSink] = None):
+        self.loop = loop
+        self.handler = handler
+        self.sink = sink
+
+    def write(self, records):
+        if self.sink is not None:
+            self.sink.write(records)
+        for record in records:
+            try:
+                self.loop.call_soon_threadsafe(self._deliver, record)
+            except RuntimeError:  # The loop was closed.
+                return
+
+    def _deliver(self, record):
+        result = self.handler(record)
+        if inspect.isawaitable(result):
+            asyncio.ensure_future(result)
+
+
+_END = object()  # Queue sentinel stopping the writer.
+
+
 class IncrementalSolverLogger(cp_model.CpSolverSolutionCallback):
+    """
+    Solution callback recording every solution, which stops the search when:
+        - a solution reaches lower_bound;
+        - no better solution was found for inactivity_timeout seconds (once there is one).
+
+    The callback runs on the solver threads, so it only reads ObjectiveValue(),
+    BestObjectiveBound() and the solver times and puts a SolutionRecord in a queue (no
+    lock, no expression evaluation, no I/O). A background writer batches the queued
+    records into the sink and prints them (print_solutions).
+
+    Inactivity is measured on the solver clock: the WallTime() of the last solution
+    against the solver time elapsed since start() (call it right before Solve). It is run
+    by a watchdog thread that sleeps until the deadline instead of polling, so it reacts
+    within milliseconds. The thread is needed because the stop is due precisely when the
+    solver reports nothing: no solution or bound callback runs while the search is stuck.
+
+    Use the logger as a context manager (or call start()/stop()) so both threads are
+    joined, and the pending records written, when the solve returns (only the CsvSink of
+    log=True is closed):
+
+        with IncrementalSolverLogger(sink=MemorySink(), inactivity_timeout=60) as logger:
+            status = solver.Solve(model, logger)
+
+    For reproducible stops use the solver-side max_deterministic_time
+    (Problem.DETERMINISTICTIMELIMIT).
+    """
+
     def __init__(
         self,
-        objective_var,
+        objective_var=None,
         csv_file="logs/logs.csv",
         inactivity_timeout=120,
         log=False,
+        lower_bound=None,
+        sink: Optional[SolutionSink] = None,
+        print_solutions=True,
+        checkpointer=None,
     ):
+        """
+        Args:
+            objective_var: Not used (the model objective is read), kept for compatibility.
+            csv_file, log: With log=True and no sink, the records go to CsvSink(csv_file).
+            sink: SolutionSink receiving the records.
+            checkpointer: Checkpointer (checkpoint.py) capturing every solution.
+        """
         cp_model.CpSolverSolutionCallback.__init__(self)
-        self._objective_var = objective_var
-        self._csv_file = csv_file
-        self._last_activity_time = time.time()  # Time of the last solution or activity
-        self._inactivity_timeout = inactivity_timeout  # Timeout in seconds
+        self._started = time.monotonic()  # Solver time 0, set by start().
+        self._last_solution_time = 0.0  # Solver WallTime() of the last solution.
+        self._inactivity_timeout = inactivity_timeout  # Timeout in seconds (or None)
         self._step = 1
-        self._stop_flag = threading.Event()  # Flag to stop the solver gracefully
-        self._lock = threading.Lock()
-        self._start_time = time.time()  # Start time of the solving process
-        self._log = log
+        self._stopped = threading.Event()  # Set by stop() or when the search stops.
+        self._records = queue.SimpleQueue()
+        self._watchdog = None
+        self._writer = None
+        self._sink_error = None  # First exception of sink.write().
+        self._lower_bound = lower_bound  # Stop as soon as a solution reaches it.
+        # Only the sink created here is closed by stop(), given sinks are the caller's.
+        self._owns_sink = sink is None and log
+        if self._owns_sink:
+            sink = CsvSink(csv_file)
+        self.sink = sink
+        self.print_solutions = print_solutions
+        self.checkpointer = checkpointer
+        self.lower_bound_reached = False
         self.step_time_limit_reached = False
         self.at_least_one_solution_found = False
+        self.last_record: Optional[SolutionRecord] = None
 
-        # Write the header to the CSV file at initialization
-        if self._log:
-            with open(self._csv_file, "w", newline="") as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(
-                    ["Iteration", "Timestamp (ms)", "Objective Value", "Bound Value"]
-                )
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
 
     def on_solution_callback(self):
-        # Update the last activity time when a solution is found
-        with self._lock:
-            self.at_least_one_solution_found = True
-            self._last_activity_time = time.time()
-            obj_value = self.Value(self._objective_var)
-            elapsed_time = (time.time() - self._start_time) * 1000  # Milliseconds
-            bound_value = self.BestObjectiveBound()
-            message = f"Step {self._step}. Objective function = {obj_value}. Lower bound = {bound_value}"
+        record = SolutionRecord(
+            self._step,
+            self.WallTime(),
+            self.DeterministicTime(),
+            self.ObjectiveValue(),
+            self.BestObjectiveBound(),
+        )
+        self._last_solution_time = record.wall_time
+        self.at_least_one_solution_found = True
+        self.last_record = record
+        self._step += 1
+        self._records.put(record)
+        if self.checkpointer is not None:
+            self.checkpointer.capture(self, record)
+
+        if self._lower_bound is not None and record.objective <= self._lower_bound:
+            self._message(f"Stopping search, lower bound {self._lower_bound} reached.")
+            self.lower_bound_reached = True
+            self.StopSearch()
+            self._stopped.set()
+
+    def _message(self, message):
+        if self.print_solutions:
             print(message)
 
-            # Append the current solution to the CSV file
-            if self._log:
-                with open(self._csv_file, "a", newline="") as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow([self._step, elapsed_time, obj_value, bound_value])
-
-            self._step += 1
-
-    def monitor_inactivity(self):
-        while not self._stop_flag.is_set():
-            with self._lock:
-                elapsed_time = time.time() - self._last_activity_time
-                if elapsed_time > self._inactivity_timeout and self._step > 1:
-                    message = f"Stopping search, step time limit reached. No better solution was found for {elapsed_time:.2f} seconds."
-                    print(message)
-                    self.step_time_limit_reached = True
-                    self.StopSearch()  # Gracefully stop the solver
-                    self._stop_flag.set()
-            time.sleep(1)  # Check every second
+    def _write(self):
+        """Background writer: batch the queued records into the sink."""
+        done = False
+        while not done:
+            batch = [self._records.get()]
+            while True:
+                try:
+                    batch.append(self._records.get_nowait())
+                except queue.Empty:
+                    break
+            done = batch[-1] is _END
+            records = [r for r in batch if r is not _END]
+            for r in records:
+                self._message(
+                    f"Step {r.step}. Objective function = {r.objective:g}. "
+                    f"Lower bound = {r.bound}"
+                )
+            if records and self.sink is not None and self._sink_error is None:
+                try:
+                    self.sink.write(records)
+                except Exception as error:  # Raised again by stop().
+                    self._sink_error = error
+
+    def _watch(self):
+        # Before the first solution the wait is bounded by the timeout, so the watchdog
+        # never sleeps past the deadline of a solution found meanwhile.
+        timeout = self._inactivity_timeout
+        while not self._stopped.wait(timeout):
+            if not self.at_least_one_solution_found:
+                continue
+            solver_time = time.monotonic() - self._started
+            elapsed_time = solver_time - self._last_solution_time
+            timeout = self._inactivity_timeout - elapsed_time
+            if timeout <= 0:
+                self._message(
+                    "Stopping search, step time limit reached. No better solution "
+                    f"was found for {elapsed_time:.2f} seconds."
+                )
+                self.step_time_limit_reached = True
+                self.StopSearch()  # Gracefully stop the solver
+                self._stopped.set()
+
+    def start(self):
+        """Start the writer and the inactivity watchdog (if inactivity_timeout is set)."""
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._write, name="solver-log-writer", daemon=True
+            )
+            self._writer.start()
+        if self._inactivity_timeout is not None and self._watchdog is None:
+            self._stopped.clear()
+            self._started = time.monotonic()
+            self._watchdog = threading.Thread(
+                target=self._watch, name="solver-inactivity-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    def stop(self):
+        """
+        Stop the watchdog and write the pending records (closing the sink if the logger
+        created it). Safe to call more than once.
+
+        Raises:
+            Exception: The first error of sink.write(), once the writer is joined.
+        """
+        self._stopped.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+        if self._writer is not None:
+            self._records.put(_END)
+            self._writer.join()
+            self._writer = None
+            if self._owns_sink:
+                self.sink.close()
+        error, self._sink_error = self._sink_error, None
+        if error is not None:
+            raise error
 
     def start_monitoring(self):
-        # Start a thread to monitor inactivity
-        monitoring_thread = threading.Thread(
-            target=self.monitor_inactivity, daemon=True
-        )
-        monitoring_thread.start()
+        # Kept for compatibility, call stop() (or use the logger as a context manager).
+        self.start()
@@ -0,0 +1,200 @@
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.adapter import TimeAdapter
+from frjmp.model.sets.job import Job
+
+
+class CoarseToFineSolver:
+    """
+    Multi-resolution solve of a Problem: solve a coarse copy first and use its plan as a
+    skeleton for the fine (original) problem.
+
+    1. Coarse: the jobs are mapped to `coarse_adapter` (e.g. a ShiftAdapter problem to a
+       DailyAdapter one) and the coarse Problem is solved with a short time limit. Jobs of
+       the same unit falling in the same coarse tick are shortened so they do not overlap
+       (a job left empty is dropped).
+    2. Projection: every fine (job, time step) takes the pattern its unit has in the coarse
+       step containing it, when that pattern is allowed for the job.
+    3. Fine: the projected plan is installed as solver hints (soft fixes: the solver starts
+       from it but may leave it) and the fine model is solved with the remaining time.
+
+    The projection is a hint rather than a hard fix because it is usually not feasible as
+    it is: jobs dropped or shortened in the coarse problem need positions the coarse plan
+    gave to other units, and entries sharing a coarse step are spread over the fine ones.
+
+    If the coarse problem can not be built (e.g. its capacity check fails since too many
+    jobs share a coarse tick) or has no solution, the fine problem is solved with the greedy
+    hint as Problem.solve does.
+
+    Attributes (after solve):
+        coarse: The coarse Problem (None if it could not be built).
+        coarse_status, coarse_solver: Result of the coarse solve.
+        projected_plan: Fine plan projected from the coarse one, plan[j_idx][t_idx] = k_idx.
+        times: Wall time in seconds of each stage (coarse, fine).
+    """
+
+    def __init__(
+        self,
+        problem,
+        coarse_adapter: TimeAdapter,
+        to_coarse: Optional[Callable[[Any], Any]] = None,
+    ):
+        """
+        Args:
+            problem: Fine Problem to solve.
+            coarse_adapter: TimeAdapter of the coarse problem.
+            to_coarse: Converts a fine time value into a coarse one (e.g. `lambda v: v[0]`
+                from ShiftAdapter values to DailyAdapter dates). Identity by default.
+        """
+        self.problem = problem
+        self.coarse_adapter = coarse_adapter
+        self.to_coarse = to_coarse or (lambda value: value)
+        self.coarse = None
+        self.coarse_status = None
+        self.coarse_solver = None
+        self.projected_plan: Dict[int, Dict[int, int]] = {}
+        self.times: Dict[str, float] = {}
+
+    def _coarse_tick(self, fine_tick: int) -> int:
+        value = self.problem.time_adapter.from_tick(fine_tick)
+        return self.coarse_adapter.to_tick(self.to_coarse(value))
+
+    def build_coarse_problem(self):
+        """Coarse copy of the problem with the jobs mapped to the coarse adapter."""
+        problem = self.problem
+        adapter, fine = self.coarse_adapter, problem.time_adapter
+        by_unit = defaultdict(list)
+        for job in problem.jobs:
+            start = self._coarse_tick(fine.to_tick(job.start))
+            end = self._coarse_tick(fine.to_tick(job.end))
+            by_unit[job.unit.name].append((start, end, job))
+
+        jobs = []
+        for unit_jobs in by_unit.values():
+            last_end = None
+            for start, end, job in sorted(unit_jobs, key=lambda row: row[0]):
+                if last_end is not None and start <= last_end:
+                    start = last_end + 1
+                if start > end:
+                    continue
+                jobs.append(
+                    Job(
+                        job.unit,
+                        job.phase,
+                        adapter,
+                        adapter.from_tick(start),
+                        adapter.from_tick(end),
+                    )
+                )
+                last_end = end
+
+        coarse = problem.__class__(
+            jobs,
+            problem.positions_configuration,
+            problem.pos_unit_model_dependency,
+            adapter,
+            t_last=adapter.from_tick(self._coarse_tick(problem.t_last_tick)),
+            initial_conditions=problem.initial_conditions,
+            final_conditions=problem.final_conditions,
+        )
+        # Solver properties overridden on the instance.
+        for name, value in vars(problem).items():
+            if name.isupper():
+                setattr(coarse, name, value)
+        return coarse
+
+    def project(self, coarse_patterns: Dict[int, Dict[int, int]]):
+        """
+        Project a coarse plan onto the fine time steps.
+
+        Fine (job, time step) pairs whose coarse step has no pattern for the unit, or a
+        pattern the job can not use, are left out of the plan.
+        """
+        problem, coarse = self.problem, self.coarse
+        unit_plan = {}  # (unit name, coarse t_idx) -> k_idx
+        for j_idx, t_map in coarse_patterns.items():
+            unit_name = coarse.jobs[j_idx].unit.name
+            for t_idx, k_idx in t_map.items():
+                unit_plan[(unit_name, t_idx)] = k_idx
+
+        plan = defaultdict(dict)
+        for j_idx, t_map in problem.pattern_assigned_vars.items():
+            unit_name = problem.jobs[j_idx].unit.name
+            for t_idx, k_map in t_map.items():
+                coarse_tick = self._coarse_tick(problem.index_to_tick[t_idx])
+                coarse_t = bisect_right(coarse.compressed_ticks, coarse_tick) - 1
+                k_idx = unit_plan.get((unit_name, coarse_t))
+                if k_idx in k_map:
+                    plan[j_idx][t_idx] = k_idx
+        return dict(plan)
+
+    def solve_coarse(self, coarse_time_limit: float = 10):
+        """
+        Build and solve the coarse problem and project its plan.
+
+        Returns:
+            The projected plan (also kept in self.projected_plan), or None if the coarse
+            problem could not be built or has no solution.
+        """
+        start_time = time.time()
+        try:
+            self.coarse = self.build_coarse_problem()
+        except ValueError as error:
+            self.problem._message(f"Coarse problem not available ({error}).")
+            self.coarse = None
+            return None
+
+        coarse = self.coarse
+        coarse.SOLVERTIMELIMIT = coarse_time_limit
+        # stop_search of the fine problem also reaches the coarse solve.
+        coarse._running_solvers = self.problem._running_solvers
+        coarse._stop_requested = self.problem._stop_requested
+        self.coarse_status, self.coarse_solver = coarse._solve(coarse.solution_sink)
+        self.times["coarse"] = time.time() - start_time
+        if self.coarse_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            self.problem._message("No coarse solution found.")
+            return None
+
+        self.problem.build_model()
+        self.projected_plan = self.project(coarse.read_patterns(self.coarse_solver))
+        return self.projected_plan
+
+    def solve(self, coarse_time_limit: float = 10):
+        """
+        Run the coarse, projection and fine stages.
+
+        The fine solve gets problem.SOLVERTIMELIMIT minus the time spent in the previous
+        stages and runs like Problem.solve (solver properties, solution_sink, checkpointer,
+        inactivity and lower bound stops), with the projected plan as hints instead of the
+        greedy one. Without a projected plan the fine problem is solved with the greedy
+        hint. problem.stop_search() stops both stages.
+
+        Returns:
+            (status, solver) of the fine solve, like Problem.solve.
+        """
+        problem = self.problem
+        problem._stop_requested = False
+        start_time = time.time()
+        plan = self.solve_coarse(coarse_time_limit)
+        if plan is None:
+            return problem._solve(problem.solution_sink)
+        problem.add_pattern_hints(plan)
+
+        fine_start = time.time()
+        own_limit = "SOLVERTIMELIMIT" in vars(problem)
+        time_limit = problem.SOLVERTIMELIMIT
+        problem.SOLVERTIMELIMIT = max(1, time_limit - (fine_start - start_time))
+        try:
+            status, solver = problem._solve(problem.solution_sink, hinted=True)
+        finally:
+            if own_limit:
+                problem.SOLVERTIMELIMIT = time_limit
+            else:
+                del problem.SOLVERTIMELIMIT
+        self.times["fine"] = time.time() - fine_start
+        return status, solver
@@ -34,3 +34,20 @@ def minimize_total_position_movements(
     total_movements = sum(all_moves)
     model.Minimize(total_movements)
     return total_movements
+
+
+def add_movement_lower_bound_constraints(
+    model: cp_model.CpModel,
+    total_movements,
+    unit_movement_vars: Dict[str, Dict[int, cp_model.IntVar]],
+    lower_bound,
+):
+    """
+    Add a pre-computed MovementLowerBound as redundant constraints: on the objective and,
+    when unit movement variables exist, on the movements of each unit.
+    """
+    model.Add(total_movements >= lower_bound.total)
+    for unit_name, unit_bound in lower_bound.per_unit.items():
+        unit_vars = unit_movement_vars.get(unit_name)
+        if unit_bound and unit_vars:
+            model.Add(sum(unit_vars.values()) >= unit_bound)
@@ -0,0 +1,383 @@
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection, wait
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.heuristic import plan_unit_movements
+from frjmp.model.problem import Problem
+from frjmp.model.spec import ProblemSpec
+
+
+@dataclass
+class SolveRequest:
+    """
+    Problem to solve in a SolverPool worker. Everything is pickled, so the jobs, the
+    configuration, the dependency and the adapter are sent together and keep their shared
+    references (e.g. the unit types) in the worker. A ProblemSpec is the compact choice.
+
+    Attributes:
+        problem_args: ProblemSpec, or keyword arguments of Problem (jobs,
+            positions_configuration, position_unittype_dependency, time_adapter, t_last,
+            initial_conditions...).
+        time_limit: SOLVERTIMELIMIT of this request (None for the pool default).
+        properties: Solver properties set on the Problem, e.g. {"USE_CAPACITY_CUTS": True}.
+    """
+
+    problem_args: Union[ProblemSpec, Dict[str, Any]]
+    time_limit: Optional[float] = None
+    properties: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class PlanResult:
+    """
+    Plan returned by a SolverPool worker, detached from the solver and the model.
+
+    Attributes:
+        status: Name of the solver status ("OPTIMAL", "FEASIBLE", "INFEASIBLE"...), "ERROR"
+            if the problem could not be built or solved, "TIMEOUT" if the worker was killed.
+        objective, bound: Objective value and best bound (None without a solution).
+        patterns: Pattern plan, patterns[j_idx][t_idx] = k_idx (like Problem.read_patterns).
+        movements: Unit name -> time steps t at which the unit moves (t to t+1).
+        job_indices: Index in the request jobs of each j_idx (jobs outside the horizon
+            are not in the problem).
+        queue_time: Seconds between submit and the start of the request in a worker.
+        build_time, solve_time: Seconds spent building the Problem and solving it.
+        error: Error message when status is "ERROR" or "TIMEOUT".
+        worker_pid: Process id of the worker that ran the request.
+    """
+
+    status: str
+    objective: Optional[float] = None
+    bound: Optional[float] = None
+    patterns: Dict[int, Dict[int, int]] = field(default_factory=dict)
+    movements: Dict[str, List[int]] = field(default_factory=dict)
+    job_indices: List[int] = field(default_factory=list)
+    queue_time: float = 0.0
+    build_time: float = 0.0
+    solve_time: float = 0.0
+    error: Optional[str] = None
+    worker_pid: Optional[int] = None
+
+    @property
+    def has_solution(self) -> bool:
+        return self.status in ("OPTIMAL", "FEASIBLE")
+
+
+def _warm_up():
+    """Solve a tiny model so CP-SAT is loaded before the first request."""
+    model = cp_model.CpModel()
+    x = model.NewBoolVar("x")
+    model.Maximize(x)
+    cp_model.CpSolver().Solve(model)
+
+
+def _run_request(request: SolveRequest, default_time_limit) -> PlanResult:
+    start_time = time.time()
+    try:
+        if isinstance(request.problem_args, ProblemSpec):
+            problem = request.problem_args.build()
+        else:
+            problem = Problem(**request.problem_args)
+    except ValueError as err:
+        return PlanResult("ERROR", error=str(err))
+    problem.PRINT_SOLUTIONS = False
+    for name, value in request.properties.items():
+        setattr(problem, name, value)
+    time_limit = request.time_limit
+    if time_limit is None:
+        time_limit = default_time_limit
+    if time_limit is not None:
+        problem.SOLVERTIMELIMIT = time_limit
+    problem.build_model()
+    build_time = time.time() - start_time
+
+    status, solver = problem.solve()
+    result = PlanResult(
+        solver.StatusName(status),
+        job_indices=list(problem.job_table.source_indices),
+        build_time=build_time,
+        solve_time=time.time() - start_time - build_time,
+    )
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        result.objective = solver.ObjectiveValue()
+        result.bound = solver.BestObjectiveBound()
+        result.patterns = problem.read_patterns(solver)
+        result.movements = plan_unit_movements(problem, result.patterns)
+    return result
+
+
+def _worker_main(conn, default_time_limit):
+    """Worker process: run the requests received on conn until None or EOF."""
+    pid = os.getpid()
+    _warm_up()
+    conn.send(("ready", None, None))
+    while True:
+        try:
+            item = conn.recv()
+        except EOFError:  # The pool is gone.
+            break
+        if item is None:
+            break
+        request_id, request, submit_time = item
+        try:
+            result = _run_request(request, default_time_limit)
+        except Exception as err:  # Reported to the caller, the worker keeps running.
+            result = PlanResult("ERROR", error=f"{type(err).__name__}: {err}")
+        result.queue_time = max(0.0, time.time() - submit_time) - (
+            result.build_time + result.solve_time
+        )
+        result.worker_pid = pid
+        conn.send(("done", request_id, result))
+
+
+class SolverPool:
+    """
+    Local pool of warm solver processes.
+
+    The workers are started once; each one imports frjmp, ortools and pandas and runs a
+    tiny CP-SAT solve before its first request, so a request only pays for building and
+    solving its Problem. Requests (SolveRequest) and results (PlanResult) are pickled
+    through one pipe per worker; no socket is opened. The pending requests wait in the
+    pool, which hands them to idle workers, so a killed worker never leaves a shared queue
+    locked.
+
+        with SolverPool(n_workers=4, max_pending=16) as pool:
+            futures = [pool.submit(SolveRequest(args, time_limit=30)) for args in batch]
+            plans = [f.result() for f in futures]
+
+    Backpressure: at most max_pending requests are queued or running. submit() blocks
+    until a slot is free, or raises queue.Full with block=False (or after timeout).
+
+    Time limits: each request runs with its time_limit as SOLVERTIMELIMIT. A worker still
+    busy kill_grace seconds after that limit (e.g. building a huge model) is terminated
+    and replaced, and its request returns a "TIMEOUT" PlanResult. Workers that die are
+    replaced too ("ERROR" result).
+    """
+
+    def __init__(
+        self,
+        n_workers: int = 2,
+        max_pending: int = 16,
+        default_time_limit: Optional[float] = None,
+        kill_grace: float = 30,
+        start_method: str = "spawn",
+    ):
+        """
+        Args:
+            n_workers: Number of worker processes.
+            max_pending: Maximum number of requests queued or running.
+            default_time_limit: SOLVERTIMELIMIT of requests without time_limit (None keeps
+                the Problem default).
+            kill_grace: Seconds a request may run past its time limit before its worker is
+                terminated.
+            start_method: multiprocessing start method. "spawn" by default, forking a
+                process with solver threads running is not safe.
+        """
+        if n_workers < 1 or max_pending < 1:
+            raise ValueError("n_workers and max_pending must be at least 1.")
+        self.n_workers = n_workers
+        self.max_pending = max_pending
+        self.default_time_limit = default_time_limit
+        self.kill_grace = kill_grace
+        self._context = multiprocessing.get_context(start_method)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._backlog = deque()  # (request id, request, submit time) not sent yet
+        self._futures: Dict[int, Future] = {}  # request id -> future
+        self._workers: Dict[int, multiprocessing.process.BaseProcess] = {}
+        self._conns: Dict[int, Connection] = {}  # worker id -> pipe end of the pool
+        self._idle = set()  # Warm workers with no request.
+        # worker id -> (request id, kill time) of the request it is running.
+        self._running: Dict[int, Tuple[int, Optional[float]]] = {}
+        self._closed = False
+        for worker_id in range(n_workers):
+            self._start_worker(worker_id)
+        self._collector = threading.Thread(
+            target=self._collect, name="solver-pool-collector", daemon=True
+        )
+        self._collector.start()
+
+    def _start_worker(self, worker_id):
+        conn, worker_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(worker_conn, self.default_time_limit),
+            name=f"solver-pool-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        worker_conn.close()
+        self._workers[worker_id] = process
+        self._conns[worker_id] = conn
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every worker is warm. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while len(self._idle) + len(self._running) < self.n_workers:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def submit(
+        self, request: SolveRequest, block: bool = True, timeout: Optional[float] = None
+    ) -> Future:
+        """
+        Queue a request.
+
+        Returns:
+            A concurrent.futures.Future resolved with the PlanResult.
+
+        Raises:
+            queue.Full: If max_pending requests are pending and block is False (or the
+                timeout expired).
+            ValueError: If the pool is closed.
+        """
+        if self._closed:
+            raise ValueError("The solver pool is closed.")
+        acquired = (
+            self._slots.acquire(timeout=-1 if timeout is None else timeout)
+            if block
+            else self._slots.acquire(blocking=False)
+        )
+        if not acquired:
+            raise queue.Full(f"{self.max_pending} requests are already pending.")
+        future = Future()
+        future.add_done_callback(lambda _: self._slots.release())
+        with self._lock:
+            request_id = next(self._ids)
+            self._futures[request_id] = future
+            self._backlog.append((request_id, request, time.time()))
+            self._dispatch()
+        return future
+
+    def solve(self, request: SolveRequest) -> PlanResult:
+        """Submit a request and wait for its result."""
+        return self.submit(request).result()
+
+    @property
+    def pending(self) -> int:
+        """Requests queued or running."""
+        with self._lock:
+            return len(self._futures)
+
+    def _dispatch(self):
+        """Send backlog requests to the idle workers (called with the lock held)."""
+        while self._backlog and self._idle:
+            worker_id = self._idle.pop()
+            if not self._workers[worker_id].is_alive():
+                continue  # Replaced by _check_workers.
+            request_id, request, submit_time = item = self._backlog.popleft()
+            time_limit = request.time_limit
+            if time_limit is None:
+                time_limit = self.default_time_limit
+            kill_time = (
+                None
+                if time_limit is None
+                else time.monotonic() + time_limit + self.kill_grace
+            )
+            try:
+                self._conns[worker_id].send(item)
+            except (BrokenPipeError, ConnectionResetError):  # Died meanwhile.
+                self._backlog.appendleft(item)
+                continue
+            self._running[worker_id] = (request_id, kill_time)
+        if self._closed and not self._backlog:
+            for worker_id in self._idle:
+                try:
+                    self._conns[worker_id].send(None)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+            self._idle.clear()
+
+    def _resolve(self, request_id, result: PlanResult):
+        future = self._futures.pop(request_id, None)
+        if future is not None:
+            future.set_result(result)
+
+    def _collect(self):
+        """Collector thread: resolve the futures and replace dead or late workers."""
+        while True:
+            with self._lock:
+                if self._closed and not self._workers:
+                    return
+                conns = {conn: worker_id for worker_id, conn in self._conns.items()}
+                sentinels = [process.sentinel for process in self._workers.values()]
+            for conn in wait(list(conns) + sentinels, timeout=0.1):
+                worker_id = conns.get(conn)
+                if worker_id is None:
+                    continue  # A worker exited, handled by _check_workers.
+                try:
+                    kind, request_id, result = conn.recv()
+                except (EOFError, OSError):
+                    continue
+                with self._lock:
+                    if kind == "done":
+                        self._running.pop(worker_id, None)
+                        self._resolve(request_id, result)
+                    self._idle.add(worker_id)
+                    self._dispatch()
+            self._check_workers()
+
+    def _check_workers(self):
+        now = time.monotonic()
+        with self._lock:
+            for worker_id, process in list(self._workers.items()):
+                request_id, kill_time = self._running.get(worker_id, (None, None))
+                if process.is_alive():
+                    if kill_time is None or now < kill_time:
+                        continue
+                    process.terminate()
+                    result = PlanResult(
+                        "TIMEOUT",
+                        error="Request still running after its time limit, worker killed.",
+                    )
+                else:
+                    result = PlanResult(
+                        "ERROR", error=f"Worker exited with code {process.exitcode}."
+                    )
+                process.join()
+                self._conns.pop(worker_id).close()
+                del self._workers[worker_id]
+                self._idle.discard(worker_id)
+                self._running.pop(worker_id, None)
+                if request_id is not None:
+                    result.worker_pid = process.pid
+                    self._resolve(request_id, result)
+                if not self._closed:
+                    self._start_worker(worker_id)
+
+    def close(self, cancel_pending: bool = False):
+        """
+        Stop the workers once the pending requests are done and wait for them.
+
+        Args:
+            cancel_pending: Cancel the requests not started yet instead of running them.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if cancel_pending:
+                while self._backlog:
+                    self._futures.pop(self._backlog.popleft()[0]).cancel()
+            self._dispatch()
+        self._collector.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(cancel_pending=exc_type is not None)
+        return False
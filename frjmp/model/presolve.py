@@ -0,0 +1,253 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Set, Tuple
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.parameters.position_unit_model import PositionsUnitTypeDependency
+from frjmp.model.parameters.positions_configuration import PositionsConfiguration
+from frjmp.model.sets.unit import UnitType
+
+
+@dataclass
+class PresolveResult:
+    """
+    What the model can skip because no job can ever use it.
+
+    Indices are kept as they are (pattern k_idx in UnitType.allowed_patterns, position
+    p_idx in PositionsConfiguration.positions): removed entities simply get no variables
+    or constraints.
+
+    Attributes:
+        usable_patterns: UnitType -> k_idx of the patterns some job of that type can use.
+        usable_positions: p_idx of the positions in some usable pattern.
+        removed_patterns: Unit type name -> k_idx of the removed patterns.
+        removed_positions: Names of the removed positions.
+        removed_triggers: (from, to) position names of the removed triggers. Filled when
+            the model is built, since triggers may be added after the Problem is created.
+    """
+
+    usable_patterns: Dict[UnitType, List[int]]
+    usable_positions: Set[int]
+    removed_patterns: Dict[str, List[int]] = field(default_factory=dict)
+    removed_positions: List[str] = field(default_factory=list)
+    removed_triggers: List[Tuple[str, str]] = field(default_factory=list)
+
+    def __str__(self):
+        patterns = sum(len(k_list) for k_list in self.removed_patterns.values())
+        return (
+            f"Presolve removed {patterns} patterns {self.removed_patterns}, "
+            f"{len(self.removed_positions)} positions {self.removed_positions} and "
+            f"{len(self.removed_triggers)} triggers {self.removed_triggers}."
+        )
+
+
+def presolve_patterns_and_positions(
+    jobs: list,
+    positions_configuration: PositionsConfiguration,
+    dependency: PositionsUnitTypeDependency,
+) -> PresolveResult:
+    """
+    Find the patterns and positions no job can ever use.
+
+    - A pattern of a UnitType is usable if every one of its positions covers the need of
+      at least one job of that type (the same check create_pattern_assignment_variables
+      does per job). allowed_patterns[0] is always kept since it is used as the OUT gate.
+    - A position is usable if it belongs to a usable pattern.
+    """
+    dependency.generate_matrix()  # Make sure default patterns exist.
+    needs_by_type = defaultdict(set)
+    for job in jobs:
+        needs_by_type[job.unit.type].add(job.phase.required_need.name)
+
+    usable_patterns, removed_patterns = {}, {}
+    used_names = set()
+    for unit_type in dependency.unit_types:
+        needs = needs_by_type.get(unit_type, set())
+        usable, removed = [], []
+        for k_idx, pattern in enumerate(unit_type.allowed_patterns):
+            covers = [
+                {need.name for need in position.available_needs}
+                for position in pattern.positions
+            ]
+            if (needs and k_idx == 0) or any(
+                all(need in covered for covered in covers) for need in needs
+            ):
+                usable.append(k_idx)
+                used_names.update(p.name for p in pattern.positions)
+            else:
+                removed.append(k_idx)
+        usable_patterns[unit_type] = usable
+        if removed:
+            removed_patterns[unit_type.name] = removed
+
+    positions = positions_configuration.positions
+    usable_positions = {
+        p_idx for p_idx, p in enumerate(positions) if p.name in used_names
+    }
+    return PresolveResult(
+        usable_patterns=usable_patterns,
+        usable_positions=usable_positions,
+        removed_patterns=removed_patterns,
+        removed_positions=[
+            p.name for p_idx, p in enumerate(positions) if p_idx not in usable_positions
+        ],
+    )
+
+
+def prune_trigger_map(
+    trigger_map: Dict[Tuple[int, int], Set[int]], usable_positions: Set[int]
+) -> Tuple[Dict[Tuple[int, int], Set[int]], List[Tuple[int, int]]]:
+    """
+    Drop the triggers that can never matter: the ones moving from or to an unusable
+    position (no unit is ever there) and the ones whose triggered positions are all
+    unusable. Unusable triggered positions are removed from the kept triggers.
+
+    Returns:
+        (pruned trigger map, (i, j) keys of the removed triggers)
+    """
+    pruned, removed = {}, []
+    for (i, j), triggered in trigger_map.items():
+        triggered = triggered & usable_positions
+        if i in usable_positions and j in usable_positions and triggered:
+            pruned[(i, j)] = triggered
+        else:
+            removed.append((i, j))
+    return pruned, removed
+
+
+@dataclass
+class FixedReduction:
+    """
+    Variable families reduced by the fixed values (see fix_variables_by_domain).
+
+    Attributes:
+        assigned_vars: assigned_vars without the assignments the fixed values rule out.
+        pattern_assigned_vars: pattern_assigned_vars without the patterns the fixed values
+            rule out (a single pattern where it is fixed).
+        fixed: Number of variables fixed by domain (given and implied).
+        removed_patterns: Number of pattern variables left out of the constraints.
+        removed_assignments: Number of assignment variables left out of the constraints.
+        determined_movements: Number of unit movements fixed because the patterns of the
+            unit at both ends are known.
+    """
+
+    assigned_vars: Dict[int, Dict[int, Dict[int, cp_model.IntVar]]]
+    pattern_assigned_vars: Dict[int, Dict[int, Dict[int, cp_model.IntVar]]]
+    fixed: int = 0
+    removed_patterns: int = 0
+    removed_assignments: int = 0
+    determined_movements: int = 0
+
+    def __str__(self):
+        return (
+            f"Fixed {self.fixed} variables, left out {self.removed_patterns} patterns and "
+            f"{self.removed_assignments} assignments, {self.determined_movements} "
+            f"movements determined."
+        )
+
+
+def fix_variables_by_domain(
+    model: cp_model.CpModel,
+    fixed_variables: List[Tuple[cp_model.IntVar, int]],
+    assigned_vars: Dict[int, Dict[int, Dict[int, cp_model.IntVar]]],
+    pattern_assigned_vars: Dict[int, Dict[int, Dict[int, cp_model.IntVar]]],
+    unit_movement_vars: Dict[str, Dict[int, cp_model.IntVar]],
+    jobs: list,
+    dependency: PositionsUnitTypeDependency,
+) -> FixedReduction:
+    """
+    Fix the given variables by setting their domain (no equality constraints) and drop
+    what the fixed values rule out before the constraints are built.
+
+    - A pattern fixed to 1 (or implied by fixed assignments) is the only pattern of its
+      (job, time step): its siblings are fixed to 0 and left out of the reduced families,
+      so the assignment, hop and diff structures are built for one pattern only.
+    - Assignments to positions of no remaining pattern are fixed to 0 and left out;
+      positions in every remaining pattern are fixed to 1.
+    - A unit movement is fixed when the unit pattern (or absence) is known at both ends.
+
+    A value contradicting an earlier one is added as an equality constraint, so the model
+    is reported infeasible as before. Variables that are not plain model variables (e.g.
+    expressions) are also fixed with a constraint.
+    """
+    proto = model.Proto()
+    values: Dict[int, int] = {}
+    reduction = FixedReduction(assigned_vars={}, pattern_assigned_vars={})
+
+    def fix(var, value: int):
+        index = var.Index() if hasattr(var, "Index") else None
+        if index is not None and index < 0:  # Negated literal.
+            index, value = -index - 1, 1 - value
+        if index is None or values.get(index, value) != value:
+            model.Add(var == value)
+            return
+        if index not in values:
+            values[index] = value
+            proto.variables[index].domain[:] = [value, value]
+            reduction.fixed += 1
+
+    for var, value in fixed_variables:
+        fix(var, int(value))
+
+    matrix = dependency.generate_matrix()
+    model_to_index = {
+        unit_type: idx for idx, unit_type in enumerate(dependency.unit_types)
+    }
+    unit_steps = defaultdict(dict)  # unit name -> t_idx -> single k_idx (or None)
+
+    for j_idx, t_map in pattern_assigned_vars.items():
+        rows = matrix[model_to_index[jobs[j_idx].unit.type]]
+        p_map = assigned_vars.get(j_idx, {})
+        reduced_patterns, reduced_assignments = {}, defaultdict(dict)
+        for t_idx, k_map in t_map.items():
+            kept = [k for k, var in k_map.items() if values.get(var.Index()) != 0]
+            chosen = [k for k in kept if values.get(k_map[k].Index()) == 1]
+            if chosen:
+                kept = chosen[:1]
+            for p_idx, t_dict in p_map.items():
+                value = values.get(t_dict[t_idx].Index()) if t_idx in t_dict else None
+                if value is not None:
+                    kept = [k for k in kept if rows[k][p_idx] == value]
+            if not kept:
+                # Contradicting fixed values: keep everything, the solver reports it.
+                kept = list(k_map)
+            for k in k_map:
+                if k not in kept:
+                    fix(k_map[k], 0)
+                    reduction.removed_patterns += 1
+            if len(kept) == 1:
+                fix(k_map[kept[0]], 1)
+            reduced_patterns[t_idx] = {k: k_map[k] for k in kept}
+            unit_steps[jobs[j_idx].unit.name][t_idx] = (
+                kept[0] if len(kept) == 1 else None
+            )
+
+            for p_idx, t_dict in p_map.items():
+                if t_idx not in t_dict:
+                    continue
+                covered = [rows[k][p_idx] == 1 for k in kept]
+                if not any(covered):
+                    fix(t_dict[t_idx], 0)
+                    reduction.removed_assignments += 1
+                    continue
+                if all(covered):
+                    fix(t_dict[t_idx], 1)
+                reduced_assignments[p_idx][t_idx] = t_dict[t_idx]
+        reduction.pattern_assigned_vars[j_idx] = reduced_patterns
+        reduction.assigned_vars[j_idx] = dict(reduced_assignments)
+
+    # Out of the positions is a known state too (-1); both ends out is left to the model,
+    # as is the last movement variable (no t+1).
+    for unit_name, t_map in unit_movement_vars.items():
+        steps = unit_steps.get(unit_name, {})
+        for t_idx, var in t_map.items():
+            if t_idx + 1 not in t_map:
+                continue
+            k0, k1 = steps.get(t_idx, -1), steps.get(t_idx + 1, -1)
+            if k0 is None or k1 is None or k0 == k1 == -1:
+                continue
+            if var.Index() not in values:
+                reduction.determined_movements += 1
+            fix(var, int(k0 != k1))
+    return reduction
@@ -1,5 +1,11 @@
 # frjmp/model/problem.py
 
+import asyncio
+import copy
+import dataclasses
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
 from datetime import date, timedelta
 from ortools.sat.python import cp_model
 from frjmp.model.variables.assignment import create_assignment_variables
@@ -9,9 +15,19 @@ from frjmp.model.variables.movement import (
 )
 from frjmp.model.variables.pattern_assignment import create_pattern_assignment_variables
 from frjmp.model.constraints.assignment import add_job_assignment_constraints
-from frjmp.model.constraints.capacity import add_position_capacity_constraints
+from frjmp.model.constraints.capacity import (
+    add_need_capacity_cuts,
+    add_pattern_clique_cuts,
+    add_position_capacity_constraints,
+)
 from frjmp.model.constraints.movement import add_movement_detection_constraints
+from frjmp.model.constraints.symmetry import (
+    find_equivalent_units,
+    find_equivalent_positions,
+    add_symmetry_breaking_constraints,
+)
 from frjmp.model.objective_function import (
+    add_movement_lower_bound_constraints,
     minimize_total_unit_movements,
     minimize_total_position_movements,
 )
@@ -22,17 +38,46 @@ from frjmp.model.parameters.position_unit_model import (
 from frjmp.model.sets.unit import UnitType
 from frjmp.model.sets.job import Job
 from frjmp.model.sets.position import Position
-from frjmp.utils.timeline_utils import (
-    trim_jobs_before_time_inplace,
-    trim_jobs_after_time_inplace,
-    compress_timepoints,
-)
+from frjmp.utils.timeline_utils import build_event_timeline, build_timeline
 from frjmp.utils.validation_utils import (
     validate_capacity_feasibility,
     validate_non_overlapping_jobs_per_unit,
 )
-from frjmp.model.logger import IncrementalSolverLogger
+from frjmp.model.logger import IncrementalSolverLogger, LoopSink
 from frjmp.model.adapter import TimeAdapter
+from frjmp.model.job_table import JobTable
+from frjmp.model.heuristic import build_greedy_plan, plan_unit_movements
+from frjmp.model.aggregation import PositionAggregation
+from frjmp.model.presolve import (
+    fix_variables_by_domain,
+    presolve_patterns_and_positions,
+)
+from frjmp.model.interval import IntervalModel
+from frjmp.model.incremental import ConstraintRanges, update_jobs_incrementally
+from frjmp.model.bounds import compute_movement_lower_bound
+from frjmp.model.search import SEARCH_STRATEGIES, add_chronological_decision_strategy
+from frjmp.model.streaming import PlanStream
+
+MODEL_ENGINES = ("time_indexed", "interval")
+
+
+def _rebind_variables(nested: dict, model: cp_model.CpModel) -> dict:
+    """Same nested variable dicts with the variables of model (by index)."""
+    return {
+        key: (
+            _rebind_variables(value, model)
+            if isinstance(value, dict)
+            else model.GetIntVarFromProtoIndex(value.Index())
+        )
+        for key, value in nested.items()
+    }
+
+
+def _rebind_literal(var, model: cp_model.CpModel):
+    index = var.Index()
+    if index < 0:  # Negated literal, Not().Index() is -index - 1.
+        return model.GetBoolVarFromProtoIndex(-index - 1).Not()
+    return model.GetIntVarFromProtoIndex(index)
 
 
 class Problem:
@@ -40,6 +85,20 @@ class Problem:
     # Solver Properties
     SOLVERTIMELIMIT = 1200  # Default value in seconds
     STEPTIMELIMIT = 120  # Default value in seconds
+    DETERMINISTICTIMELIMIT = None  # Solver deterministic time limit (reproducible).
+    PRINT_SOLUTIONS = True  # Print every solution and the final bound.
+    USE_GREEDY_HINT = True  # Use a greedy plan as solution hint.
+    USE_SYMMETRY_BREAKING = False  # Order interchangeable units and positions.
+    USE_POSITION_AGGREGATION = False  # Solve with interchangeable positions pooled.
+    USE_PRESOLVE = True  # Skip patterns, positions and triggers no job can use.
+    USE_EVENT_TIMELINE = False  # Half-open event boundaries (fewer time steps).
+    MODEL_ENGINE = "time_indexed"  # "time_indexed" or "interval" (see IntervalModel).
+    # Interval engine: stays per block = jobs + this value. Plans needing more stays in
+    # a block are left out, so a small value can exclude the optimum.
+    INTERVAL_EXTRA_STAYS = 2
+    USE_MOVEMENT_LOWER_BOUND = True  # Redundant objective >= pre-solve lower bound.
+    USE_CAPACITY_CUTS = False  # Redundant per need and pattern clique capacity cuts.
+    SEARCH_STRATEGY = "default"  # See SEARCH_STRATEGIES (frjmp.model.search).
 
     def __init__(
         self,
@@ -49,9 +108,11 @@ class Problem:
         time_adapter: TimeAdapter,
         t_last=None,
         initial_conditions: dict = None,
+        timeline: tuple = None,
+        final_conditions: dict = None,
     ):
         # Init variables
-        self.jobs = jobs
+        self.source_jobs = jobs
         self.positions_configuration = positions_configuration
         self.positions = positions_configuration.positions
         self.pos_unit_model_dependency = position_unittype_dependency
@@ -59,12 +120,15 @@ class Problem:
         self.time_adapter = time_adapter
         t_init = time_adapter.origin
         self.initial_conditions = initial_conditions
+        # Contour conditions at the horizon end, same format as initial_conditions.
+        self.final_conditions = final_conditions
 
         # Convert bounds to ticks
         t_init_tick = time_adapter.to_tick(t_init)
         t0_tick = t_init_tick - 1
         t0 = time_adapter.from_tick(t0_tick)
         # If there is no t_last use the latest job end
+        self.horizon_given = t_last is not None
         if t_last is None:
             if not jobs:
                 raise ValueError("Provide t_last when jobs is empty.")
@@ -82,23 +146,55 @@ class Problem:
         self.fixed_variables = (
             []
         )  # List of (var, value) of fixed variables. This can be used for initial or contour conditions.
+        self.model_built = (
+            False  # Constraints and objective are added by build_model().
+        )
+        self.pooled_positions = (
+            set()
+        )  # Names of positions standing for a pool of positions (see PositionAggregation).
+        self.movement_lower_bound = None  # MovementLowerBound, set by set_objective().
+        self.fixed_reduction = None  # FixedReduction, set by add_constraints().
+        self.constraint_ranges = None  # ConstraintRanges, set by add_constraints().
+        self._pattern_index = {}  # UnitType -> {frozenset(position names): k_idx}
+        self.solution_sink = None  # SolutionSink of the solve() solutions (logger.py).
+        self.solver_logger = None  # IncrementalSolverLogger of the last solve().
+        self.model_cache = None  # ModelCache of built models (cache.py).
+        self.checkpointer = None  # Checkpointer of solve() (checkpoint.py).
+        self._running_solvers = []  # CpSolvers of the running solve (stop_search).
+        self._stop_requested = False
 
         # --- Pre-processing ---#
         validate_non_overlapping_jobs_per_unit(jobs, time_adapter)
-        trim_jobs_before_time_inplace(jobs, t0, time_adapter)
-        trim_jobs_after_time_inplace(jobs, t_last, time_adapter)
+        # Trim the jobs to [t0, t_last] without modifying the caller's Job objects:
+        # trimmed jobs are replaced by JobViews with the clipped start/end.
+        self.job_table = JobTable(jobs, time_adapter).trimmed(t0_tick, t_last_tick)
+        self.jobs = self.job_table.views()
+        jobs = self.jobs
 
-        # Calculate compressed time scale
+        # Calculate compressed time scale (unless it was already computed by the caller,
+        # e.g. a ScenarioRunner sharing the base timeline between scenarios).
+        self.timeline_reduction = None
+        if timeline is None and self.USE_EVENT_TIMELINE:
+            timeline, self.timeline_reduction = build_event_timeline(
+                self.job_table.start_ticks,
+                self.job_table.end_ticks,
+                time_adapter,
+                keep_ticks=[self.t0_tick],  # Include the t0 point.
+                last_tick=t_last_tick,
+            )
+        elif timeline is None:
+            timeline = build_timeline(
+                [self.t0_tick]  # Include the t0 point.
+                + self.job_table.start_ticks
+                + self.job_table.end_ticks,
+                time_adapter,
+            )
         (
             compressed_ticks,
             tick_to_index,
             index_to_tick,
             index_to_value,
-        ) = compress_timepoints(
-            jobs,
-            adapter=time_adapter,
-            individual_points=[self.t0],  # Include the t0 point.
-        )
+        ) = timeline
         self.compressed_ticks = compressed_ticks
         self.tick_to_index = tick_to_index
         self.index_to_tick = index_to_tick
@@ -109,7 +205,8 @@ class Problem:
         self.num_time_steps = len(self.time_step_indexes)
 
         # --- Feasability Validations --- #
-        validate_capacity_feasibility(
+        # Capacity and demand per need and time step (reused by the capacity cuts).
+        self.capacity_summary = validate_capacity_feasibility(
             jobs,
             self.positions,
             self.compressed_ticks,
@@ -118,6 +215,13 @@ class Problem:
             self.index_to_value,
         )
 
+        # Patterns, positions and triggers no job can use get no variables.
+        self.presolve = None
+        if self.USE_PRESOLVE:
+            self.presolve = presolve_patterns_and_positions(
+                jobs, positions_configuration, position_unittype_dependency
+            )
+
         # Create model
         self.model = cp_model.CpModel()
 
@@ -125,6 +229,24 @@ class Problem:
         self.build_variables()
 
     def build_variables(self):
+        if self.MODEL_ENGINE not in MODEL_ENGINES:
+            raise ValueError(
+                f"Unknown MODEL_ENGINE {self.MODEL_ENGINE!r}, use one of {MODEL_ENGINES}."
+            )
+        if self.MODEL_ENGINE == "interval":
+            # The time-indexed variable families stay empty with this engine.
+            self.assigned_vars = {}
+            self.unit_movement_vars = {}
+            self.movement_in_position_vars = {}
+            self.pattern_assigned_vars = {}
+            self.interval_model = IntervalModel(self)
+            return
+
+        usable_positions = usable_patterns = None
+        if self.presolve is not None:
+            usable_positions = self.presolve.usable_positions
+            usable_patterns = self.presolve.usable_patterns
+
         self.assigned_vars = create_assignment_variables(
             self.model,
             self.jobs,
@@ -132,12 +254,13 @@ class Problem:
             self.compressed_ticks,
             self.tick_to_index,
             self.time_adapter,
+            usable_positions,
         )
         self.unit_movement_vars = create_unit_movement_variables(
             self.model, self.jobs, self.num_time_steps
         )
         self.movement_in_position_vars = create_movement_in_position_variables(
-            self.model, self.positions, self.num_time_steps
+            self.model, self.positions, self.num_time_steps, usable_positions
         )
 
         self.pattern_assigned_vars = create_pattern_assignment_variables(
@@ -148,57 +271,223 @@ class Problem:
             self.pos_unit_model_dependency,
             self.assigned_vars,
             self.time_adapter,
+            usable_patterns,
         )
 
     def add_constraints(self):
-        # Add the fixed values (if any) of the variables as constraints to the problem.
+        """
+        Raises:
+            ValueError: If the interval MODEL_ENGINE is used with symmetry breaking,
+                capacity cuts or a SEARCH_STRATEGY (time-indexed families only).
+        """
+        if self.MODEL_ENGINE == "interval":
+            unsupported = [
+                name
+                for name, used in (
+                    ("USE_SYMMETRY_BREAKING", self.USE_SYMMETRY_BREAKING),
+                    ("USE_CAPACITY_CUTS", self.USE_CAPACITY_CUTS),
+                    ("SEARCH_STRATEGY", self.SEARCH_STRATEGY != "default"),
+                )
+                if used
+            ]
+            if unsupported:
+                raise ValueError(
+                    f"{', '.join(unsupported)} need the time_indexed MODEL_ENGINE."
+                )
+            for var, value in self.fixed_variables:
+                self.model.Add(var == int(value))
+            self.interval_model.add_constraints()
+            return
+
+        # Fix the given values (if any) by domain. The constraints are built on the
+        # reduced families, without the patterns and assignments the fixed values rule
+        # out (the variable dicts of the problem keep every variable).
         if self.initial_conditions is not None:
             self._apply_initial_conditions_as_fixed_patterns()
-        for var, value in self.fixed_variables:
-            self.model.Add(var == int(value))
+        if self.final_conditions is not None:
+            self._apply_final_conditions_as_fixed_patterns()
+        self.fixed_reduction = fix_variables_by_domain(
+            self.model,
+            self.fixed_variables,
+            self.assigned_vars,
+            self.pattern_assigned_vars,
+            self.unit_movement_vars,
+            self.jobs,
+            self.pos_unit_model_dependency,
+        )
+        assigned_vars = self.fixed_reduction.assigned_vars
+        pattern_assigned_vars = self.fixed_reduction.pattern_assigned_vars
+        # Constraint indices per unit and position, for update_jobs.
+        self.constraint_ranges = ConstraintRanges()
 
         # Add problem-specific constraints.
         add_job_assignment_constraints(
             self.model,
-            self.assigned_vars,
-            self.pattern_assigned_vars,
+            assigned_vars,
+            pattern_assigned_vars,
             self.jobs,
             self.positions,
             self.tick_to_index,
             self.compressed_ticks,
             self.pos_unit_model_dependency,
             self.time_adapter,
+            self.constraint_ranges.units,
         )
 
-        add_movement_detection_constraints(
+        removed_triggers = add_movement_detection_constraints(
             self.model,
-            self.assigned_vars,
-            self.pattern_assigned_vars,
+            assigned_vars,
+            pattern_assigned_vars,
             self.unit_movement_vars,
             self.movement_in_position_vars,
             self.jobs,
             num_timesteps=self.num_time_steps,
             positions_configuration=self.positions_configuration,
+            pooled_positions={
+                self.positions_configuration.index_map[name]
+                for name in self.pooled_positions
+            },
+            usable_positions=(
+                self.presolve.usable_positions if self.presolve is not None else None
+            ),
+            ranges=self.constraint_ranges.units,
         )
+        if self.presolve is not None:
+            self.presolve.removed_triggers = [
+                (self.positions[i].name, self.positions[j].name)
+                for i, j in removed_triggers
+            ]
 
         add_position_capacity_constraints(
             self.model,
-            self.assigned_vars,
+            assigned_vars,
             self.positions,
             self.jobs,
             num_timesteps=self.num_time_steps,
+            ranges=self.constraint_ranges.positions,
         )
+        if self.USE_CAPACITY_CUTS:
+            add_need_capacity_cuts(
+                self.model,
+                assigned_vars,
+                self.positions,
+                self.jobs,
+                self.capacity_summary,
+            )
+            add_pattern_clique_cuts(
+                self.model, pattern_assigned_vars, self.positions, self.jobs
+            )
 
-    def set_objective(self):
-        total_movements = minimize_total_unit_movements(
-            self.model, self.unit_movement_vars
+        if self.USE_SYMMETRY_BREAKING:
+            self._add_symmetry_breaking()
+
+        if self.SEARCH_STRATEGY not in SEARCH_STRATEGIES:
+            raise ValueError(
+                f"Unknown SEARCH_STRATEGY {self.SEARCH_STRATEGY!r}, "
+                f"use one of {SEARCH_STRATEGIES}."
+            )
+        if self.SEARCH_STRATEGY != "default":
+            add_chronological_decision_strategy(
+                self.model,
+                pattern_assigned_vars,
+                self.unit_movement_vars,
+                self.jobs,
+                self.num_time_steps,
+            )
+
+    def configure_solver(self, solver: cp_model.CpSolver):
+        """Apply the solver properties of the problem to a CpSolver."""
+        solver.parameters.max_time_in_seconds = self.SOLVERTIMELIMIT
+        if self.DETERMINISTICTIMELIMIT is not None:
+            solver.parameters.max_deterministic_time = self.DETERMINISTICTIMELIMIT
+        if self.SEARCH_STRATEGY == "chronological_fixed":
+            # Every worker follows the decision strategy instead of its own heuristics.
+            solver.parameters.search_branching = cp_model.FIXED_SEARCH
+
+    def fixed_units_and_positions(self) -> tuple[set[str], set[str]]:
+        """Names of the units and positions referenced by the fixed variables."""
+        fixed = {var.Index() for var, _ in self.fixed_variables}
+        fixed_units, fixed_positions = set(), set()
+        if not fixed:
+            return fixed_units, fixed_positions
+        for j_idx, t_map in self.pattern_assigned_vars.items():
+            allowed_patterns = self.jobs[j_idx].unit.type.allowed_patterns
+            for k_map in t_map.values():
+                for k_idx, var in k_map.items():
+                    if var.Index() in fixed:
+                        fixed_units.add(self.jobs[j_idx].unit.name)
+                        fixed_positions.update(
+                            p.name for p in allowed_patterns[k_idx].positions
+                        )
+        for j_idx, p_map in self.assigned_vars.items():
+            for p_idx, t_map in p_map.items():
+                if any(var.Index() in fixed for var in t_map.values()):
+                    fixed_units.add(self.jobs[j_idx].unit.name)
+                    fixed_positions.add(self.positions[p_idx].name)
+        for unit_name, t_map in self.unit_movement_vars.items():
+            if any(var.Index() in fixed for var in t_map.values()):
+                fixed_units.add(unit_name)
+        for p_idx, t_map in self.movement_in_position_vars.items():
+            if any(var.Index() in fixed for var in t_map.values()):
+                fixed_positions.add(self.positions[p_idx].name)
+        return fixed_units, fixed_positions
+
+    def _add_symmetry_breaking(self):
+        """Detect interchangeable units/positions (not fixed by the user) and order them."""
+        fixed_units, fixed_positions = self.fixed_units_and_positions()
+        unit_classes = find_equivalent_units(
+            self.jobs, self.job_table, self.pattern_assigned_vars, fixed_units
+        )
+        position_classes = find_equivalent_positions(
+            self.positions,
+            self.positions_configuration,
+            self.unit_types,
+            fixed_positions,
+        )
+        add_symmetry_breaking_constraints(
+            self.model,
+            self.assigned_vars,
+            self.pattern_assigned_vars,
+            self.jobs,
+            unit_classes,
+            position_classes,
         )
+        self.symmetry_classes = {
+            "units": unit_classes,
+            "positions": [
+                [self.positions[p].name for p in c] for c in position_classes
+            ],
+        }
+
+    def set_objective(self):
+        if self.MODEL_ENGINE == "interval":
+            total_movements = self.interval_model.total_movements()
+            self.model.Minimize(total_movements)
+        else:
+            total_movements = minimize_total_unit_movements(
+                self.model, self.unit_movement_vars
+            )
 
         # total_movements = minimize_total_position_movements(
         #     self.model, self.movement_in_position_vars
         # )
         self.objective_function = total_movements
 
+        # Pre-solve bound from the jobs and patterns (see compute_movement_lower_bound).
+        if self.USE_MOVEMENT_LOWER_BOUND:
+            self.movement_lower_bound = compute_movement_lower_bound(self)
+            first = len(self.model.Proto().constraints)
+            add_movement_lower_bound_constraints(
+                self.model,
+                total_movements,
+                self.unit_movement_vars,
+                self.movement_lower_bound,
+            )
+            if self.constraint_ranges is not None:
+                self.constraint_ranges.lower_bound.append(
+                    (first, len(self.model.Proto().constraints))
+                )
+
     def add_fixed_assignment(self, j_idx, p_idx, t_idx, value=True):
         try:
             var = self.assigned_vars[j_idx][p_idx][t_idx]
@@ -206,7 +495,7 @@ class Problem:
             raise ValueError(
                 f"Invalid fixed assignment: variable for job {j_idx}, position {p_idx}, time {t_idx} does not exist."
             )
-        self.fixed_variables.append((var, value))
+        self._add_fixed_value(var, value)
         return var
 
     def add_fixed_pattern_assignment(self, j_idx, t_idx, k_idx, value=True):
@@ -216,7 +505,7 @@ class Problem:
             raise ValueError(
                 f"Invalid fixed pattern assignment: variable for job {j_idx}, time {t_idx}, pattern {k_idx} does not exist."
             )
-        self.fixed_variables.append((var, value))
+        self._add_fixed_value(var, value)
         return var
 
     def add_fixed_unit_movement(self, unit_name, t_idx, value=True):
@@ -226,12 +515,75 @@ class Problem:
             raise ValueError(
                 f"Invalid fixed movement: variable for unit '{unit_name}' at time {t_idx} does not exist."
             )
-        self.fixed_variables.append((var, value))
+        self._add_fixed_value(var, value)
         return var
 
     def add_fixed_bool_var(self, var, value=True):
         # Appends to fixed_variables[] a boolean variable and its desired fixed value.
+        self._add_fixed_value(var, value)
+
+    def _add_fixed_value(self, var, value):
+        # Fixed values are applied by add_constraints(); once built they are added to the
+        # model as constraints (e.g. scenario variants of a clone). Symmetry breaking only
+        # skips the units and positions fixed before the build, so later values could
+        # contradict the order it added.
+        if self.model_built:
+            symmetry_classes = getattr(self, "symmetry_classes", None)
+            if symmetry_classes is not None and any(symmetry_classes.values()):
+                raise ValueError(
+                    "Fixed values can not be added to a built model with symmetry "
+                    "breaking, add them before build_model() or build the model with "
+                    "USE_SYMMETRY_BREAKING = False."
+                )
         self.fixed_variables.append((var, value))
+        if self.model_built:
+            self.model.Add(var == int(value))
+
+    def pattern_index(self, unit_type: UnitType, positions) -> int | None:
+        """
+        k_idx of the pattern of unit_type using exactly the given positions (or names),
+        None if there is none.
+
+        The index (frozenset of position names -> first matching k_idx) is built once
+        per UnitType.
+        """
+        index = self._pattern_index.get(unit_type)
+        if index is None:
+            index = {}
+            for k_idx, pattern in enumerate(unit_type.allowed_patterns):
+                key = frozenset(p.name for p in pattern.positions)
+                index.setdefault(key, k_idx)
+            self._pattern_index[unit_type] = index
+        names = frozenset(p if isinstance(p, str) else p.name for p in positions)
+        return index.get(names)
+
+    def contour_patterns(self, conditions: dict, tick: int, label: str):
+        """
+        Resolve contour conditions ({"assignments": {unit: [positions]}}) at a tick.
+
+        Every unit is resolved with two lookups (active job, pattern), so the conditions
+        are applied in O(units) for any number of jobs and patterns.
+
+        Returns:
+            [(j_idx, k_idx)] in the order of the conditions.
+
+        Raises:
+            ValueError: If no active job exists at the tick for a unit.
+            ValueError: If no valid pattern matches the given assignment.
+        """
+        resolved = []
+        for unit, assigned_positions in conditions["assignments"].items():
+            job_idx = self.job_table.active_row(unit.name, tick)
+            if job_idx is None:
+                raise ValueError(f"No active job found for {unit.name} at {label}.")
+            k_idx = self.pattern_index(unit.type, assigned_positions)
+            if k_idx is None:
+                assigned_pos_names = {pos.name for pos in assigned_positions}
+                raise ValueError(
+                    f"No matching pattern found for unit {unit.name} with positions {assigned_pos_names}."
+                )
+            resolved.append((job_idx, k_idx))
+        return resolved
 
     def _apply_initial_conditions_as_fixed_patterns(self):
         """
@@ -241,78 +593,475 @@ class Problem:
             ValueError: If no active job exists at t0 for a unit.
             ValueError: If no valid pattern matches the given assignment.
         """
-        # Use compressed index for t0
         t0_idx = self.tick_to_index[self.t0_tick]
+        for job_idx, k_idx in self.contour_patterns(
+            self.initial_conditions, self.t0_tick, "t0"
+        ):
+            self.add_fixed_pattern_assignment(job_idx, t0_idx, k_idx, value=True)
+
+    def _apply_final_conditions_as_fixed_patterns(self):
+        """
+        Apply the final assignment conditions at the last time step using fixed variables,
+        so consecutive planning windows can be chained on both ends.
+
+        Raises:
+            ValueError: If no active job exists at the last time step for a unit.
+            ValueError: If no valid pattern matches the given assignment.
+        """
+        last_idx = self.num_time_steps - 1
+        last_tick = self.index_to_tick[last_idx]
+        for job_idx, k_idx in self.contour_patterns(
+            self.final_conditions, last_tick, "t_last"
+        ):
+            self.add_fixed_pattern_assignment(job_idx, last_idx, k_idx, value=True)
 
-        # Position/model index maps
-        pos_index = {p.name: idx for idx, p in enumerate(self.positions)}
-        model_index = {model: idx for idx, model in enumerate(self.unit_types)}
+    def add_pattern_hints(self, patterns: dict[int, dict[int, int]]):
+        """
+        Install a pattern plan as solver hints (replacing previous hints).
 
-        pattern_matrix = self.pos_unit_model_dependency.generate_matrix()
+        Args:
+            patterns: patterns[j_idx][t_idx] = k_idx. Missing (job, time) pairs are not hinted.
 
-        for unit, assigned_positions in self.initial_conditions["assignments"].items():
-            assigned_pos_names = {pos.name for pos in assigned_positions}
-            model = unit.type
-            model_idx = model_index[model]
+        Pattern and assignment variables are hinted for every planned (job, time). Unit
+        movement variables are only hinted for units whose whole time domain is planned.
+        """
+        self.model.ClearHints()
+        if self.MODEL_ENGINE == "interval":
+            self.interval_model.add_pattern_hints(patterns)
+            return
+        pos_index = {
+            p.name: idx
+            for idx, p in enumerate(self.pos_unit_model_dependency.available_positions)
+        }
 
-            # Find job active at t0_tick
-            job_idx = None
-            for j_idx, job in enumerate(self.jobs):
-                start_tick = self.time_adapter.to_tick(job.start)
-                end_tick = self.time_adapter.to_tick(job.end)
-                if job.unit == unit and start_tick <= self.t0_tick <= end_tick:
-                    job_idx = j_idx
-                    break
+        for j_idx, t_map in patterns.items():
+            allowed_patterns = self.jobs[j_idx].unit.type.allowed_patterns
+            for t_idx, k_idx in t_map.items():
+                for k, var in self.pattern_assigned_vars[j_idx][t_idx].items():
+                    self.model.AddHint(var, int(k == k_idx))
+                used = {pos_index[p.name] for p in allowed_patterns[k_idx].positions}
+                for p_idx, t_dict in self.assigned_vars[j_idx].items():
+                    if t_idx in t_dict:
+                        self.model.AddHint(t_dict[t_idx], int(p_idx in used))
 
-            if job_idx is None:
-                raise ValueError(f"No active job found for {unit.name} at t0.")
-
-            # Match pattern from matrix
-            matched = False
-            for k_idx, pattern_row in enumerate(pattern_matrix[model_idx]):
-                pattern_positions = {
-                    self.positions[p_idx].name
-                    for p_idx, used in enumerate(pattern_row)
-                    if used == 1
-                }
-                if pattern_positions == assigned_pos_names:
-                    self.add_fixed_pattern_assignment(
-                        job_idx, t0_idx, k_idx, value=True
-                    )
-                    matched = True
-                    break
-
-            if not matched:
+        planned_units = defaultdict(lambda: True)
+        for j_idx, t_map in self.pattern_assigned_vars.items():
+            unit_name = self.jobs[j_idx].unit.name
+            planned = patterns.get(j_idx, {})
+            planned_units[unit_name] &= all(t_idx in planned for t_idx in t_map)
+
+        for unit_name, moves in plan_unit_movements(self, patterns).items():
+            if not planned_units[unit_name]:
+                continue
+            moves = set(moves)
+            for t_idx, var in self.unit_movement_vars[unit_name].items():
+                self.model.AddHint(var, int(t_idx in moves))
+
+    def read_patterns(self, solver) -> dict[int, dict[int, int]]:
+        """Pattern plan of the solver's solution: patterns[j_idx][t_idx] = k_idx."""
+        if self.MODEL_ENGINE == "interval":
+            return self.interval_model.read_patterns(solver)
+        patterns = defaultdict(dict)
+        for j_idx, t_map in self.pattern_assigned_vars.items():
+            for t_idx, k_map in t_map.items():
+                for k_idx, var in k_map.items():
+                    if solver.Value(var) == 1:
+                        patterns[j_idx][t_idx] = k_idx
+                        break
+        return dict(patterns)
+
+    def build_model(self):
+        """
+        Add constraints and objective to the model. Only the first call has effect.
+
+        With a model_cache, a model built before from the same inputs is loaded instead
+        (and a newly built one is stored).
+        """
+        if self.model_built:
+            return
+        key = None
+        if self.model_cache is not None:
+            key = self.model_cache.key(self)
+            if key is not None and self.model_cache.load(self, key):
+                self.model_built = True
+                return
+        self.add_constraints()
+        self.set_objective()
+        self.model_built = True
+        if key is not None:
+            self.model_cache.store(self, key)
+
+    def clone(self) -> "Problem":
+        """
+        Copy of the built problem with its own model, for scenario variants: constraints
+        added to the copy (add_fixed_*, close_position, add_capacity_limit...) leave this
+        problem untouched. Build problems meant for cloning with USE_SYMMETRY_BREAKING =
+        False: its order would cut valid plans of the variants, so fixed values and limits
+        on ordered positions raise ValueError on a symmetry-broken model.
+
+        The model is copied through its proto and the variable dicts of the copy are
+        rebound to it by index, so no constraint is built again. The problem is built
+        first if needed.
+        """
+        if self.MODEL_ENGINE != "time_indexed":
+            raise ValueError("Cloning needs the time_indexed MODEL_ENGINE.")
+        self.build_model()
+        clone = copy.copy(self)
+        clone.pooled_positions = set(self.pooled_positions)
+        clone.solver_logger = None
+        clone._running_solvers = []
+        clone._stop_requested = False
+        if self.constraint_ranges is not None:
+            clone.constraint_ranges = self.constraint_ranges.copy()
+        clone._use_model(self.model.Clone())
+        return clone
+
+    def _use_model(self, model: cp_model.CpModel):
+        """
+        Make model, a copy of the problem model (same variable indices), the model of the
+        problem: the variable dicts, fixed variables, fixed reduction and objective are
+        rebound to it by index.
+        """
+        self.model = model
+        self.assigned_vars = _rebind_variables(self.assigned_vars, model)
+        self.pattern_assigned_vars = _rebind_variables(
+            self.pattern_assigned_vars, model
+        )
+        self.unit_movement_vars = _rebind_variables(self.unit_movement_vars, model)
+        self.movement_in_position_vars = _rebind_variables(
+            self.movement_in_position_vars, model
+        )
+        self.fixed_variables = [
+            (_rebind_literal(var, model), value) for var, value in self.fixed_variables
+        ]
+        if self.fixed_reduction is not None:
+            self.fixed_reduction = dataclasses.replace(
+                self.fixed_reduction,
+                assigned_vars=_rebind_variables(
+                    self.fixed_reduction.assigned_vars, model
+                ),
+                pattern_assigned_vars=_rebind_variables(
+                    self.fixed_reduction.pattern_assigned_vars, model
+                ),
+            )
+        if getattr(self, "objective_function", None) is not None:
+            self.objective_function = cp_model.LinearExpr.Sum(
+                [
+                    var
+                    for t_map in self.unit_movement_vars.values()
+                    for var in t_map.values()
+                ]
+            )
+
+    def close_position(self, position_name: str, t_indices=None):
+        """Forbid the position (at t_indices, every time step by default) in the built model."""
+        self.add_capacity_limit([position_name], 0, t_indices)
+
+    def add_capacity_limit(self, position_names, capacity: int, t_indices=None):
+        """
+        At most `capacity` jobs in the given positions together at each time step (of
+        t_indices, every time step by default), added to the built model.
+
+        Raises:
+            ValueError: If a position name is unknown, with the interval MODEL_ENGINE or
+                if a position was ordered by symmetry breaking (the order would cut valid
+                plans, build the model with USE_SYMMETRY_BREAKING = False).
+        """
+        if self.MODEL_ENGINE != "time_indexed":
+            raise ValueError("Capacity limits need the time_indexed MODEL_ENGINE.")
+        index_map = self.positions_configuration.index_map
+        unknown = [name for name in position_names if name not in index_map]
+        if unknown:
+            raise ValueError(f"Unknown positions {unknown}.")
+        self.build_model()
+        symmetry_classes = getattr(self, "symmetry_classes", None)
+        if symmetry_classes is not None:
+            ordered = {name for c in symmetry_classes["positions"] for name in c}
+            if ordered & set(position_names):
                 raise ValueError(
-                    f"No matching pattern found for unit {unit.name} with positions {assigned_pos_names}."
+                    f"Positions {sorted(ordered & set(position_names))} are ordered by "
+                    "symmetry breaking, limit them on a model built with "
+                    "USE_SYMMETRY_BREAKING = False."
                 )
+        p_indices = [index_map[name] for name in position_names]
+        by_time = defaultdict(list)
+        for p_map in self.assigned_vars.values():
+            for p_idx in p_indices:
+                for t_idx, var in p_map.get(p_idx, {}).items():
+                    by_time[t_idx].append(var)
+        if t_indices is None:
+            t_indices = self.time_step_indexes
+        for t_idx in t_indices:
+            if by_time.get(t_idx):
+                self.model.Add(sum(by_time[t_idx]) <= capacity)
+
+    def update_jobs(self, jobs: list[Job]) -> bool:
+        """
+        Replace the job list (jobs are matched with source_jobs by identity).
+
+        A built time-indexed problem is updated in place when possible: only the
+        variables and constraints of the touched units and positions change (see
+        update_jobs_incrementally). Otherwise the problem is rebuilt from scratch with
+        the same properties, conditions and horizon (and built again if it was built).
+        Fixed values added with add_fixed_* and scenario constraints do not survive a
+        rebuild, contour conditions do.
+
+        Returns:
+            True if the model was updated in place, False if it was rebuilt.
+
+        Raises:
+            ValueError: If the new jobs are not valid (overlaps, capacity...).
+        """
+        jobs = list(jobs)
+        if update_jobs_incrementally(self, jobs):
+            return True
+        self._rebuild(jobs)
+        return False
+
+    def add_job(self, job: Job) -> bool:
+        """Add a job, see update_jobs."""
+        return self.update_jobs(self.source_jobs + [job])
+
+    def remove_job(self, job) -> bool:
+        """Remove a job (a Job of source_jobs or its index there), see update_jobs."""
+        index = self._source_index(job)
+        return self.update_jobs(
+            self.source_jobs[:index] + self.source_jobs[index + 1 :]
+        )
+
+    def change_job_end(self, job, end) -> bool:
+        """
+        Set the end of a job (a Job of source_jobs or its index there), see update_jobs.
+        The caller's Job is replaced by a new one, not modified.
+        """
+        index = self._source_index(job)
+        old = self.source_jobs[index]
+        new = Job(old.unit, old.phase, self.time_adapter, old.start, end)
+        return self.update_jobs(
+            self.source_jobs[:index] + [new] + self.source_jobs[index + 1 :]
+        )
+
+    def _source_index(self, job) -> int:
+        if isinstance(job, int):
+            if not 0 <= job < len(self.source_jobs):
+                raise ValueError(f"Unknown job {job}.")
+            return job
+        for index, source in enumerate(self.source_jobs):
+            if source is job:
+                return index
+        raise ValueError(f"Job {job} is not a job of the problem.")
+
+    def _rebuild(self, jobs: list[Job]):
+        """Initialize the problem again with jobs, keeping its settings."""
+        fresh = object.__new__(type(self))
+        # Instance properties are read by __init__ (e.g. USE_PRESOLVE).
+        fresh.__dict__.update(
+            {name: value for name, value in vars(self).items() if name.isupper()}
+        )
+        fresh.__init__(
+            jobs,
+            self.positions_configuration,
+            self.pos_unit_model_dependency,
+            self.time_adapter,
+            t_last=(
+                self.time_adapter.from_tick(self.t_last_tick)
+                if self.horizon_given
+                else None
+            ),
+            initial_conditions=self.initial_conditions,
+            final_conditions=self.final_conditions,
+        )
+        fresh.solution_sink = self.solution_sink
+        fresh.model_cache = self.model_cache
+        if self.model_built:
+            fresh.build_model()
+        vars(self).clear()
+        vars(self).update(vars(fresh))
 
     def solve(self):
-        self.add_constraints()
-        self.set_objective()
+        self._stop_requested = False
+        return self._solve(self.solution_sink)
+
+    async def solve_async(self, executor=None, on_progress=None):
+        """
+        Run solve() in an executor so the event loop is not blocked.
+
+        Several problems can be solved concurrently (one solve per Problem at a time).
+        Cancelling the awaiting task stops the search (see stop_search) and waits for the
+        solve to return before CancelledError is raised.
+
+        Args:
+            executor: concurrent.futures executor (None for the loop default executor).
+            on_progress: Called on the event loop with the SolutionRecord of every solution.
+                Coroutines it returns are scheduled as tasks.
+
+        Returns:
+            (status, solver), like solve.
+        """
+        loop = asyncio.get_running_loop()
+        sink = self.solution_sink
+        if on_progress is not None:
+            sink = LoopSink(loop, on_progress, sink)
+        self._stop_requested = False
+        future = loop.run_in_executor(executor, self._solve, sink)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            while not future.done():
+                self.stop_search()
+                await asyncio.wait({future}, timeout=0.05)
+            if not future.cancelled():
+                future.exception()  # Retrieved, the cancellation is what is raised.
+            raise
+
+    def stop_search(self):
+        """
+        Stop the solve running in another thread, which returns its best solution so far.
+        A solve that has not started its search yet runs with no time.
+        """
+        self._stop_requested = True
+        for solver in list(self._running_solvers):
+            solver.StopSearch()
+        aggregation = getattr(self, "aggregation", None)
+        if aggregation is not None:
+            aggregation.pooled.stop_search()
+
+    @contextmanager
+    def _running(self, solver: cp_model.CpSolver):
+        """Register solver as running so stop_search reaches it."""
+        if self._stop_requested:
+            solver.parameters.max_time_in_seconds = 0
+        self._running_solvers.append(solver)
+        try:
+            yield solver
+        finally:
+            self._running_solvers.remove(solver)
+
+    def _solve(self, sink, hinted: bool = False):
+        """
+        Solve with the solver properties, logger, sink and checkpointer of the problem.
+
+        Args:
+            hinted: The caller installed its own hints (e.g. CoarseToFineSolver), which
+                are kept instead of the greedy hint.
+        """
+        if self.USE_POSITION_AGGREGATION:
+            self.aggregation = PositionAggregation(self)
+            if self.aggregation.classes:
+                return self._solve_aggregated(sink)
+
+        self.build_model()
+        if hinted:
+            self.greedy_plan = None
+        else:
+            self._add_greedy_hint()
 
         solver = cp_model.CpSolver()
+        self.configure_solver(solver)
 
-        # When wanting to log
+        # Solutions go to the sink (if any) through the background writer.
         logger = IncrementalSolverLogger(
-            self.objective_function,
             inactivity_timeout=self.STEPTIMELIMIT,
-            log=False,
+            lower_bound=(
+                self.movement_lower_bound.total
+                if self.movement_lower_bound is not None
+                else None
+            ),
+            sink=sink,
+            print_solutions=self.PRINT_SOLUTIONS,
+            checkpointer=self.checkpointer,
+        )
+        checkpoint = (
+            self.checkpointer.running(self)
+            if self.checkpointer is not None
+            else nullcontext()
         )
-        logger.start_monitoring()
-        status = solver.SolveWithSolutionCallback(self.model, logger)
+        # The watchdog and the writers are joined when the solve returns. The logger
+        # starts last, its inactivity clock follows the solver WallTime().
+        with self._running(solver), checkpoint, logger:
+            status = solver.Solve(self.model, logger)
+        self.solver_logger = logger
 
-        print(f"BestObjectiveBound: {logger.BestObjectiveBound()}")
+        self._message(f"BestObjectiveBound: {solver.BestObjectiveBound()}")
 
         # Some times the max_time_in_seconds is reached but the wall time is a little bit smaller, therefore we add 1 second just to make sure.
         wall_time = solver.WallTime()
         exceeded_time_limit = False
         if wall_time + 1 >= solver.parameters.max_time_in_seconds:
-            print(
+            self._message(
                 f"Stopping search after {wall_time:.2f} s, solver time limit reached. Consider increasing time limit."
             )
             exceeded_time_limit = True
         elif logger.step_time_limit_reached:
-            print("Stopping search, step time limit reached.")
+            self._message("Stopping search, step time limit reached.")
+
+        if (
+            status not in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+            and self.greedy_plan is not None
+            and self.greedy_plan.complete
+        ):
+            self._message(
+                "No solution found by the solver. A greedy fallback plan with "
+                f"{self.greedy_plan.movements} movements is available in problem.greedy_plan."
+            )
+
+        return status, solver
+
+    def _message(self, message):
+        # Solve messages are optional, like the solutions (PRINT_SOLUTIONS).
+        if self.PRINT_SOLUTIONS:
+            print(message)
+
+    def _add_greedy_hint(self):
+        self.greedy_plan = None
+        if self.USE_GREEDY_HINT and self.MODEL_ENGINE == "time_indexed":
+            self.greedy_plan = build_greedy_plan(self)
+            self.add_pattern_hints(self.greedy_plan.patterns)
 
+    def stream_solutions(self, latest_only: bool = False) -> PlanStream:
+        """
+        Solve in a background thread and iterate over the improving plans.
+
+        Returns:
+            A PlanStream yielding a PlanSnapshot per improving solution. Closing it stops
+            the search; status and solver are set on it once it is exhausted or closed.
+            Position aggregation is not applied.
+        """
+        self.build_model()
+        self._add_greedy_hint()
+        solver = cp_model.CpSolver()
+        self.configure_solver(solver)
+        return PlanStream(self, solver, latest_only=latest_only)
+
+    def _solve_aggregated(self, sink=None):
+        """
+        Solve the pooled problem of self.aggregation and install its disaggregated plan.
+
+        The concrete model is solved with every pattern fixed to the plan, so the returned
+        solver holds a solution of this problem (and Solution works as usual), while the
+        returned status is the one of the pooled solve. The pooled solver is kept in
+        self.aggregation_solver (and returned when it found no solution). The concrete
+        solve gets the time left by the pooled one.
+        """
+        start_time = time.time()
+        pooled = self.aggregation.pooled
+        pooled._stop_requested = self._stop_requested
+        status, pooled_solver = pooled._solve(sink)
+        self.aggregation_solver = pooled_solver
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return status, pooled_solver
+
+        plan = self.aggregation.disaggregate(pooled.read_patterns(pooled_solver))
+        self.build_model()
+        self.add_pattern_hints(plan)
+        solver = cp_model.CpSolver()
+        self.configure_solver(solver)
+        solver.parameters.fix_variables_to_their_hinted_value = True
+        solver.parameters.max_time_in_seconds = max(
+            1, self.SOLVERTIMELIMIT - (time.time() - start_time)
+        )
+        with self._running(solver):
+            concrete_status = solver.Solve(self.model)
+        if concrete_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return concrete_status, solver
         return status, solver
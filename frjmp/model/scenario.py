@@ -0,0 +1,275 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from ortools.sat.python import cp_model
+
+from frjmp.model.adapter import TimeAdapter
+from frjmp.model.job_table import JobTable
+from frjmp.model.parameters.position_unit_model import PositionsUnitTypeDependency
+from frjmp.model.parameters.positions_configuration import PositionsConfiguration
+from frjmp.model.problem import Problem
+from frjmp.model.sets.job import Job
+from frjmp.utils.timeline_utils import build_timeline
+from frjmp.utils.validation_utils import validate_non_overlapping_jobs_per_unit
+
+
+@dataclass
+class Scenario:
+    """
+    A what-if variant expressed as a small delta over the base problem.
+
+    Attributes:
+        name: Label used in the comparison table.
+        closed_positions: Names of positions that can not be used (capacity set to 0).
+        delays: base job index -> number of ticks the whole job is shifted (can be negative).
+        added_jobs: Extra jobs (e.g. a new unit arriving to the hangar).
+    """
+
+    name: str
+    closed_positions: List[str] = field(default_factory=list)
+    delays: Dict[int, int] = field(default_factory=dict)
+    added_jobs: List[Job] = field(default_factory=list)
+
+
+class ScenarioRunner:
+    """
+    Solve many what-if scenarios of the same base problem.
+
+    The base preprocessing is done once when the runner is created:
+        - Job table (job start/end ticks).
+        - Compressed timeline, kept as a tick multiset so each scenario only applies its delta.
+        - Default patterns, generated once so every scenario shares the same pattern
+          numbering (the workers get them with the pickled unit types).
+    Each scenario is then built and solved in a process pool and summarized in a comparison table.
+    """
+
+    def __init__(
+        self,
+        jobs: list[Job],
+        positions_configuration: PositionsConfiguration,
+        position_unittype_dependency: PositionsUnitTypeDependency,
+        time_adapter: TimeAdapter,
+        t_last=None,
+        initial_conditions: dict = None,
+    ):
+        self.jobs = list(jobs)
+        self.positions_configuration = positions_configuration
+        self.pos_unit_model_dependency = position_unittype_dependency
+        self.time_adapter = time_adapter
+        self.initial_conditions = initial_conditions
+
+        validate_non_overlapping_jobs_per_unit(self.jobs, time_adapter)
+
+        self.job_table = JobTable(self.jobs, time_adapter)
+        self.t0_tick = time_adapter.to_tick(time_adapter.origin) - 1
+        if t_last is None:
+            if not self.jobs:
+                raise ValueError("Provide t_last when jobs is empty.")
+            self.t_last_tick = max(self.job_table.end_ticks)
+        else:
+            self.t_last_tick = time_adapter.to_tick(t_last)
+        # Scenarios share the base horizon, so delayed jobs are clipped to it.
+        self.t_last = time_adapter.from_tick(self.t_last_tick)
+
+        self.tick_counts = self.job_table.tick_counts(self.t0_tick, self.t_last_tick)
+        self.tick_counts[self.t0_tick] += 1  # Include the t0 point.
+
+        position_unittype_dependency.generate_matrix()  # Default patterns.
+        self.position_names = {p.name for p in positions_configuration.positions}
+
+    def _clip(self, start_tick: int, end_tick: int):
+        if end_tick < self.t0_tick or start_tick > self.t_last_tick:
+            return None
+        return max(start_tick, self.t0_tick), min(end_tick, self.t_last_tick)
+
+    def build_scenario_jobs(self, scenario: Scenario):
+        """
+        Apply the scenario delta to the base job table.
+
+        Returns:
+            (jobs, timeline): the scenario job list (untouched jobs are shared with the base)
+            and its compressed timeline (same format as `compress_timepoints`).
+
+        Raises:
+            ValueError: If the delta references unknown jobs/positions or makes jobs overlap.
+        """
+        adapter = self.time_adapter
+        table = self.job_table
+        counts = Counter(self.tick_counts)
+        jobs = list(self.jobs)
+        touched_units = set()
+
+        unknown = set(scenario.closed_positions) - self.position_names
+        if unknown:
+            raise ValueError(
+                f"Scenario '{scenario.name}' closes unknown positions {unknown}."
+            )
+
+        for j_idx, delay in scenario.delays.items():
+            if not 0 <= j_idx < len(table):
+                raise ValueError(
+                    f"Scenario '{scenario.name}' delays unknown job {j_idx}."
+                )
+            job = self.jobs[j_idx]
+            s, e = table.start_ticks[j_idx], table.end_ticks[j_idx]
+            old = self._clip(s, e)
+            if old is not None:
+                counts.subtract(old)
+            new = self._clip(s + delay, e + delay)
+            if new is not None:
+                counts.update(new)
+            jobs[j_idx] = Job(
+                job.unit,
+                job.phase,
+                adapter,
+                adapter.from_tick(s + delay),
+                adapter.from_tick(e + delay),
+            )
+            touched_units.add(job.unit.name)
+
+        for job in scenario.added_jobs:
+            new = self._clip(adapter.to_tick(job.start), adapter.to_tick(job.end))
+            if new is not None:
+                counts.update(new)
+            jobs.append(job)
+            touched_units.add(job.unit.name)
+
+        # Only the units touched by the delta need to be validated again.
+        if touched_units:
+            validate_non_overlapping_jobs_per_unit(
+                [job for job in jobs if job.unit.name in touched_units], adapter
+            )
+
+        timeline = build_timeline(
+            (tick for tick, count in counts.items() if count > 0), adapter
+        )
+        return jobs, timeline
+
+    def run(
+        self,
+        scenarios: List[Scenario],
+        max_workers: Optional[int] = None,
+        time_limit: Optional[float] = None,
+    ) -> pd.DataFrame:
+        """
+        Solve every scenario in a process pool.
+
+        Returns:
+            DataFrame with one row per scenario and columns:
+            scenario, status, objective, bound, movements, wall_time_sec, error.
+
+        Raises:
+            ValueError: If two scenarios have the same name (rows are keyed by name).
+        """
+        duplicated = sorted(
+            name
+            for name, count in Counter(s.name for s in scenarios).items()
+            if count > 1
+        )
+        if duplicated:
+            raise ValueError(f"Duplicated scenario names {duplicated}.")
+        rows: Dict[str, Dict[str, Any]] = {}
+        payloads = []
+        for scenario in scenarios:
+            try:
+                jobs, timeline = self.build_scenario_jobs(scenario)
+            except ValueError as err:
+                rows[scenario.name] = _scenario_row(
+                    scenario.name, "INVALID", error=str(err)
+                )
+                continue
+            payloads.append(
+                (
+                    scenario.name,
+                    jobs,
+                    timeline,
+                    list(scenario.closed_positions),
+                    self.positions_configuration,
+                    self.pos_unit_model_dependency,
+                    self.time_adapter,
+                    self.t_last,
+                    self.initial_conditions,
+                    time_limit,
+                )
+            )
+
+        if payloads:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for row in executor.map(_solve_scenario, payloads):
+                    rows[row["scenario"]] = row
+
+        return pd.DataFrame([rows[s.name] for s in scenarios])
+
+
+def _scenario_row(
+    name, status, objective=None, bound=None, movements=None, wall_time=None, error=None
+):
+    return dict(
+        scenario=name,
+        status=status,
+        objective=objective,
+        bound=bound,
+        movements=movements,
+        wall_time_sec=wall_time,
+        error=error,
+    )
+
+
+def _solve_scenario(payload) -> Dict[str, Any]:
+    """Process pool worker: build and solve one scenario (runs on a pickled copy of the base data)."""
+    (
+        name,
+        jobs,
+        timeline,
+        closed_positions,
+        positions_configuration,
+        dependency,
+        adapter,
+        t_last,
+        initial_conditions,
+        time_limit,
+    ) = payload
+
+    for position in positions_configuration.positions:
+        if position.name in closed_positions:
+            position.capacity = 0
+
+    try:
+        problem = Problem(
+            jobs,
+            positions_configuration,
+            dependency,
+            adapter,
+            t_last=t_last,
+            initial_conditions=initial_conditions,
+            timeline=timeline,
+        )
+    except ValueError as err:
+        return _scenario_row(name, "INVALID", error=str(err))
+
+    if time_limit is not None:
+        problem.SOLVERTIMELIMIT = time_limit
+    status, solver = problem.solve()
+
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return _scenario_row(
+            name, solver.StatusName(status), wall_time=solver.WallTime()
+        )
+
+    movements = sum(
+        solver.Value(var)
+        for t_dict in problem.unit_movement_vars.values()
+        for var in t_dict.values()
+    )
+
+    return _scenario_row(
+        name,
+        solver.StatusName(status),
+        objective=solver.ObjectiveValue(),
+        bound=solver.BestObjectiveBound(),
+        movements=movements,
+        wall_time=solver.WallTime(),
+    )
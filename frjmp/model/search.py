@@ -0,0 +1,44 @@
+from collections import defaultdict
+from typing import Dict, List
+
+from ortools.sat.python import cp_model
+
+SEARCH_STRATEGIES = ("default", "chronological", "chronological_fixed")
+
+
+def add_chronological_decision_strategy(
+    model: cp_model.CpModel,
+    pattern_assigned_vars: Dict[int, Dict[int, Dict[int, cp_model.IntVar]]],
+    unit_movement_vars: Dict[str, Dict[int, cp_model.IntVar]],
+    jobs: List,
+    num_timesteps: int,
+):
+    """
+    Branch on the pattern decisions in chronological order, preferring to keep the
+    previous pattern.
+
+    For every time step t (in order) and unit (by name) the strategy first decides
+    "no movement between t-1 and t" (the negated unit movement literal, set to true first),
+    which the movement constraints propagate into keeping the pattern of t-1. If that
+    fails, the pattern variables of the unit jobs at t are tried in pattern order.
+    """
+    by_unit_time = defaultdict(list)  # (unit name, t_idx) -> pattern vars
+    for j_idx, t_map in pattern_assigned_vars.items():
+        unit_name = jobs[j_idx].unit.name
+        for t_idx, k_map in t_map.items():
+            by_unit_time[(unit_name, t_idx)].extend(k_map.values())
+
+    literals = []
+    for t_idx in range(num_timesteps):
+        for unit_name in sorted(unit_movement_vars):
+            pattern_vars = by_unit_time.get((unit_name, t_idx))
+            if not pattern_vars:
+                continue
+            movement = unit_movement_vars[unit_name].get(t_idx - 1)
+            if movement is not None:
+                literals.append(movement.Not())
+            literals.extend(pattern_vars)
+
+    model.AddDecisionStrategy(
+        literals, cp_model.CHOOSE_FIRST, cp_model.SELECT_MAX_VALUE
+    )
@@ -0,0 +1,472 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from frjmp.model.adapter import (
+    DailyAdapter,
+    MinuteStepAdapter,
+    ShiftAdapter,
+    TimeAdapter,
+    WeeklyAdapter,
+)
+from frjmp.model.parameters.position_unit_model import (
+    Pattern,
+    PositionsUnitTypeDependency,
+)
+from frjmp.model.parameters.positions_configuration import PositionsConfiguration
+from frjmp.model.problem import Problem
+from frjmp.model.sets.job import Job
+from frjmp.model.sets.need import Need
+from frjmp.model.sets.phase import Phase
+from frjmp.model.sets.position import Position
+from frjmp.model.sets.unit import Unit, UnitType
+
+SPEC_VERSION = 1
+
+# Position = (name, need indices, capacity). Path = (from, to, position indices).
+PositionRow = Tuple[str, List[int], int]
+PathRow = Tuple[int, int, List[int]]
+
+
+def adapter_config(adapter: TimeAdapter) -> Dict[str, Any]:
+    """JSON description of a time adapter (see adapter_from_config)."""
+    kind = type(adapter)
+    if kind is WeeklyAdapter:
+        return {"kind": "weekly", "origin": adapter.origin.isoformat()}
+    if kind is DailyAdapter:
+        return {"kind": "daily", "origin": adapter.origin.isoformat()}
+    if kind is ShiftAdapter:
+        return {
+            "kind": "shift",
+            "origin": [adapter.origin_date.isoformat(), adapter.origin_shift],
+            "shifts": list(adapter.shifts),
+        }
+    if kind is MinuteStepAdapter:
+        return {
+            "kind": "minute",
+            "origin": adapter.origin.isoformat(),
+            "step_minutes": adapter.step,
+        }
+    raise ValueError(f"Time adapter {kind.__name__} can not be serialized.")
+
+
+def adapter_from_config(config: Dict[str, Any]) -> TimeAdapter:
+    kind = config["kind"]
+    if kind == "daily":
+        return DailyAdapter(date.fromisoformat(config["origin"]))
+    if kind == "weekly":
+        return WeeklyAdapter(date.fromisoformat(config["origin"]))
+    if kind == "shift":
+        origin_date, origin_shift = config["origin"]
+        return ShiftAdapter(
+            (date.fromisoformat(origin_date), origin_shift), config["shifts"]
+        )
+    if kind == "minute":
+        return MinuteStepAdapter(
+            datetime.fromisoformat(config["origin"]), config["step_minutes"]
+        )
+    raise ValueError(f"Unknown time adapter kind {kind!r}.")
+
+
+class _Indexer:
+    """Index of objects by key, in order of first appearance."""
+
+    def __init__(self):
+        self.index: Dict[Any, int] = {}
+        self.items: List[Any] = []
+
+    def add(self, key, item) -> int:
+        if key not in self.index:
+            self.index[key] = len(self.items)
+            self.items.append(item)
+        return self.index[key]
+
+
+@dataclass(frozen=True, eq=False)
+class ProblemSpec:
+    """
+    Plain-data description of a Problem: no model, no solver and no domain objects, so it
+    pickles, serializes to JSON or npz, and has a stable content hash. build() creates the
+    Problem again (in another process, or from a file).
+
+    Objects are stored as indices into the lists of the spec: positions refer to needs,
+    patterns to positions, units to unit types... Job starts and ends are stored as ticks
+    of the adapter (one int array each), so a rebuilt job has the adapter value of its
+    tick (MinuteStepAdapter values are rounded down to their step).
+
+    Attributes:
+        needs: Need names.
+        positions: (name, need indices, capacity) of the configuration positions.
+        out_position: (name, need indices, capacity) of the configuration out position.
+        triggers: (from, to, triggered positions) position indices.
+        out_paths, in_paths: (from, to, involved positions) position indices.
+        dependency_positions: Positions of the dependency (indices into positions).
+        unit_types: Unit type names, in dependency order.
+        patterns: Allowed patterns of each unit type, as indices into
+            dependency_positions. Unit types with no pattern get the default single
+            position patterns, as the Problem would.
+        phases: (name, need index) of each phase.
+        units: (name, unit type index) of each unit.
+        job_units, job_phases, job_start, job_end: One entry per job (in input order).
+        adapter: adapter_config of the time adapter.
+        t_last: Horizon end tick.
+        initial_conditions, final_conditions: Unit index -> position indices (None if
+            not given).
+        properties: Solver properties set on the Problem (e.g. {"USE_CAPACITY_CUTS": True}).
+    """
+
+    needs: List[str]
+    positions: List[PositionRow]
+    out_position: PositionRow
+    triggers: List[PathRow]
+    out_paths: List[PathRow]
+    in_paths: List[PathRow]
+    dependency_positions: List[int]
+    unit_types: List[str]
+    patterns: List[List[List[int]]]
+    phases: List[Tuple[str, int]]
+    units: List[Tuple[str, int]]
+    job_units: np.ndarray
+    job_phases: np.ndarray
+    job_start: np.ndarray
+    job_end: np.ndarray
+    adapter: Dict[str, Any]
+    t_last: int
+    initial_conditions: Optional[Dict[int, List[int]]] = None
+    final_conditions: Optional[Dict[int, List[int]]] = None
+    properties: Dict[str, Any] = field(default_factory=dict)
+
+    _ARRAYS = ("job_units", "job_phases", "job_start", "job_end")
+
+    @classmethod
+    def from_inputs(
+        cls,
+        jobs: List[Job],
+        positions_configuration: PositionsConfiguration,
+        position_unittype_dependency: PositionsUnitTypeDependency,
+        time_adapter: TimeAdapter,
+        t_last=None,
+        initial_conditions: dict = None,
+        final_conditions: dict = None,
+        properties: Dict[str, Any] = None,
+    ) -> "ProblemSpec":
+        """
+        Spec of the Problem built from these arguments (same signature as Problem).
+
+        Raises:
+            ValueError: If the adapter can not be serialized, or a job, pattern or
+                condition refers to a position, unit type or need outside the inputs.
+        """
+        needs = _Indexer()
+        positions = positions_configuration.positions
+        position_index = {p.name: idx for idx, p in enumerate(positions)}
+
+        def position_row(position):
+            need_idx = [needs.add(n.name, n.name) for n in position.available_needs]
+            return (position.name, need_idx, position.capacity)
+
+        def position_idx(position):
+            if position.name not in position_index:
+                raise ValueError(
+                    f"Position {position.name} is not in the positions configuration."
+                )
+            return position_index[position.name]
+
+        def path_rows(paths, ordered):
+            rows = []
+            for (from_pos, to_pos), involved in paths.items():
+                indices = [position_idx(p) for p in involved]
+                rows.append(
+                    (
+                        position_idx(from_pos),
+                        position_idx(to_pos),
+                        indices if ordered else sorted(indices),
+                    )
+                )
+            return sorted(rows)
+
+        position_rows = [position_row(p) for p in positions]
+        out_row = position_row(positions_configuration.out_position)
+
+        dependency = position_unittype_dependency
+        dependency_positions = [position_idx(p) for p in dependency.available_positions]
+        available_index = {
+            p.name: idx for idx, p in enumerate(dependency.available_positions)
+        }
+        unit_type_index = {t.name: idx for idx, t in enumerate(dependency.unit_types)}
+        patterns = []
+        for unit_type in dependency.unit_types:
+            if unit_type.allowed_patterns:
+                patterns.append(
+                    [
+                        [available_index[p.name] for p in pattern.positions]
+                        for pattern in unit_type.allowed_patterns
+                    ]
+                )
+            else:  # add_default_single_patterns
+                patterns.append([[idx] for idx in range(len(available_index))])
+
+        phases = _Indexer()
+        units = _Indexer()
+
+        def unit_idx(unit):
+            if unit.type.name not in unit_type_index:
+                raise ValueError(f"Unit type of {unit.name} is not in the dependency.")
+            return units.add(unit.name, (unit.name, unit_type_index[unit.type.name]))
+
+        rows = []
+        for job in jobs:
+            need = job.phase.required_need.name
+            phase_idx = phases.add(
+                (job.phase.name, need), (job.phase.name, needs.add(need, need))
+            )
+            rows.append(
+                (
+                    unit_idx(job.unit),
+                    phase_idx,
+                    time_adapter.to_tick(job.start),
+                    time_adapter.to_tick(job.end),
+                )
+            )
+        columns = np.array(rows, dtype=np.int64).reshape(len(rows), 4).T
+
+        def conditions(given):
+            if given is None:
+                return None
+            return {
+                unit_idx(unit): [position_idx(p) for p in assigned]
+                for unit, assigned in given["assignments"].items()
+            }
+
+        if t_last is None:
+            if not jobs:
+                raise ValueError("Provide t_last when jobs is empty.")
+            t_last_tick = int(columns[3].max())
+        else:
+            t_last_tick = time_adapter.to_tick(t_last)
+
+        return cls(
+            needs=needs.items,
+            positions=position_rows,
+            out_position=out_row,
+            triggers=path_rows(positions_configuration.triggers, ordered=False),
+            out_paths=path_rows(positions_configuration.out_paths, ordered=True),
+            in_paths=path_rows(positions_configuration.in_paths, ordered=True),
+            dependency_positions=dependency_positions,
+            unit_types=[t.name for t in dependency.unit_types],
+            patterns=patterns,
+            phases=phases.items,
+            units=units.items,
+            job_units=columns[0].astype(np.int32),
+            job_phases=columns[1].astype(np.int32),
+            job_start=columns[2],
+            job_end=columns[3],
+            adapter=adapter_config(time_adapter),
+            t_last=t_last_tick,
+            initial_conditions=conditions(initial_conditions),
+            final_conditions=conditions(final_conditions),
+            properties=dict(properties or {}),
+        )
+
+    @classmethod
+    def from_problem(cls, problem) -> "ProblemSpec":
+        """Spec of a Problem (its input jobs and the properties set on the instance)."""
+        return cls.from_inputs(
+            problem.source_jobs,
+            problem.positions_configuration,
+            problem.pos_unit_model_dependency,
+            problem.time_adapter,
+            t_last=problem.time_adapter.from_tick(problem.t_last_tick),
+            initial_conditions=problem.initial_conditions,
+            final_conditions=problem.final_conditions,
+            properties={
+                name: value for name, value in vars(problem).items() if name.isupper()
+            },
+        )
+
+    def problem_args(self) -> Dict[str, Any]:
+        """Keyword arguments of Problem, with new domain objects."""
+        needs = [Need(name) for name in self.needs]
+
+        def position(row):
+            name, need_idx, capacity = row
+            return Position(name, [needs[i] for i in need_idx], capacity)
+
+        positions = [position(row) for row in self.positions]
+        configuration = PositionsConfiguration(
+            positions,
+            out_position=position(self.out_position),
+            triggers={
+                (positions[i], positions[j]): {positions[k] for k in triggered}
+                for i, j, triggered in self.triggers
+            },
+            out_paths={
+                (positions[i], positions[j]): [positions[k] for k in involved]
+                for i, j, involved in self.out_paths
+            },
+            in_paths={
+                (positions[i], positions[j]): [positions[k] for k in involved]
+                for i, j, involved in self.in_paths
+            },
+        )
+
+        available = [positions[i] for i in self.dependency_positions]
+        unit_types = []
+        for name, type_patterns in zip(self.unit_types, self.patterns):
+            unit_type = UnitType(name)
+            unit_type.add_multiple_patterns(
+                [Pattern([available[i] for i in pattern]) for pattern in type_patterns]
+            )
+            unit_types.append(unit_type)
+        dependency = PositionsUnitTypeDependency(unit_types, available)
+
+        adapter = adapter_from_config(self.adapter)
+        phases = [Phase(name, needs[need_idx]) for name, need_idx in self.phases]
+        units = [Unit(name, unit_types[type_idx]) for name, type_idx in self.units]
+        jobs = [
+            Job(
+                units[u],
+                phases[p],
+                adapter,
+                adapter.from_tick(int(start)),
+                adapter.from_tick(int(end)),
+            )
+            for u, p, start, end in zip(
+                self.job_units, self.job_phases, self.job_start, self.job_end
+            )
+        ]
+
+        def conditions(given):
+            if given is None:
+                return None
+            return {
+                "assignments": {
+                    units[u]: [positions[i] for i in assigned]
+                    for u, assigned in given.items()
+                }
+            }
+
+        return dict(
+            jobs=jobs,
+            positions_configuration=configuration,
+            position_unittype_dependency=dependency,
+            time_adapter=adapter,
+            t_last=adapter.from_tick(self.t_last),
+            initial_conditions=conditions(self.initial_conditions),
+            final_conditions=conditions(self.final_conditions),
+        )
+
+    def build(self, problem_class=Problem):
+        """New Problem (or problem_class instance) with the spec properties."""
+        problem = problem_class(**self.problem_args())
+        for name, value in self.properties.items():
+            setattr(problem, name, value)
+        return problem
+
+    # --- Serialization --- #
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-compatible dict (condition keys become strings)."""
+
+        def conditions(given):
+            if given is None:
+                return None
+            return {str(u): list(assigned) for u, assigned in given.items()}
+
+        data = {
+            "version": SPEC_VERSION,
+            "needs": list(self.needs),
+            "positions": [list(row) for row in self.positions],
+            "out_position": list(self.out_position),
+            "triggers": [list(row) for row in self.triggers],
+            "out_paths": [list(row) for row in self.out_paths],
+            "in_paths": [list(row) for row in self.in_paths],
+            "dependency_positions": list(self.dependency_positions),
+            "unit_types": list(self.unit_types),
+            "patterns": self.patterns,
+            "phases": [list(row) for row in self.phases],
+            "units": [list(row) for row in self.units],
+            "adapter": self.adapter,
+            "t_last": int(self.t_last),
+            "initial_conditions": conditions(self.initial_conditions),
+            "final_conditions": conditions(self.final_conditions),
+            "properties": self.properties,
+        }
+        for name in self._ARRAYS:
+            data[name] = getattr(self, name).tolist()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProblemSpec":
+        if data.get("version") != SPEC_VERSION:
+            raise ValueError(f"Unsupported ProblemSpec version {data.get('version')}.")
+
+        def conditions(given):
+            if given is None:
+                return None
+            return {int(u): list(assigned) for u, assigned in given.items()}
+
+        return cls(
+            needs=list(data["needs"]),
+            positions=[tuple(row) for row in data["positions"]],
+            out_position=tuple(data["out_position"]),
+            triggers=[tuple(row) for row in data["triggers"]],
+            out_paths=[tuple(row) for row in data["out_paths"]],
+            in_paths=[tuple(row) for row in data["in_paths"]],
+            dependency_positions=list(data["dependency_positions"]),
+            unit_types=list(data["unit_types"]),
+            patterns=data["patterns"],
+            phases=[tuple(row) for row in data["phases"]],
+            units=[tuple(row) for row in data["units"]],
+            job_units=np.array(data["job_units"], dtype=np.int32),
+            job_phases=np.array(data["job_phases"], dtype=np.int32),
+            job_start=np.array(data["job_start"], dtype=np.int64),
+            job_end=np.array(data["job_end"], dtype=np.int64),
+            adapter=data["adapter"],
+            t_last=data["t_last"],
+            initial_conditions=conditions(data["initial_conditions"]),
+            final_conditions=conditions(data["final_conditions"]),
+            properties=dict(data["properties"]),
+        )
+
+    def to_json(self) -> str:
+        """Canonical JSON (sorted keys, no spaces): equal specs give equal strings."""
+        return json.dumps(self.to_dict(), sort_keys=True, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: str) -> "ProblemSpec":
+        return cls.from_dict(json.loads(text))
+
+    def save(self, path):
+        """Write a compressed npz: the job arrays plus the rest of the spec as JSON."""
+        data = self.to_dict()
+        arrays = {name: getattr(self, name) for name in self._ARRAYS}
+        for name in self._ARRAYS:
+            del data[name]
+        np.savez_compressed(path, meta=np.array(json.dumps(data)), **arrays)
+
+    @classmethod
+    def load(cls, path) -> "ProblemSpec":
+        with np.load(path, allow_pickle=False) as npz:
+            data = json.loads(str(npz["meta"]))
+            for name in cls._ARRAYS:
+                data[name] = npz[name]
+        return cls.from_dict(data)
+
+    @cached_property
+    def content_hash(self) -> str:
+        """SHA-256 of the canonical JSON, stable across processes and runs."""
+        return hashlib.sha256(self.to_json().encode()).hexdigest()
+
+    def __eq__(self, other):
+        if not isinstance(other, ProblemSpec):
+            return NotImplemented
+        return self.content_hash == other.content_hash
+
+    def __hash__(self):
+        return hash(self.content_hash)
@@ -0,0 +1,215 @@
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+
+class PatternLayout:
+    """
+    Order of the pattern assignment variables in a PlanSnapshot.
+
+    Every (job, time step) of pattern_assigned_vars is a slot; the variables are stored
+    slot after slot, so a snapshot is one byte per variable and the chosen pattern of every
+    slot is recovered with two array lookups.
+
+    Attributes:
+        slots: (j_idx, t_idx) of each slot.
+        indices: Model index of each variable.
+        var_slots: Slot of each variable.
+        var_patterns: k_idx of each variable.
+    """
+
+    def __init__(self, pattern_assigned_vars):
+        self.slots: List[Tuple[int, int]] = []
+        self.indices: List[int] = []
+        var_slots, var_patterns = [], []
+        for j_idx, t_map in pattern_assigned_vars.items():
+            for t_idx, k_map in t_map.items():
+                for k_idx, var in k_map.items():
+                    self.indices.append(var.Index())
+                    var_slots.append(len(self.slots))
+                    var_patterns.append(k_idx)
+                self.slots.append((j_idx, t_idx))
+        self.var_slots = np.array(var_slots, dtype=np.int32)
+        self.var_patterns = np.array(var_patterns, dtype=np.int16)
+
+    def pattern_array(self, values: bytes) -> np.ndarray:
+        """k_idx chosen in each slot (-1 if none)."""
+        chosen = np.frombuffer(values, dtype=np.uint8).astype(bool)
+        array = np.full(len(self.slots), -1, dtype=np.int16)
+        array[self.var_slots[chosen]] = self.var_patterns[chosen]
+        return array
+
+    def patterns(self, values: bytes) -> Dict[int, Dict[int, int]]:
+        """Pattern plan, patterns[j_idx][t_idx] = k_idx (like Problem.read_patterns)."""
+        patterns = {}
+        for (j_idx, t_idx), k_idx in zip(self.slots, self.pattern_array(values)):
+            if k_idx >= 0:
+                patterns.setdefault(j_idx, {})[t_idx] = int(k_idx)
+        return patterns
+
+
+@dataclass(frozen=True)
+class PlanSnapshot:
+    """
+    Improving solution of a PlanStream.
+
+    Attributes:
+        step: 1 for the first solution, 2 for the next one...
+        wall_time: Solver wall time in seconds.
+        objective, bound: Objective value and best bound at that solution.
+        values: Pattern assignment values, one byte per variable in layout order.
+        layout: PatternLayout shared by every snapshot of the stream.
+    """
+
+    step: int
+    wall_time: float
+    objective: float
+    bound: float
+    values: bytes
+    layout: PatternLayout
+
+    def pattern_array(self) -> np.ndarray:
+        return self.layout.pattern_array(self.values)
+
+    def patterns(self) -> Dict[int, Dict[int, int]]:
+        return self.layout.patterns(self.values)
+
+
+class _SnapshotCallback(cp_model.CpSolverSolutionCallback):
+    """Queue a PlanSnapshot on each solution (nothing else runs on the solver thread)."""
+
+    def __init__(
+        self, layout: PatternLayout, snapshots: queue.SimpleQueue, lower_bound
+    ):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self._layout = layout
+        self._snapshots = snapshots
+        self._lower_bound = lower_bound
+        self._step = 1
+
+    def on_solution_callback(self):
+        objective = self.ObjectiveValue()
+        self._snapshots.put(
+            PlanSnapshot(
+                self._step,
+                self.WallTime(),
+                objective,
+                self.BestObjectiveBound(),
+                bytes(map(self.SolutionBooleanValue, self._layout.indices)),
+                self._layout,
+            )
+        )
+        self._step += 1
+        if self._lower_bound is not None and objective <= self._lower_bound:
+            self.StopSearch()
+
+
+_DONE = object()  # Queue sentinel: the solve returned.
+
+
+class PlanStream:
+    """
+    Iterator over the improving solutions of a Problem (see Problem.stream_solutions).
+
+    The solve runs in a background thread; its solution callback only copies the pattern
+    assignment values into a PlanSnapshot and queues it, so consumers (e.g. a UI) never
+    run on the solver threads. Closing the stream (close(), leaving a `with` block or
+    breaking out of a for loop over it and deleting it) stops the search and joins the
+    thread.
+
+        with problem.stream_solutions() as stream:
+            for snapshot in stream:
+                show(snapshot.patterns())
+        status, solver = stream.status, stream.solver
+
+    With latest_only=True, snapshots queued while the consumer was busy are skipped and
+    only the newest one is returned.
+
+    Attributes (once the stream is exhausted or closed):
+        status, solver: Result of the solve, like Problem.solve.
+    """
+
+    def __init__(self, problem, solver: cp_model.CpSolver, latest_only=False):
+        if problem.MODEL_ENGINE != "time_indexed":
+            raise ValueError("Streaming solutions needs the time_indexed MODEL_ENGINE.")
+        self.problem = problem
+        self.solver = solver
+        self.latest_only = latest_only
+        self.layout = PatternLayout(problem.pattern_assigned_vars)
+        self.status = None
+        self._error: Optional[BaseException] = None
+        self._snapshots = queue.SimpleQueue()
+        bound = problem.movement_lower_bound
+        self._callback = _SnapshotCallback(
+            self.layout, self._snapshots, bound.total if bound is not None else None
+        )
+        self._finished = False
+        self._stop_requested = False
+        self._thread = threading.Thread(
+            target=self._solve, name="solver-plan-stream", daemon=True
+        )
+        self._thread.start()
+
+    def _solve(self):
+        try:
+            if self._stop_requested:
+                self.status = cp_model.UNKNOWN
+                return
+            self.status = self.solver.Solve(self.problem.model, self._callback)
+        except BaseException as error:  # Re-raised in the consumer thread.
+            self._error = error
+        finally:
+            self._snapshots.put(_DONE)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> PlanSnapshot:
+        if self._finished:
+            raise StopIteration
+        item = self._snapshots.get()
+        while self.latest_only and item is not _DONE:
+            try:
+                newer = self._snapshots.get_nowait()
+            except queue.Empty:
+                break
+            if newer is _DONE:
+                self._snapshots.put(_DONE)
+                break
+            item = newer
+        if item is _DONE:
+            self._finish()
+            raise StopIteration
+        return item
+
+    def _finish(self):
+        self._finished = True
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def close(self):
+        """Stop the search (if still running) and wait for the solver thread."""
+        if self._finished:
+            return
+        self._stop_requested = True
+        # Repeated until the thread exits in case the solve had not started yet.
+        while self._thread.is_alive():
+            self.solver.StopSearch()
+            self._thread.join(0.05)
+        self._finish()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __del__(self):
+        if not getattr(self, "_finished", True):
+            self.close()
@@ -12,7 +12,12 @@ def create_assignment_variables(
     compressed_ticks,
     ticks_to_index,
     time_adapter,
+    usable_positions: set[int] = None,
 ):
+    """
+    Create assigned_vars[j][p][t] for every job, compatible position and active time step.
+    Positions not in usable_positions (see presolve_patterns_and_positions) are skipped.
+    """
     assigned_vars = {}
 
     for j_idx, job in enumerate(jobs):
@@ -26,6 +31,7 @@ def create_assignment_variables(
             p_idx
             for p_idx, pos in enumerate(positions)
             if can_position_cover_phase_needs(pos, job.phase)
+            and (usable_positions is None or p_idx in usable_positions)
         ]
         if not compatible_positions:
             raise ValueError(
@@ -1,5 +1,5 @@
 from ortools.sat.python import cp_model
-from typing import Dict, List
+from typing import Dict, List, Set
 from frjmp.model.sets.job import Job
 from frjmp.model.sets.position import Position
 
@@ -36,6 +36,7 @@ def create_movement_in_position_variables(
     model: cp_model.CpModel,
     positions: List[Position],
     time_steps: int,
+    usable_positions: Set[int] = None,
 ) -> Dict[int, Dict[int, cp_model.IntVar]]:
     """
     Creates movement variables per position per time step.
@@ -48,6 +49,7 @@ def create_movement_in_position_variables(
         model: OR-Tools CP model.
         positions: List of Position objects.
         time_steps: List of time steps (can be compressed indices or actual steps).
+        usable_positions: If given, only these position indices get variables.
 
     Returns:
         Dict of movement_in_position_vars[position_index][t_idx] = BoolVar
@@ -55,6 +57,8 @@ def create_movement_in_position_variables(
     movement_in_position_vars = {}
 
     for p_idx, position in enumerate(positions):
+        if usable_positions is not None and p_idx not in usable_positions:
+            continue
         movement_in_position_vars[p_idx] = {}
         for t_idx in range(0, time_steps):
             movement_in_position_vars[p_idx][t_idx] = model.NewBoolVar(
@@ -17,6 +17,7 @@ def create_pattern_assignment_variables(
     dependency: PositionsUnitTypeDependency,
     assigned_vars,
     time_adapter,
+    usable_patterns: dict[UnitType, list[int]] = None,
 ):
     """
     Create Boolean variables pattern_assigned_vars[j][t][k] that select pattern k
@@ -24,6 +25,7 @@ def create_pattern_assignment_variables(
 
     A pattern is considered valid if all positions it uses are compatible with the job's needs.
     This is determined by checking whether an assigned_var[j][p][t] exists.
+    If usable_patterns is given, only those patterns of each UnitType are checked.
     """
     pattern_assigned_vars = {}
     matrix = dependency.generate_matrix()
@@ -34,6 +36,10 @@ def create_pattern_assignment_variables(
 
         model_idx = model_to_index[job.unit.type]
         n_patterns = len(matrix[model_idx])
+        if usable_patterns is not None:
+            k_indices = usable_patterns[job.unit.type]
+        else:
+            k_indices = range(n_patterns)
 
         active_time_indices = get_active_time_indices(
             job, compressed_ticks, ticks_to_index, time_adapter
@@ -42,7 +48,7 @@ def create_pattern_assignment_variables(
         for t_idx in active_time_indices:
             pattern_assigned_vars[j_idx][t_idx] = {}
 
-            for k_idx in range(n_patterns):
+            for k_idx in k_indices:
                 # Extract all positions used by this pattern
                 pattern_positions = [
                     p_idx
@@ -122,7 +122,8 @@ def trim_jobs_after_time_inplace(
     jobs.extend(valid_jobs)
 
 
-from typing import List, Any, Tuple, Dict
+from dataclasses import dataclass
+from typing import List, Any, Tuple, Dict, Iterable
 from frjmp.model.adapter import TimeAdapter
 
 
@@ -147,8 +148,81 @@ def compress_timepoints(
         unique_ticks.add(adapter.to_tick(job.start))
         unique_ticks.add(adapter.to_tick(job.end))
 
-    compressed_ticks = sorted(unique_ticks)
+    return build_timeline(unique_ticks, adapter)
+
+
+def build_timeline(
+    ticks: Iterable[int],
+    adapter: TimeAdapter,
+) -> Tuple[list[int], Dict[int, int], Dict[int, int], Dict[int, Any]]:
+    """
+    Build the compressed timeline mappings from an already collected set of ticks.
+
+    Same return values as `compress_timepoints`. Useful when the ticks are kept
+    elsewhere (e.g. a JobTable shared between scenarios) and the jobs do not need
+    to be converted again.
+    """
+    compressed_ticks = sorted(set(ticks))
     tick_to_index = {t: i for i, t in enumerate(compressed_ticks)}
     index_to_tick = {i: t for i, t in enumerate(compressed_ticks)}
     index_to_value = {i: adapter.from_tick(t) for i, t in index_to_tick.items()}
     return compressed_ticks, tick_to_index, index_to_tick, index_to_value
+
+
+@dataclass(frozen=True)
+class TimelineReduction:
+    """Number of time steps of the inclusive timeline and of the event timeline."""
+
+    inclusive_steps: int
+    event_steps: int
+
+    @property
+    def removed_steps(self) -> int:
+        return self.inclusive_steps - self.event_steps
+
+    def __str__(self):
+        return (
+            f"Event timeline: {self.event_steps} time steps instead of "
+            f"{self.inclusive_steps} ({self.removed_steps} removed)."
+        )
+
+
+def build_event_timeline(
+    start_ticks: List[int],
+    end_ticks: List[int],
+    adapter: TimeAdapter,
+    keep_ticks: Iterable[int] = (),
+    last_tick: int | None = None,
+) -> Tuple[
+    Tuple[list[int], Dict[int, int], Dict[int, int], Dict[int, Any]], TimelineReduction
+]:
+    """
+    Build the compressed timeline from half-open event boundaries.
+
+    Job [start, end] (inclusive ticks) is seen as the interval [start, end + 1), so its
+    boundaries are start and end + 1. Each time step is the segment between two
+    consecutive boundaries and is represented by its first tick, so a job is active at a
+    step exactly when start <= tick <= end, like in the inclusive timeline. Consecutive
+    segments with the same active jobs are merged (a boundary where no job starts or
+    ends is dropped) unless their tick is in keep_ticks. Boundaries after last_tick are
+    dropped.
+
+    A job ending at e and the next one starting at e + 1 share one boundary instead of
+    creating two steps. Note that a gap between two jobs of a unit is always a step where
+    the unit is not active (in the inclusive timeline it only is when some other tick
+    falls in the gap).
+
+    Returns:
+        (compressed_ticks, tick_to_index, index_to_tick, index_to_value), reduction.
+        index_to_value maps each step to the value of its first tick.
+    """
+    keep_ticks = set(keep_ticks)
+    events = set(start_ticks)
+    events.update(e + 1 for e in end_ticks)
+    if last_tick is not None:
+        events = {t for t in events if t <= last_tick}
+    timeline = build_timeline(events | keep_ticks, adapter)
+
+    inclusive_ticks = set(start_ticks) | set(end_ticks) | keep_ticks
+    reduction = TimelineReduction(len(inclusive_ticks), len(timeline[0]))
+    return timeline, reduction
@@ -0,0 +1,85 @@
+import unittest
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.constraints.capacity import (
+    add_need_capacity_cuts,
+    add_pattern_clique_cuts,
+)
+from frjmp.model.parameters.position_unit_model import PositionsUnitTypeDependency
+from frjmp.model.parameters.positions_configuration import PositionsConfiguration
+from frjmp.model.problem import Problem
+from frjmp.model.sets.job import Job
+from frjmp.model.sets.position import Position
+from tests.setup import BasicTestSetup, ProblemTestSetup
+
+
+class CapacityCutsProblem(Problem):
+    USE_CAPACITY_CUTS = True
+
+
+class TestCapacityCuts(BasicTestSetup):
+    def setUp(self):
+        super().setUp()
+        # Position 1 covers E and WP, Position 2 only WP.
+        self.positions = [
+            Position("Position 1", [self.need1, self.need2], capacity=1),
+            Position("Position 2", [self.need2], capacity=1),
+        ]
+        self.pc = PositionsConfiguration(positions=self.positions)
+        self.pud = PositionsUnitTypeDependency(self.unit_types, self.positions)
+        self.jobs = [
+            Job(self.unit1, self.phase1, self.adapter, self.date1, self.date2),
+            Job(self.unit2, self.phase2, self.adapter, self.date1, self.date2),
+        ]
+
+    def build(self):
+        # Variables only (no build_model): the cuts are tested on their own.
+        return Problem(self.jobs, self.pc, self.pud, self.adapter)
+
+    def test_need_capacity_cut(self):
+        # The WP job (j=1) in Position 1 at t=1 leaves no position for the E job.
+        for p_idx, expected in ((0, cp_model.INFEASIBLE), (1, cp_model.OPTIMAL)):
+            problem = self.build()
+            add_need_capacity_cuts(
+                problem.model,
+                problem.assigned_vars,
+                problem.positions,
+                problem.jobs,
+                problem.capacity_summary,
+            )
+            problem.model.Add(problem.assigned_vars[1][p_idx][1] == 1)
+            status = cp_model.CpSolver().Solve(problem.model)
+            self.assertEqual(status, expected)
+
+    def test_pattern_clique_cut(self):
+        problem = self.build()
+        add_pattern_clique_cuts(
+            problem.model,
+            problem.pattern_assigned_vars,
+            problem.positions,
+            problem.jobs,
+        )
+        # Both jobs in the Position 1 pattern at t=1.
+        problem.model.Add(problem.pattern_assigned_vars[0][1][0] == 1)
+        problem.model.Add(problem.pattern_assigned_vars[1][1][0] == 1)
+        status = cp_model.CpSolver().Solve(problem.model)
+        self.assertEqual(status, cp_model.INFEASIBLE)
+
+
+class TestCapacityCutsProblem(ProblemTestSetup):
+    def test_same_objective(self):
+        status, solver = self.problem.solve()
+        problem = CapacityCutsProblem(self.jobs, self.pc, self.pud, self.adapter)
+        cuts_status, cuts_solver = problem.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(cuts_status, cp_model.OPTIMAL)
+        self.assertEqual(solver.ObjectiveValue(), cuts_solver.ObjectiveValue())
+        self.assertGreater(
+            len(problem.model.Proto().constraints),
+            len(self.problem.model.Proto().constraints),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
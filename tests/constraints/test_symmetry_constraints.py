@@ -0,0 +1,48 @@
+import unittest
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.problem import Problem
+from tests.setup import ProblemTestSetup
+
+
+class TestSymmetryBreaking(ProblemTestSetup):
+    def solve(self, symmetry_breaking):
+        problem = Problem(self.jobs, self.pc, self.pud, self.adapter)
+        problem.USE_SYMMETRY_BREAKING = symmetry_breaking
+        status, solver = problem.solve()
+        return problem, status, solver
+
+    def test_detects_equivalent_units_and_positions(self):
+        problem, status, _ = self.solve(True)
+        self.assertEqual(status, cp_model.OPTIMAL)
+        # unit2 and unit3 have the same job. unit1 has a longer job.
+        self.assertEqual(
+            problem.symmetry_classes["units"], [[self.unit2.name, self.unit3.name]]
+        )
+        # Position 1 is the OUT gate (first default pattern) so it is not interchangeable.
+        self.assertEqual(
+            problem.symmetry_classes["positions"],
+            [["Position 2", "Position 3", "Position 4"]],
+        )
+
+    def test_optimal_objective_unchanged(self):
+        _, status, solver = self.solve(False)
+        _, status_sym, solver_sym = self.solve(True)
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(status_sym, cp_model.OPTIMAL)
+        self.assertEqual(solver.ObjectiveValue(), solver_sym.ObjectiveValue())
+
+    def test_fixed_entities_are_excluded(self):
+        self.problem.USE_SYMMETRY_BREAKING = True
+        self.problem.add_fixed_pattern_assignment(2, 1, 2)
+        status, _ = self.problem.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(self.problem.symmetry_classes["units"], [])
+        self.assertEqual(
+            self.problem.symmetry_classes["positions"], [["Position 2", "Position 4"]]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
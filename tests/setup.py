@@ -1,5 +1,6 @@
+import random
 import unittest
-from datetime import date
+from datetime import date, timedelta
 
 from frjmp.model.adapter import DailyAdapter
 from frjmp.model.problem import Problem
@@ -65,3 +66,38 @@ class ProblemTestSetup(BasicTestSetup):
         self.t_init = self.date1
         self.adapter = DailyAdapter(self.t_init)
         self.problem = Problem(self.jobs, self.pc, self.pud, self.adapter)
+
+    def random_problem(self, n_units=6, jobs_per_unit=3, n_positions=8, seed=3):
+        """Instance whose optimality proof takes longer than its first solution."""
+        return Problem(
+            **self.random_problem_args(n_units, jobs_per_unit, n_positions, seed)
+        )
+
+    def random_problem_args(self, n_units=6, jobs_per_unit=3, n_positions=8, seed=3):
+        """Problem keyword arguments of random_problem."""
+        rnd = random.Random(seed)
+        needs = [self.need1, self.need2]
+        phases = [self.phase1, self.phase2]
+        positions = [
+            Position(f"P{i}", needs if i % 3 else [needs[0]], 1)
+            for i in range(n_positions)
+        ]
+        jobs = []
+        for u in range(n_units):
+            unit = Unit(f"U{u}", self.unit_model)
+            t = rnd.randint(0, 10)
+            for _ in range(jobs_per_unit):
+                d = rnd.randint(3, 30)
+                start = self.date1 + timedelta(days=t)
+                end = self.date1 + timedelta(days=t + d)
+                jobs.append(Job(unit, rnd.choice(phases), self.adapter, start, end))
+                t += d + 1
+        self.unit_model.allowed_patterns = []
+        pc = PositionsConfiguration(positions)
+        pud = PositionsUnitTypeDependency(self.unit_types, positions)
+        return dict(
+            jobs=jobs,
+            positions_configuration=pc,
+            position_unittype_dependency=pud,
+            time_adapter=self.adapter,
+        )
@@ -0,0 +1,106 @@
+import unittest
+from datetime import timedelta
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.adapter import DailyAdapter
+from frjmp.model.aggregation import PositionAggregation
+from frjmp.model.problem import Problem
+from frjmp.model.solution import Solution
+from tests.setup import ProblemTestSetup
+
+
+class TestPositionAggregation(ProblemTestSetup):
+    def test_pools_interchangeable_positions(self):
+        aggregation = PositionAggregation(self.problem)
+        # Position 1 is the OUT gate (first default pattern) so it is not pooled.
+        self.assertEqual(
+            aggregation.classes, [["Position 2", "Position 3", "Position 4"]]
+        )
+        pooled = aggregation.pooled
+        self.assertEqual(
+            [(p.name, p.capacity) for p in pooled.positions],
+            [("Position 1", 1), ("Position 2/Position 3/Position 4", 3)],
+        )
+        self.assertEqual(
+            len(pooled.unit_types[0].allowed_patterns),
+            2,
+        )
+
+    def test_same_objective_and_concrete_solution(self):
+        status, solver = self.problem.solve()
+
+        problem = Problem(self.jobs, self.pc, self.pud, self.adapter)
+        problem.USE_POSITION_AGGREGATION = True
+        status_agg, solver_agg = problem.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(status_agg, cp_model.OPTIMAL)
+        self.assertEqual(solver.ObjectiveValue(), solver_agg.ObjectiveValue())
+        self.assertEqual(
+            problem.aggregation_solver.ObjectiveValue(), solver_agg.ObjectiveValue()
+        )
+
+        # The plan is on the concrete positions and respects their capacity.
+        solution = Solution(problem, solver_agg, status_agg)
+        per_slot = solution.assignments.groupby(["position_name", "t_idx"]).size()
+        self.assertTrue((per_slot <= 1).all())
+
+    def test_concrete_solve_gets_the_remaining_time(self):
+        problem = Problem(self.jobs, self.pc, self.pud, self.adapter)
+        problem.USE_POSITION_AGGREGATION = True
+        problem.SOLVERTIMELIMIT = 30
+        problem.DETERMINISTICTIMELIMIT = 20
+        status, solver = problem.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        parameters = solver.parameters
+        self.assertLess(parameters.max_time_in_seconds, 30)
+        self.assertLessEqual(
+            parameters.max_time_in_seconds, 30 - problem.aggregation_solver.WallTime()
+        )
+        self.assertEqual(parameters.max_deterministic_time, 20)
+        self.assertTrue(parameters.fix_variables_to_their_hinted_value)
+
+    def test_disaggregate_keeps_units_in_place(self):
+        aggregation = PositionAggregation(self.problem)
+        pooled = aggregation.pooled
+        pool = pooled.positions_configuration.index_map[
+            "Position 2/Position 3/Position 4"
+        ]
+        # Every job in the pool at every time step.
+        patterns = {
+            j_idx: {t_idx: pool for t_idx in t_map}
+            for j_idx, t_map in pooled.pattern_assigned_vars.items()
+        }
+        plan = aggregation.disaggregate(patterns)
+        for j_idx, t_map in plan.items():
+            self.assertEqual(len(set(t_map.values())), 1)
+        first = {j_idx: min(t_map.items())[1] for j_idx, t_map in plan.items()}
+        self.assertEqual(sorted(first.values()), [1, 2, 3])
+
+    def test_fixed_positions_are_not_pooled(self):
+        self.problem.add_fixed_pattern_assignment(2, 1, 2)
+        aggregation = PositionAggregation(self.problem)
+        self.assertEqual(aggregation.classes, [["Position 2", "Position 4"]])
+
+        self.problem.USE_POSITION_AGGREGATION = True
+        status, solver = self.problem.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(solver.Value(self.problem.pattern_assigned_vars[2][1][2]), 1)
+
+    def test_initial_conditions_keep_concrete_position(self):
+        adapter = DailyAdapter(self.date1 + timedelta(days=1))
+        problem = Problem(
+            self.jobs,
+            self.pc,
+            self.pud,
+            adapter,
+            initial_conditions={"assignments": {self.unit1: [self.position3]}},
+        )
+        problem.USE_POSITION_AGGREGATION = True
+        status, solver = problem.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(solver.Value(problem.pattern_assigned_vars[0][0][2]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.problem import Problem
+from tests.setup import ProblemTestSetup
+
+
+class QuietProblem(Problem):
+    PRINT_SOLUTIONS = False
+
+
+class TestSolveAsync(ProblemTestSetup):
+    def test_progress_on_loop_thread(self):
+        problem = QuietProblem(self.jobs, self.pc, self.pud, self.adapter)
+        events = []
+
+        def on_progress(record):
+            events.append((record, threading.get_ident()))
+
+        async def main():
+            result = await problem.solve_async(on_progress=on_progress)
+            await asyncio.sleep(0)  # Let the last events run.
+            return result
+
+        status, solver = asyncio.run(main())
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertGreater(len(events), 0)
+        self.assertEqual(events[-1][0].objective, solver.ObjectiveValue())
+        self.assertEqual({ident for _, ident in events}, {threading.get_ident()})
+
+    def test_concurrent_solves_do_not_block_the_loop(self):
+        problems = [self.random_problem(seed=seed) for seed in (1, 2)]
+        for problem in problems:
+            problem.SOLVERTIMELIMIT = 2
+            problem.PRINT_SOLUTIONS = False
+
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            start = time.time()
+            results = await asyncio.gather(*(p.solve_async() for p in problems))
+            elapsed = time.time() - start
+            task.cancel()
+            return results, ticks, elapsed
+
+        results, ticks, elapsed = asyncio.run(main())
+        for status, _ in results:
+            self.assertIn(status, (cp_model.OPTIMAL, cp_model.FEASIBLE))
+        # The loop kept running while the models were built and solved.
+        self.assertGreater(ticks, elapsed / 0.01 / 4)
+
+    def test_cancel_stops_search(self):
+        problem = self.random_problem()
+        problem.PRINT_SOLUTIONS = False
+
+        async def main():
+            first = asyncio.Event()
+            task = asyncio.create_task(
+                problem.solve_async(on_progress=lambda record: first.set())
+            )
+            await first.wait()
+            start = time.time()
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            return time.time() - start
+
+        self.assertLess(asyncio.run(main()), 2)
+        self.assertEqual(problem._running_solvers, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from datetime import timedelta
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.adapter import DailyAdapter
+from frjmp.model.bounds import compute_movement_lower_bound
+from frjmp.model.parameters.position_unit_model import PositionsUnitTypeDependency
+from frjmp.model.parameters.positions_configuration import PositionsConfiguration
+from frjmp.model.problem import Problem
+from frjmp.model.sets.job import Job
+from frjmp.model.sets.position import Position
+from frjmp.model.solution import Solution
+from tests.setup import ProblemTestSetup
+
+
+class TestMovementLowerBound(ProblemTestSetup):
+    def test_arrivals_and_departures(self):
+        bound = compute_movement_lower_bound(self.problem)
+        # Three units enter after t0; unit2 and unit3 leave before the last step.
+        self.assertEqual((bound.arrivals, bound.departures, bound.changes), (3, 2, 0))
+        self.assertEqual(bound.per_unit, {"MSN 001": 1, "MSN 002": 2, "MSN 003": 2})
+        self.assertEqual(bound.total, 5)
+
+    def test_reported_and_reached(self):
+        status, solver = self.problem.solve()
+        solution = Solution(self.problem, solver, status)
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(solution.metrics.lower_bound, 5)
+        self.assertEqual(solution.metrics.objective_value, 5)
+
+    def test_pattern_changes(self):
+        # E and WP can share Position 1, H has its own position only.
+        self.unit_model.allowed_patterns = []
+        positions = [
+            Position("Position 1", [self.need1, self.need2]),
+            Position("Position 2", [self.need1]),
+            Position("Position 3", [self.need2]),
+            Position("Position 4", [self.need3]),
+        ]
+        pc = PositionsConfiguration(positions=positions)
+        pud = PositionsUnitTypeDependency(self.unit_types, positions)
+        adapter = DailyAdapter(self.date1 + timedelta(days=1))
+        days = [self.date1 + timedelta(days=n) for n in range(10)]
+        jobs = [
+            Job(self.unit1, self.phase1, adapter, days[0], days[3]),
+            Job(self.unit1, self.phase2, adapter, days[4], days[6]),
+            Job(self.unit1, self.phase4, adapter, days[7], days[9]),
+        ]
+        problem = Problem(jobs, pc, pud, adapter)
+        self.assertEqual(compute_movement_lower_bound(problem).changes, 1)
+
+        # Starting in Position 2 the unit has to leave it for the WP job as well.
+        problem = Problem(
+            jobs,
+            pc,
+            pud,
+            adapter,
+            initial_conditions={"assignments": {self.unit1: [positions[1]]}},
+        )
+        bound = compute_movement_lower_bound(problem)
+        self.assertEqual((bound.arrivals, bound.departures, bound.changes), (0, 0, 2))
+        status, solver = problem.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(solver.ObjectiveValue(), bound.total)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import dataclasses
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from frjmp.model import checkpoint as checkpoint_module
+from frjmp.model.checkpoint import Checkpoint, Checkpointer, resume
+from tests.setup import ProblemTestSetup
+
+
+class TestCheckpoint(ProblemTestSetup):
+    def setUp(self):
+        super().setUp()
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "plan.npz")
+        self.problem.PRINT_SOLUTIONS = False
+        self.problem.SOLVERTIMELIMIT = 60
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def solve_with_checkpoints(self):
+        self.problem.checkpointer = Checkpointer(self.path, interval=30)
+        status, solver = self.problem.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        return solver
+
+    def test_solve_writes_the_incumbent(self):
+        solver = self.solve_with_checkpoints()
+        self.assertGreaterEqual(self.problem.checkpointer.written, 1)
+
+        checkpoint = Checkpoint.load(self.path)
+        self.assertEqual(checkpoint.objective, 5)
+        self.assertEqual(checkpoint.pattern_plan(), self.problem.read_patterns(solver))
+        self.assertEqual(checkpoint.patterns.dtype, np.int16)
+        self.assertEqual(checkpoint.patterns.shape, (3, self.problem.num_time_steps))
+        self.assertEqual(checkpoint.time_limit, 60)
+        self.assertGreater(checkpoint.elapsed, 0)
+        self.assertEqual(checkpoint.spec.properties["SOLVERTIMELIMIT"], 60)
+
+    def test_resume_continues_with_the_remaining_time(self):
+        self.solve_with_checkpoints()
+        killed = dataclasses.replace(Checkpoint.load(self.path), elapsed=50.0)
+        killed.save(self.path)
+
+        problem, status, solver = resume(self.path)
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(solver.ObjectiveValue(), 5)
+        self.assertLessEqual(problem.SOLVERTIMELIMIT, 10)
+        # The incumbent is hinted as a full solution.
+        hint = problem.model.Proto().solution_hint
+        self.assertEqual(len(hint.vars), len(problem.model.Proto().variables))
+
+        checkpoint = Checkpoint.load(self.path)
+        self.assertEqual(checkpoint.time_limit, 60)
+        self.assertGreater(checkpoint.elapsed, 50)
+        self.assertEqual(checkpoint.objective, 5)
+
+    def test_resume_when_the_hints_can_not_be_completed(self):
+        self.solve_with_checkpoints()
+        checkpoint = Checkpoint.load(self.path)
+        # Every job in the same capacity 1 position: no solution has these patterns.
+        patterns = np.where(checkpoint.patterns >= 0, 1, -1).astype(np.int16)
+        dataclasses.replace(checkpoint, patterns=patterns, elapsed=50.0).save(self.path)
+
+        with mock.patch.object(
+            checkpoint_module,
+            "_complete_hints",
+            wraps=checkpoint_module._complete_hints,
+        ) as complete_hints:
+            problem, status, solver = resume(self.path)
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(solver.ObjectiveValue(), 5)
+        # The completion solve gets a tenth of the 10 s left, the resumed solve the rest.
+        self.assertEqual(complete_hints.call_args.args[1], 1)
+        self.assertGreater(problem.SOLVERTIMELIMIT, 8.9)
+        hint = problem.model.Proto().solution_hint
+        self.assertLess(len(hint.vars), len(problem.model.Proto().variables))
+
+    def test_time_is_recorded_until_a_solution_is_found(self):
+        self.solve_with_checkpoints()
+        seed = Checkpoint.load(self.path)
+        self.problem.build_model()
+        checkpointer = Checkpointer(self.path, interval=0.01, checkpoint=seed)
+        with checkpointer.running(self.problem):
+            time.sleep(0.1)
+        self.assertGreaterEqual(checkpointer.written, 2)
+        checkpoint = Checkpoint.load(self.path)
+        self.assertGreaterEqual(checkpoint.elapsed, seed.elapsed + 0.1)
+        self.assertEqual(checkpoint.pattern_plan(), seed.pattern_plan())
+
+    def test_invalid_checkpoints_raise(self):
+        self.solve_with_checkpoints()
+        checkpoint = Checkpoint.load(self.path)
+        dataclasses.replace(checkpoint, elapsed=60.0).save(self.path)
+        with self.assertRaises(ValueError):
+            resume(self.path)
+
+        dataclasses.replace(checkpoint, patterns=checkpoint.patterns[:2]).save(
+            self.path
+        )
+        with self.assertRaises(ValueError):
+            resume(self.path)
+
+    def test_interval_engine_raises(self):
+        self.problem.MODEL_ENGINE = "interval"
+        self.problem.build_variables()
+        self.problem.checkpointer = Checkpointer(self.path)
+        with self.assertRaises(ValueError):
+            self.problem.solve()
+
+
+if __name__ == "__main__":
+    unittest.main()
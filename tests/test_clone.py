@@ -0,0 +1,72 @@
+import unittest
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.problem import Problem
+from tests.setup import ProblemTestSetup
+
+
+class TestProblemClone(ProblemTestSetup):
+    def setUp(self):
+        super().setUp()
+        self.problem.PRINT_SOLUTIONS = False
+        self.problem.build_model()
+        self.constraints = len(self.problem.model.Proto().constraints)
+
+    def test_clone_has_its_own_model(self):
+        clone = self.problem.clone()
+        self.assertIsNot(clone.model, self.problem.model)
+        self.assertEqual(clone.model.Proto(), self.problem.model.Proto())
+        var = clone.assigned_vars[0][0][1]
+        self.assertEqual(var.Index(), self.problem.assigned_vars[0][0][1].Index())
+        self.assertEqual(clone.model.GetIntVarFromProtoIndex(var.Index()), var)
+
+        status, solver = clone.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(solver.ObjectiveValue(), 5)
+
+    def test_scenario_constraints_leave_the_base_untouched(self):
+        one_closed = self.problem.clone()
+        one_closed.close_position("Position 4")
+        # 3 units at the same time and only 2 open positions.
+        two_closed = self.problem.clone()
+        two_closed.add_capacity_limit(["Position 3", "Position 4"], 0)
+
+        self.assertEqual(one_closed.solve()[0], cp_model.OPTIMAL)
+        self.assertEqual(two_closed.solve()[0], cp_model.INFEASIBLE)
+        self.assertEqual(len(self.problem.model.Proto().constraints), self.constraints)
+        status, solver = self.problem.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(solver.ObjectiveValue(), 5)
+
+    def test_fixed_values_after_build(self):
+        """add_fixed_* on a built problem constrains its model right away."""
+        clone = self.problem.clone()
+        clone.add_fixed_pattern_assignment(0, 1, 2)
+        status, solver = clone.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(clone.read_patterns(solver)[0][1], 2)
+        self.assertEqual(self.problem.fixed_variables, [])
+
+    def test_symmetry_broken_models_refuse_scenario_constraints(self):
+        problem = Problem(self.jobs, self.pc, self.pud, self.adapter)
+        problem.USE_SYMMETRY_BREAKING = True
+        problem.add_fixed_pattern_assignment(0, 1, 2)  # Before the build: allowed.
+        problem.build_model()
+        ordered = problem.symmetry_classes["positions"][0]
+        clone = problem.clone()
+        with self.assertRaises(ValueError):
+            clone.close_position(ordered[0])
+        with self.assertRaises(ValueError):
+            clone.add_capacity_limit(ordered[:2], 1)
+        with self.assertRaises(ValueError):
+            clone.add_fixed_pattern_assignment(1, 1, 1)
+        self.assertEqual(clone.model.Proto(), problem.model.Proto())
+
+    def test_unknown_position_raises(self):
+        with self.assertRaises(ValueError):
+            self.problem.clone().close_position("Position 99")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.heuristic import build_greedy_plan, plan_unit_movements
+from tests.setup import ProblemTestSetup
+
+
+class TestGreedyPlan(ProblemTestSetup):
+    def test_plan_is_complete_and_respects_capacity(self):
+        plan = build_greedy_plan(self.problem)
+        self.assertTrue(plan.complete)
+
+        for t_idx in range(self.problem.num_time_steps):
+            used = [t_map[t_idx] for t_map in plan.patterns.values() if t_idx in t_map]
+            # Single position patterns with capacity 1: no pattern used twice.
+            self.assertEqual(len(used), len(set(used)))
+
+        # Units are kept in place: the only movements are entering and leaving.
+        self.assertEqual(plan.movements, 5)
+        moves = plan_unit_movements(self.problem, plan.patterns)
+        self.assertEqual(moves[self.unit1.name], [0])
+
+        df = plan.to_dataframe(self.problem)
+        self.assertEqual(len(df), sum(len(t) for t in plan.patterns.values()))
+
+    def test_plan_follows_fixed_variables(self):
+        t_idx = 1
+        self.problem.add_fixed_pattern_assignment(1, t_idx, 0)
+        self.problem.add_fixed_assignment(0, 3, t_idx)
+
+        plan = build_greedy_plan(self.problem)
+        self.assertEqual(plan.patterns[1][t_idx], 0)
+        self.assertEqual(plan.patterns[0][t_idx], 3)
+        self.assertNotEqual(plan.patterns[2][t_idx], 0)
+
+    def test_hint_keeps_optimum(self):
+        status, solver = self.problem.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(solver.ObjectiveValue(), self.problem.greedy_plan.movements)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+from datetime import timedelta
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.logger import MemorySink
+from frjmp.model.problem import Problem
+from frjmp.model.sets.job import Job
+from tests.setup import ProblemTestSetup
+
+
+class TestIncrementalUpdates(ProblemTestSetup):
+    def setUp(self):
+        super().setUp()
+        self.problem.PRINT_SOLUTIONS = False
+        self.problem.build_model()
+
+    def assertSolvesLikeAFreshProblem(self, problem):
+        fresh = Problem(problem.source_jobs, self.pc, self.pud, self.adapter)
+        fresh.PRINT_SOLUTIONS = False
+        status, solver = problem.solve()
+        fresh_status, fresh_solver = fresh.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(fresh_status, cp_model.OPTIMAL)
+        self.assertEqual(solver.ObjectiveValue(), fresh_solver.ObjectiveValue())
+        self.assertEqual(
+            problem.movement_lower_bound.total, fresh.movement_lower_bound.total
+        )
+
+    def test_updates_in_place(self):
+        problem = self.problem
+        job4 = Job(self.unit4, self.phase1, self.adapter, self.date1, self.date2)
+        self.assertTrue(problem.add_job(job4))
+        self.assertEqual(len(problem.jobs), 4)
+        self.assertEqual(problem.num_time_steps, 4)
+        self.assertSolvesLikeAFreshProblem(problem)
+
+        self.assertTrue(problem.change_job_end(self.jobs[2], self.date3))
+        self.assertEqual(problem.source_jobs[2].end, self.date3)
+        self.assertEqual(self.jobs[2].end, self.date2)  # The caller's Job is kept.
+        self.assertSolvesLikeAFreshProblem(problem)
+
+        self.assertTrue(problem.remove_job(1))
+        self.assertNotIn(self.unit2.name, problem.unit_movement_vars)
+        self.assertSolvesLikeAFreshProblem(problem)
+        self.assertEqual(len(self.jobs), 3)
+
+    def test_clone_updates_leave_the_base_untouched(self):
+        model = self.problem.model.Proto().SerializeToString()
+        clone = self.problem.clone()
+        self.assertTrue(clone.remove_job(1))
+        self.assertEqual(len(self.problem.jobs), 3)
+        self.assertEqual(self.problem.model.Proto().SerializeToString(), model)
+        status, solver = self.problem.solve()
+        self.assertEqual(solver.ObjectiveValue(), 5)
+
+    def test_timeline_changes_rebuild(self):
+        problem = self.problem
+        problem.SOLVERTIMELIMIT = 30
+        sink = problem.solution_sink = MemorySink()
+        # A new end tick (that also moves the horizon end).
+        self.assertFalse(problem.change_job_end(0, self.date4))
+        self.assertEqual(problem.num_time_steps, 4)
+        self.assertEqual(problem.t_last_tick, self.adapter.to_tick(self.date4))
+        self.assertTrue(problem.model_built)
+        self.assertEqual(problem.SOLVERTIMELIMIT, 30)
+        self.assertIs(problem.solution_sink, sink)
+        self.assertSolvesLikeAFreshProblem(problem)
+
+    def test_unused_time_steps_rebuild(self):
+        """Removing the only job ending at a tick removes its time step."""
+        problem = self.problem
+        self.assertTrue(problem.change_job_end(2, self.date3))
+        self.assertFalse(problem.remove_job(1))
+        self.assertEqual(problem.num_time_steps, 3)
+        self.assertSolvesLikeAFreshProblem(problem)
+
+    def test_unused_time_step_in_a_unit_gap(self):
+        """A kept step between two jobs of a unit would count a leave and a return."""
+
+        def job(unit, start, end):
+            return Job(
+                unit,
+                self.phase1,
+                self.adapter,
+                self.date1 + timedelta(days=start),
+                self.date1 + timedelta(days=end),
+            )
+
+        jobs = [job(self.unit1, 0, 5), job(self.unit1, 8, 40), job(self.unit2, 6, 7)]
+        jobs += [job(self.unit3, s, s + 1) for s in (1, 3, 10, 12, 14, 16, 18, 20)]
+        problem = Problem(jobs, self.pc, self.pud, self.adapter)
+        problem.PRINT_SOLUTIONS = False
+        problem.build_model()
+        self.assertFalse(problem.remove_job(2))
+        self.assertSolvesLikeAFreshProblem(problem)
+        status, solver = problem.solve()
+        self.assertEqual(solver.ObjectiveValue(), 5)
+
+    def test_fixed_values(self):
+        problem = self.problem
+        problem.add_fixed_pattern_assignment(0, 1, 2)
+        self.assertTrue(problem.remove_job(1))
+        status, solver = problem.solve()
+        self.assertEqual(problem.read_patterns(solver)[0][1], 2)
+
+        # A touched job with a fixed value needs a rebuild, which drops the value.
+        self.assertFalse(problem.change_job_end(0, self.date2))
+        self.assertEqual(problem.fixed_variables, [])
+
+    def test_global_families_rebuild(self):
+        problem = Problem(self.jobs, self.pc, self.pud, self.adapter)
+        problem.PRINT_SOLUTIONS = False
+        problem.USE_SYMMETRY_BREAKING = True
+        job4 = Job(self.unit4, self.phase1, self.adapter, self.date1, self.date2)
+        self.assertFalse(problem.add_job(job4))  # Not built.
+        problem.build_model()
+        self.assertFalse(problem.remove_job(job4))
+        self.assertTrue(problem.USE_SYMMETRY_BREAKING)
+        self.assertEqual(problem.symmetry_classes["units"], [["MSN 002", "MSN 003"]])
+
+    def test_invalid_updates_raise(self):
+        overlapping = Job(self.unit1, self.phase1, self.adapter, self.date2, self.date3)
+        with self.assertRaises(ValueError):
+            self.problem.add_job(overlapping)
+        with self.assertRaises(ValueError):
+            self.problem.remove_job(overlapping)
+        with self.assertRaises(ValueError):
+            self.problem.remove_job(3)
+        self.assertEqual(len(self.problem.source_jobs), 3)
+        status, solver = self.problem.solve()
+        self.assertEqual(solver.ObjectiveValue(), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,17 @@
 from datetime import timedelta
 
+from ortools.sat.python import cp_model
+
 from frjmp.model.adapter import DailyAdapter
 from tests.setup import ProblemTestSetup
 from frjmp.model.problem import Problem
 from unittest.mock import MagicMock
 
 
+class IntervalProblem(Problem):
+    MODEL_ENGINE = "interval"
+
+
 class TestInitialConditions(ProblemTestSetup):
     def setUp(self):
         super().setUp()
@@ -33,3 +39,42 @@ class TestInitialConditions(ProblemTestSetup):
         with self.assertRaises(ValueError) as context:
             self.problem2._apply_initial_conditions_as_fixed_patterns()
         self.assertIn("No active job found", str(context.exception))
+
+    def test_pattern_index(self):
+        problem = self.problem2
+        self.assertEqual(problem.pattern_index(self.unit_model, [self.position3]), 2)
+        self.assertEqual(problem.pattern_index(self.unit_model, ["Position 4"]), 3)
+        self.assertIsNone(
+            problem.pattern_index(self.unit_model, [self.position1, self.position2])
+        )
+
+
+class TestFinalConditions(ProblemTestSetup):
+    def build(self, problem_class=Problem):
+        return problem_class(
+            self.jobs,
+            self.pc,
+            self.pud,
+            self.adapter,
+            final_conditions={"assignments": {self.unit1: [self.position4]}},
+        )
+
+    def test_fixed_at_last_step(self):
+        for problem_class in (Problem, IntervalProblem):
+            problem = self.build(problem_class)
+            status, solver = problem.solve()
+            self.assertEqual(status, cp_model.OPTIMAL)
+            last_idx = problem.num_time_steps - 1
+            self.assertEqual(problem.read_patterns(solver)[0][last_idx], 3)
+
+    def test_raises_job_not_found_at_t_last(self):
+        problem = Problem(
+            self.jobs,
+            self.pc,
+            self.pud,
+            self.adapter,
+            final_conditions={"assignments": {self.unit2: [self.position4]}},
+        )
+        with self.assertRaises(ValueError) as context:
+            problem.build_model()
+        self.assertIn("No active job found", str(context.exception))
@@ -0,0 +1,100 @@
+import unittest
+from datetime import timedelta
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.adapter import DailyAdapter
+from frjmp.model.parameters.position_unit_model import PositionsUnitTypeDependency
+from frjmp.model.parameters.positions_configuration import PositionsConfiguration
+from frjmp.model.problem import Problem
+from frjmp.model.sets.job import Job
+from frjmp.model.sets.position import Position
+from frjmp.model.solution import Solution
+from tests.setup import ProblemTestSetup
+
+
+class IntervalProblem(Problem):
+    MODEL_ENGINE = "interval"
+
+
+class TestIntervalEngine(ProblemTestSetup):
+    def solve_both(self, pc, pud, jobs=None, **kwargs):
+        objectives, solutions = [], []
+        for problem_class in (Problem, IntervalProblem):
+            problem = problem_class(jobs or self.jobs, pc, pud, self.adapter, **kwargs)
+            status, solver = problem.solve()
+            self.assertEqual(status, cp_model.OPTIMAL)
+            objectives.append(solver.ObjectiveValue())
+            solutions.append(Solution(problem, solver, status))
+        self.assertEqual(objectives[0], objectives[1])
+        return solutions[1]
+
+    def test_same_objective_and_solution_frames(self):
+        solution = self.solve_both(self.pc, self.pud)
+        self.assertEqual(solution.metrics.objective_value, len(solution.movements))
+        self.assertEqual(
+            list(solution.assignments.columns),
+            [
+                "job_idx",
+                "job_unit_name",
+                "job_phase",
+                "position_idx",
+                "position_name",
+                "t_idx",
+                "time_value",
+            ],
+        )
+        per_slot = solution.assignments.groupby(["position_name", "t_idx"]).size()
+        self.assertTrue((per_slot <= 1).all())
+        # Every job has a pattern at every time step it is active.
+        self.assertEqual(
+            len(solution.patterns),
+            sum(len(t_map) for t_map in solution.plan.values()),
+        )
+
+    def test_triggers_and_shared_positions(self):
+        hangar = Position("Hangar", [self.need1], capacity=2)
+        # The base setup Problem already generated the default patterns.
+        self.unit_model.allowed_patterns = []
+        positions = [self.position1, self.position2, self.position3, hangar]
+        pc = PositionsConfiguration(positions=positions)
+        pc.add_trigger(self.position2, self.position1, {self.position3})
+        pud = PositionsUnitTypeDependency(self.unit_types, positions)
+        job4 = Job(self.unit4, self.phase1, self.adapter, self.date2, self.date3)
+        solution = self.solve_both(pc, pud, jobs=self.jobs + [job4])
+        per_slot = solution.assignments.groupby(["position_name", "t_idx"]).size()
+        self.assertTrue((per_slot <= 2).all())
+
+    def test_initial_conditions(self):
+        self.adapter = DailyAdapter(self.date1 + timedelta(days=1))
+        solution = self.solve_both(
+            self.pc,
+            self.pud,
+            initial_conditions={"assignments": {self.unit1: [self.position3]}},
+        )
+        first = solution.assignments.query("job_idx == 0 and t_idx == 0")
+        self.assertEqual(list(first["position_name"]), ["Position 3"])
+
+    def test_time_indexed_options_raise(self):
+        options = [
+            ("USE_SYMMETRY_BREAKING", True),
+            ("USE_CAPACITY_CUTS", True),
+            ("SEARCH_STRATEGY", "chronological"),
+        ]
+        for name, value in options:
+            problem = IntervalProblem(self.jobs, self.pc, self.pud, self.adapter)
+            setattr(problem, name, value)
+            with self.assertRaises(ValueError):
+                problem.build_model()
+            self.assertFalse(problem.model_built)
+
+    def test_unknown_engine(self):
+        class SparseProblem(Problem):
+            MODEL_ENGINE = "sparse"
+
+        with self.assertRaises(ValueError):
+            SparseProblem(self.jobs, self.pc, self.pud, self.adapter)
+
+
+if __name__ == "__main__":
+    unittest.main()
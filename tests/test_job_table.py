@@ -0,0 +1,65 @@
+import unittest
+from datetime import timedelta
+
+from frjmp.model.adapter import DailyAdapter
+from frjmp.model.job_table import JobTable, JobView
+from frjmp.model.problem import Problem
+from frjmp.model.sets.job import Job
+from tests.setup import ProblemTestSetup
+
+
+class TestJobTable(ProblemTestSetup):
+    def test_trimmed_does_not_modify_jobs(self):
+        adapter = DailyAdapter(self.date2)
+        table = JobTable(self.jobs, adapter)
+        window = table.trimmed(adapter.to_tick(self.date2), adapter.to_tick(self.date2))
+
+        # All jobs overlap date2, job1 is the only one with both bounds clipped.
+        self.assertEqual(window.source_indices, [0, 1, 2])
+        self.assertEqual(window.start_ticks, [0, 0, 0])
+        self.assertEqual(window.end_ticks, [0, 0, 0])
+
+        views = window.views()
+        self.assertIsInstance(views[0], JobView)
+        self.assertIs(views[0].source, self.jobs[0])
+        self.assertIs(views[0].unit, self.unit1)
+        self.assertEqual(views[0].start, self.date2)
+        self.assertEqual(views[0].end, self.date2)
+        # Original jobs keep their values.
+        self.assertEqual(self.jobs[0].start, self.date1)
+        self.assertEqual(self.jobs[0].end, self.date3)
+
+    def test_active_row(self):
+        job4 = Job(
+            self.unit1, self.phase1, self.adapter, self.date3 + timedelta(1), self.date4
+        )
+        table = JobTable(self.jobs + [job4], self.adapter)
+        tick = self.adapter.to_tick
+        self.assertEqual(table.active_row("MSN 001", tick(self.date1)), 0)
+        self.assertEqual(table.active_row("MSN 001", tick(self.date3)), 0)
+        self.assertEqual(table.active_row("MSN 001", tick(self.date4)), 3)
+        self.assertEqual(table.active_row("MSN 002", tick(self.date2)), 1)
+        self.assertIsNone(table.active_row("MSN 002", tick(self.date3)))
+        self.assertIsNone(table.active_row("MSN 004", tick(self.date1)))
+
+    def test_problem_leaves_jobs_untouched(self):
+        """Several problems with different horizons can be built from the same job list."""
+        late_origin = DailyAdapter(self.date2 + timedelta(days=1))
+        problem_late = Problem(self.jobs, self.pc, self.pud, late_origin)
+        problem_short = Problem(self.jobs, self.pc, self.pud, self.adapter, self.date2)
+
+        self.assertEqual([j.start for j in self.jobs], [self.date1] * 3)
+        self.assertEqual(
+            [j.end for j in self.jobs], [self.date3, self.date2, self.date2]
+        )
+
+        self.assertEqual(len(problem_late.jobs), 3)
+        self.assertEqual(problem_late.jobs[0].start, self.date2)
+        self.assertEqual(problem_late.jobs[1].start, self.date2)
+        self.assertEqual(problem_short.jobs[0].end, self.date2)
+        self.assertIs(problem_short.jobs[1], self.jobs[1])  # Not trimmed, not wrapped.
+        self.assertEqual(problem_short.num_time_steps, 3)  # t0, date1 and date2.
+
+
+if __name__ == "__main__":
+    unittest.main()
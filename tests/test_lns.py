@@ -0,0 +1,88 @@
+import unittest
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.heuristic import build_greedy_plan
+from frjmp.model.lns import LargeNeighborhoodSearch
+from tests.setup import ProblemTestSetup
+
+
+class TestLargeNeighborhoodSearch(ProblemTestSetup):
+    def setUp(self):
+        super().setUp()
+        self.pc.add_trigger(self.position1, self.position2, {self.position3})
+        self.problem.build_model()
+        self.incumbent = build_greedy_plan(self.problem).patterns
+        self.lns = LargeNeighborhoodSearch(self.problem, neighbourhood_size=0.5)
+
+    def test_neighbourhoods(self):
+        window = self.lns._time_window(self.incumbent)
+        self.assertTrue(window)
+        self.assertTrue(window < set(self.lns.slots))
+
+        units = {
+            self.problem.jobs[j].unit.name
+            for j, _ in self.lns._unit_group(self.incumbent)
+        }
+        self.assertTrue(units)
+
+        # Trigger group: jobs using Position 1, 2 or 3 in the incumbent.
+        group = self.lns._trigger_group(self.incumbent)
+        for j_idx, t_idx in group:
+            self.assertIn(self.incumbent[j_idx][t_idx], (0, 1, 2))
+
+    def test_fixed_clone_keeps_base_model(self):
+        free = self.lns._time_window(self.incumbent)
+        clone = self.lns._fixed_clone(self.incumbent, free)
+
+        solver = cp_model.CpSolver()
+        status = solver.Solve(clone)
+        self.assertEqual(status, cp_model.OPTIMAL)
+        for j_idx, t_map in self.problem.pattern_assigned_vars.items():
+            for t_idx, k_map in t_map.items():
+                if (j_idx, t_idx) in free:
+                    continue
+                chosen = self.incumbent[j_idx][t_idx]
+                self.assertEqual(solver.Value(k_map[chosen]), 1)
+
+        # Domains of the base model are not modified.
+        base_vars = self.problem.model.Proto().variables
+        for t_map in self.problem.pattern_assigned_vars.values():
+            for k_map in t_map.values():
+                for var in k_map.values():
+                    self.assertEqual(list(base_vars[var.Index()].domain), [0, 1])
+
+    def test_run_stops_at_the_optimum(self):
+        result = self.lns.run(iterations=3, time_limit=10)
+        self.assertEqual(result.objective, 5)
+        self.assertEqual(result.history, [])
+        self.assertEqual(
+            list(result.stats["type"]), ["time_window", "unit_group", "trigger_group"]
+        )
+
+    def test_run(self):
+        problem = self.random_problem()
+        problem.add_pattern_hints({0: {1: 0}})
+        hints = problem.model.Proto().solution_hint.SerializeToString()
+        greedy = build_greedy_plan(problem).movements
+        lns = LargeNeighborhoodSearch(problem, neighbourhood_size=0.3)
+        # The initial solve gets no solution in time: the search starts from the greedy
+        # plan.
+        result = lns.run(
+            iterations=4,
+            time_limit=20,
+            neighbourhood_time_limit=2,
+            initial_time_limit=0.01,
+        )
+        history = result.history
+        self.assertGreater(len(history), 0)
+        objectives = [h["objective"] for h in history if h["objective"] is not None]
+        self.assertEqual(result.objective, min(objectives + [greedy]))
+        self.assertEqual(sum(h["gain"] for h in history), greedy - result.objective)
+        self.assertEqual(result.stats["attempts"].sum(), len(history))
+        self.assertEqual(list(result.stats["type"]), ["time_window", "unit_group"])
+        # The hints of the caller's model are restored.
+        self.assertEqual(problem.model.Proto().solution_hint.SerializeToString(), hints)
+
+if __name__ == "__main__":
+    unittest.main()
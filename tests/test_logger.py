@@ -0,0 +1,159 @@
+import io
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+
+from ortools.sat.python import cp_model
+
+from contextlib import redirect_stdout
+
+from frjmp.model.logger import CsvSink, IncrementalSolverLogger, JsonlSink, MemorySink
+from frjmp.model.problem import Problem
+from tests.setup import ProblemTestSetup
+
+
+def watchdogs():
+    """Watchdog and writer threads still alive."""
+    names = ("solver-inactivity-watchdog", "solver-log-writer")
+    return [t for t in threading.enumerate() if t.name in names]
+
+
+def coloring_model(n_nodes=70, n_colors=25, seed=0):
+    """Graph coloring: good colorings are found fast, proving optimality is slow."""
+    rnd = random.Random(seed)
+    model = cp_model.CpModel()
+    colors = [model.NewIntVar(0, n_colors - 1, f"c{i}") for i in range(n_nodes)]
+    for i in range(n_nodes):
+        for j in range(i + 1, n_nodes):
+            if rnd.random() < 0.5:
+                model.Add(colors[i] != colors[j])
+    objective = model.NewIntVar(0, n_colors, "objective")
+    model.AddMaxEquality(objective, colors)
+    model.Minimize(objective)
+    return model, objective
+
+
+class TestIncrementalSolverLogger(ProblemTestSetup):
+    def test_watchdog_joined_after_solves(self):
+        for _ in range(5):
+            problem = Problem(self.jobs, self.pc, self.pud, self.adapter)
+            status, _ = problem.solve()
+            self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(watchdogs(), [])
+
+    def test_inactivity_stop(self):
+        model, objective = coloring_model()
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = 30
+        start = time.time()
+        with IncrementalSolverLogger(objective, inactivity_timeout=0.3) as logger:
+            status = solver.Solve(model, logger)
+        self.assertEqual(status, cp_model.FEASIBLE)
+        self.assertTrue(logger.step_time_limit_reached)
+        self.assertLess(time.time() - start, 10)
+        self.assertGreater(logger.last_record.deterministic_time, 0)
+        # Measured on the solver clock, from the WallTime() of the last solution.
+        inactive = solver.WallTime() - logger.last_record.wall_time
+        self.assertGreater(inactive, 0.25)
+        self.assertLess(inactive, 1.3)
+        self.assertEqual(watchdogs(), [])
+
+    def test_sinks(self):
+        model, objective = coloring_model(n_nodes=30, n_colors=12)
+        with tempfile.TemporaryDirectory() as folder:
+            csv_path = os.path.join(folder, "logs.csv")
+            jsonl_path = os.path.join(folder, "logs.jsonl")
+            sinks = [MemorySink(), CsvSink(csv_path), JsonlSink(jsonl_path)]
+            loggers = []
+            for sink in sinks:
+                solver = cp_model.CpSolver()
+                solver.parameters.num_workers = 1
+                solver.parameters.random_seed = 1
+                logger = IncrementalSolverLogger(sink=sink, print_solutions=False)
+                with logger:
+                    solver.Solve(model, logger)
+                loggers.append(logger)
+                sink.close()  # The logger leaves given sinks open.
+
+            records = sinks[0].records
+            steps = [r.step for r in records]
+            self.assertEqual(steps, list(range(1, len(records) + 1)))
+            self.assertEqual(records[-1], loggers[0].last_record)
+            objectives = [r.objective for r in records]
+            self.assertEqual(objectives, sorted(objectives, reverse=True))
+            with open(csv_path) as f:
+                lines = f.read().splitlines()
+            self.assertEqual(lines[0], ",".join(CsvSink.HEADER))
+            self.assertEqual(len(lines) - 1, loggers[1].last_record.step)
+            with open(jsonl_path) as f:
+                rows = [json.loads(line) for line in f]
+            self.assertEqual(rows[-1]["objective"], loggers[2].last_record.objective)
+
+    def test_problem_sink_without_printing(self):
+        class QuietProblem(Problem):
+            PRINT_SOLUTIONS = False
+
+        problem = QuietProblem(self.jobs, self.pc, self.pud, self.adapter)
+        problem.solution_sink = MemorySink()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            status, solver = problem.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(output.getvalue(), "")
+        records = problem.solution_sink.records
+        self.assertEqual(records[-1].objective, solver.ObjectiveValue())
+
+    def test_stop_messages_without_printing(self):
+        problem = self.random_problem()
+        problem.PRINT_SOLUTIONS = False
+        # Any solve of less than 1 s reports the solver time limit as reached.
+        problem.SOLVERTIMELIMIT = 0.5
+        output = io.StringIO()
+        with redirect_stdout(output):
+            problem.solve()
+        self.assertEqual(output.getvalue(), "")
+
+    def test_sink_kept_open_between_solves(self):
+        problem = Problem(self.jobs, self.pc, self.pud, self.adapter)
+        problem.PRINT_SOLUTIONS = False
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "logs.csv")
+            with CsvSink(path) as sink:
+                problem.solution_sink = sink
+                steps = []
+                for _ in range(2):
+                    status, solver = problem.solve()
+                    self.assertEqual(status, cp_model.OPTIMAL)
+                    steps.append(problem.solver_logger.last_record.step)
+            with open(path) as f:
+                lines = f.read().splitlines()
+            self.assertEqual(len(lines) - 1, sum(steps))
+            self.assertEqual(float(lines[-1].split(",")[3]), solver.ObjectiveValue())
+
+    def test_sink_errors_raise(self):
+        class FailingSink(MemorySink):
+            def write(self, records):
+                raise OSError("disk full")
+
+        problem = Problem(self.jobs, self.pc, self.pud, self.adapter)
+        problem.PRINT_SOLUTIONS = False
+        problem.solution_sink = FailingSink()
+        with self.assertRaises(OSError):
+            problem.solve()
+        self.assertEqual(watchdogs(), [])
+
+    def test_no_watchdog_without_timeout(self):
+        logger = IncrementalSolverLogger(inactivity_timeout=None)
+        with logger:
+            names = [t.name for t in watchdogs()]
+            self.assertEqual(names, ["solver-log-writer"])
+        logger.stop()
+        self.assertEqual(watchdogs(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
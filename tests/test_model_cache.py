@@ -0,0 +1,105 @@
+import os
+import tempfile
+import time
+import unittest
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.cache import ModelCache
+from frjmp.model.problem import Problem
+from tests.setup import ProblemTestSetup
+
+
+class TestModelCache(ProblemTestSetup):
+    def setUp(self):
+        super().setUp()
+        self.folder = tempfile.TemporaryDirectory()
+        self.cache = ModelCache(self.folder.name)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def new_problem(self, **kwargs):
+        problem = Problem(self.jobs, self.pc, self.pud, self.adapter, **kwargs)
+        problem.PRINT_SOLUTIONS = False
+        problem.model_cache = self.cache
+        return problem
+
+    def test_hit_loads_the_built_model(self):
+        first = self.new_problem()
+        first.build_model()
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+        second = self.new_problem()
+        second.SOLVERTIMELIMIT = 30  # Solve-only properties do not change the key.
+        second.build_model()
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(second.model.Proto(), first.model.Proto())
+        self.assertEqual(
+            second.movement_lower_bound.total, first.movement_lower_bound.total
+        )
+        # The variable dicts refer to the loaded model.
+        var = second.pattern_assigned_vars[0][1][0]
+        self.assertEqual(second.model.GetIntVarFromProtoIndex(var.Index()), var)
+
+        status, solver = second.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(solver.ObjectiveValue(), 5)
+        self.assertEqual(set(second.read_patterns(solver)), {0, 1, 2})
+
+    def test_fixed_values_are_restored(self):
+        conditions = {"assignments": {self.unit1: [self.position1]}}
+        first = self.new_problem(final_conditions=conditions)
+        first.USE_SYMMETRY_BREAKING = True
+        first.build_model()
+        second = self.new_problem(final_conditions=conditions)
+        second.USE_SYMMETRY_BREAKING = True
+        second.build_model()
+
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(len(second.fixed_variables), len(first.fixed_variables))
+        self.assertEqual(str(second.fixed_reduction), str(first.fixed_reduction))
+        self.assertEqual(second.symmetry_classes, first.symmetry_classes)
+        status, solver = second.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        last = second.num_time_steps - 1
+        self.assertEqual(second.read_patterns(solver)[0][last], 0)
+
+    def test_model_properties_change_the_key(self):
+        self.new_problem().build_model()
+        problem = self.new_problem()
+        problem.USE_CAPACITY_CUTS = True
+        problem.build_model()
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+
+    def test_not_cached(self):
+        """Interval engine and models with constraints added before build_model."""
+        interval = self.new_problem()
+        interval.MODEL_ENGINE = "interval"
+        interval.build_variables()
+        self.assertIsNone(self.cache.key(interval))
+
+        problem = self.new_problem()
+        problem.model.Add(problem.unit_movement_vars[self.unit1.name][0] == 1)
+        self.assertIsNone(self.cache.key(problem))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        keys = []
+        for cuts in (False, True, False):
+            problem = self.new_problem()
+            problem.USE_CAPACITY_CUTS = cuts
+            problem.USE_MOVEMENT_LOWER_BOUND = len(keys) < 2
+            keys.append(self.cache.key(problem))
+            problem.build_model()
+            time.sleep(0.01)
+        self.new_problem().build_model()  # Hit: the first entry is used again.
+        self.assertEqual(self.cache.hits, 1)
+
+        self.cache.max_bytes = self.cache.size - 1
+        self.cache.evict()
+        remaining = {name[:-4] for name in os.listdir(self.folder.name)}
+        self.assertEqual(remaining, {keys[0], keys[2]})
+
+
+if __name__ == "__main__":
+    unittest.main()
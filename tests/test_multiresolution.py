@@ -0,0 +1,133 @@
+import io
+import time
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.adapter import DailyAdapter, ShiftAdapter, WeeklyAdapter
+from frjmp.model.logger import MemorySink
+from frjmp.model.multiresolution import CoarseToFineSolver
+from frjmp.model.parameters.position_unit_model import PositionsUnitTypeDependency
+from frjmp.model.parameters.positions_configuration import PositionsConfiguration
+from frjmp.model.problem import Problem
+from frjmp.model.sets.job import Job
+from frjmp.model.sets.position import Position
+from tests.setup import BasicTestSetup, ProblemTestSetup
+
+
+class TestCoarseToFine(BasicTestSetup):
+    def setUp(self):
+        super().setUp()
+        self.shift_adapter = ShiftAdapter((self.date1, "M"), ["M", "E", "N"])
+        self.positions = [
+            Position("Position 1", [self.need1, self.need2], capacity=1),
+            Position("Position 2", [self.need1], capacity=1),
+            Position("Position 3", [self.need2], capacity=1),
+        ]
+        self.pc = PositionsConfiguration(positions=self.positions)
+        self.pud = PositionsUnitTypeDependency(self.unit_types, self.positions)
+
+    def job(self, unit, phase, start, end):
+        ticks = self.shift_adapter.from_tick
+        return Job(unit, phase, self.shift_adapter, ticks(start), ticks(end))
+
+    def build(self, jobs):
+        problem = Problem(jobs, self.pc, self.pud, self.shift_adapter)
+        return CoarseToFineSolver(problem, DailyAdapter(self.date1), lambda v: v[0])
+
+    def test_coarse_jobs_do_not_overlap(self):
+        # Both jobs of unit1 share the second day.
+        driver = self.build(
+            [
+                self.job(self.unit1, self.phase1, 0, 4),
+                self.job(self.unit1, self.phase2, 5, 11),
+                self.job(self.unit2, self.phase2, 1, 2),
+            ]
+        )
+        coarse = driver.build_coarse_problem()
+        self.assertEqual(
+            [(repr(j), j.start, j.end) for j in coarse.jobs],
+            [
+                ("MSN 001-EDV", date(2025, 1, 25), date(2025, 1, 26)),
+                ("MSN 001-4Y", date(2025, 1, 27), date(2025, 1, 28)),
+                ("MSN 002-4Y", date(2025, 1, 25), date(2025, 1, 25)),
+            ],
+        )
+
+    def test_same_objective_as_fine_solve(self):
+        jobs = [
+            self.job(self.unit1, self.phase1, 0, 7),
+            self.job(self.unit1, self.phase2, 8, 20),
+            self.job(self.unit2, self.phase2, 2, 9),
+            self.job(self.unit2, self.phase1, 10, 16),
+            self.job(self.unit3, self.phase3, 12, 20),
+        ]
+        status, solver = Problem(jobs, self.pc, self.pud, self.shift_adapter).solve()
+        driver = self.build(jobs)
+        c2f_status, c2f_solver = driver.solve(coarse_time_limit=5)
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(c2f_status, cp_model.OPTIMAL)
+        self.assertEqual(driver.coarse_status, cp_model.OPTIMAL)
+        self.assertEqual(solver.ObjectiveValue(), c2f_solver.ObjectiveValue())
+        self.assertTrue(driver.projected_plan)
+
+        # Every projected pattern is available to its job at that time step.
+        problem = driver.problem
+        for j_idx, t_map in driver.projected_plan.items():
+            for t_idx, k_idx in t_map.items():
+                self.assertIn(k_idx, problem.pattern_assigned_vars[j_idx][t_idx])
+
+    def test_falls_back_when_coarse_problem_is_infeasible(self):
+        # Three units needing WP (2 positions) in different shifts of the same day.
+        driver = self.build(
+            [
+                self.job(self.unit1, self.phase2, 0, 0),
+                self.job(self.unit2, self.phase2, 1, 1),
+                self.job(self.unit3, self.phase2, 2, 2),
+            ]
+        )
+        driver.problem.PRINT_SOLUTIONS = False
+        output = io.StringIO()
+        with redirect_stdout(output):
+            status, solver = driver.solve(coarse_time_limit=5)
+        self.assertIsNone(driver.coarse)
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(output.getvalue(), "")
+
+    def test_weekly_adapter_accepts_dates(self):
+        adapter = WeeklyAdapter(self.date1)
+        job = Job(self.unit1, self.phase1, adapter, self.date1, self.date3)
+        self.assertEqual(adapter.to_tick(job.end), 2)
+
+
+class TestCoarseToFineSolve(ProblemTestSetup):
+    def test_stop_search(self):
+        """The fine stage runs like Problem.solve: sink, logger and stop_search."""
+        problem = self.random_problem(n_units=8, n_positions=10)
+        problem.PRINT_SOLUTIONS = False
+        problem.SOLVERTIMELIMIT = 60
+        problem.STEPTIMELIMIT = None
+        problem.USE_MOVEMENT_LOWER_BOUND = False  # No stop at the lower bound.
+        driver = CoarseToFineSolver(problem, WeeklyAdapter(self.date1))
+
+        class StoppingSink(MemorySink):
+            def write(self, records):
+                super().write(records)
+                problem.stop_search()  # At the first fine solution.
+
+        problem.solution_sink = StoppingSink()
+        start = time.time()
+        status, solver = driver.solve(coarse_time_limit=5)
+        self.assertLess(time.time() - start, 10)
+        self.assertEqual(status, cp_model.FEASIBLE)
+        self.assertTrue(driver.projected_plan)
+        self.assertGreater(len(problem.solution_sink.records), 0)
+        self.assertIsNotNone(problem.solver_logger)
+        self.assertEqual(problem._running_solvers, [])
+        self.assertEqual(problem.SOLVERTIMELIMIT, 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import queue
+import unittest
+
+from frjmp.model.pool import SolveRequest, SolverPool
+from frjmp.model.sets.job import Job
+from frjmp.model.spec import ProblemSpec
+from tests.setup import ProblemTestSetup
+
+
+class TestSolverPool(ProblemTestSetup):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = SolverPool(n_workers=1, max_pending=4, default_time_limit=20)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def base_request(self, jobs=None, **kwargs):
+        args = dict(
+            jobs=self.jobs if jobs is None else jobs,
+            positions_configuration=self.pc,
+            position_unittype_dependency=self.pud,
+            time_adapter=self.adapter,
+        )
+        return SolveRequest(args, **kwargs)
+
+    def test_solve_returns_detached_plan(self):
+        self.assertTrue(self.pool.wait_ready(timeout=60))
+        result = self.pool.solve(self.base_request())
+
+        self.assertEqual(result.status, "OPTIMAL")
+        # Every unit enters after t0 and units 2 and 3 leave before the horizon end.
+        self.assertEqual(result.objective, 5)
+        self.assertEqual(sum(len(moves) for moves in result.movements.values()), 5)
+        self.assertEqual(result.job_indices, list(range(len(self.jobs))))
+        self.assertEqual(set(result.patterns), set(range(len(self.jobs))))
+        self.assertNotEqual(result.worker_pid, os.getpid())
+
+    def test_invalid_request_does_not_stop_the_worker(self):
+        overlapping = Job(self.unit1, self.phase1, self.adapter, self.date2, self.date3)
+        result = self.pool.solve(self.base_request(self.jobs + [overlapping]))
+        self.assertEqual(result.status, "ERROR")
+        self.assertFalse(result.has_solution)
+        self.assertIsNotNone(result.error)
+
+        self.assertEqual(self.pool.solve(self.base_request()).status, "OPTIMAL")
+
+    def test_spec_request(self):
+        spec = ProblemSpec.from_inputs(self.jobs, self.pc, self.pud, self.adapter)
+        result = self.pool.solve(SolveRequest(spec))
+        self.assertEqual(result.status, "OPTIMAL")
+        self.assertEqual(result.objective, 5)
+
+    def test_request_time_limit(self):
+        args = self.random_problem_args()
+        result = self.pool.solve(
+            SolveRequest(args, time_limit=2, properties={"STEPTIMELIMIT": None})
+        )
+        self.assertTrue(result.has_solution)
+        self.assertLess(result.solve_time, 5)
+
+
+class TestSolverPoolLimits(ProblemTestSetup):
+    def test_submit_raises_when_full(self):
+        args = self.random_problem_args()
+        with SolverPool(n_workers=1, max_pending=1) as pool:
+            first = pool.submit(SolveRequest(args, time_limit=2))
+            with self.assertRaises(queue.Full):
+                pool.submit(SolveRequest(args, time_limit=2), block=False)
+            self.assertEqual(pool.pending, 1)
+            self.assertTrue(first.result().has_solution)
+            # The slot is free again.
+            second = pool.submit(SolveRequest(args, time_limit=2), timeout=5)
+            self.assertTrue(second.result().has_solution)
+        self.assertEqual(pool.pending, 0)
+
+    def test_late_worker_is_replaced(self):
+        """A request still building its model past its time limit gets TIMEOUT."""
+        slow = self.random_problem_args(n_units=8, jobs_per_unit=4, n_positions=10)
+        with SolverPool(n_workers=1, kill_grace=0.2) as pool:
+            result = pool.solve(SolveRequest(slow, time_limit=0.01))
+            self.assertEqual(result.status, "TIMEOUT")
+            result = pool.solve(SolveRequest(self.random_problem_args(), time_limit=2))
+            self.assertTrue(result.has_solution)
+            self.assertNotEqual(result.worker_pid, os.getpid())
+
+
+if __name__ == "__main__":
+    unittest.main()
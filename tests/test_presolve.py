@@ -0,0 +1,95 @@
+import unittest
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.parameters.position_unit_model import (
+    Pattern,
+    PositionsUnitTypeDependency,
+)
+from frjmp.model.parameters.positions_configuration import PositionsConfiguration
+from frjmp.model.presolve import presolve_patterns_and_positions, prune_trigger_map
+from frjmp.model.problem import Problem
+from frjmp.model.sets.position import Position
+from tests.setup import ProblemTestSetup
+
+
+class ProblemWithoutPresolve(Problem):
+    USE_PRESOLVE = False
+
+
+class TestPresolve(ProblemTestSetup):
+    def setUp(self):
+        super().setUp()
+        # Position 5 only covers a need no job has.
+        self.position5 = Position("Position 5", [self.need3], capacity=1)
+        positions = [
+            self.position1,
+            self.position2,
+            self.position3,
+            self.position4,
+            self.position5,
+        ]
+        # The base setup Problem already generated the default single patterns.
+        self.unit_model.allowed_patterns = []
+        self.unit_model.add_multiple_patterns(
+            [
+                Pattern([self.position1]),
+                Pattern([self.position2]),
+                Pattern([self.position5]),
+                Pattern([self.position3]),
+                Pattern([self.position2, self.position5]),
+            ]
+        )
+        self.pc = PositionsConfiguration(positions=positions)
+        self.pc.add_trigger(self.position1, self.position2, {self.position5})
+        self.pc.add_trigger(
+            self.position1, self.position3, {self.position2, self.position5}
+        )
+        self.pud = PositionsUnitTypeDependency(self.unit_types, positions)
+
+    def build(self, use_presolve):
+        # The presolve runs when the Problem is created, so toggle it on a subclass.
+        problem_class = Problem if use_presolve else ProblemWithoutPresolve
+        return problem_class(self.jobs, self.pc, self.pud, self.adapter)
+
+    def test_report(self):
+        result = presolve_patterns_and_positions(self.jobs, self.pc, self.pud)
+        self.assertEqual(result.usable_patterns[self.unit_model], [0, 1, 3])
+        self.assertEqual(result.removed_patterns, {"C295": [2, 4]})
+        # Position 4 covers the need but is in no usable pattern.
+        self.assertEqual(result.removed_positions, ["Position 4", "Position 5"])
+
+        problem = self.build(True)
+        problem.build_model()
+        self.assertEqual(
+            problem.presolve.removed_triggers, [("Position 1", "Position 2")]
+        )
+        self.assertIn("2 patterns", str(problem.presolve))
+
+    def test_prune_trigger_map(self):
+        pruned, removed = prune_trigger_map(
+            {(0, 1): {4}, (0, 3): {2, 4}, (4, 1): {2}}, {0, 1, 2, 3}
+        )
+        self.assertEqual(pruned, {(0, 3): {2}})
+        self.assertEqual(removed, [(0, 1), (4, 1)])
+
+    def test_smaller_model_same_objective(self):
+        plain = self.build(False)
+        presolved = self.build(True)
+        self.assertEqual(set(presolved.movement_in_position_vars), {0, 1, 2})
+        for j_idx, p_map in presolved.assigned_vars.items():
+            self.assertNotIn(3, p_map)
+            self.assertNotIn(4, p_map)
+
+        objectives = []
+        for problem in (plain, presolved):
+            status, solver = problem.solve()
+            self.assertEqual(status, cp_model.OPTIMAL)
+            objectives.append(solver.ObjectiveValue())
+            variables = len(problem.model.Proto().variables)
+        self.assertEqual(objectives[0], objectives[1])
+        self.assertLess(variables, len(plain.model.Proto().variables))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 # python -m unittest tests/test_problem_fixed_variables.py
 from ortools.sat.python import cp_model
+from frjmp.model.problem import Problem
 from tests.setup import ProblemTestSetup
 
 
@@ -48,3 +49,52 @@ class TestFixedVariableConstraints(ProblemTestSetup):
         self.assertEqual(
             solver.Value(av[0][0][2]), 0
         )  # Check that the unit was not in p0 at t1+1 as there was a movement for unit1 in t2.
+
+    def test_fixed_pattern_is_a_constant(self):
+        problem = self.problem
+        k_map = problem.pattern_assigned_vars[0][1]
+        k_idx = next(iter(k_map))
+        problem.add_fixed_pattern_assignment(0, 1, k_idx)
+        problem.build_model()
+
+        # Fixed by domain, siblings fixed to 0 and left out of the constraints.
+        reduction = problem.fixed_reduction
+        self.assertEqual(list(reduction.pattern_assigned_vars[0][1]), [k_idx])
+        self.assertEqual(reduction.removed_patterns, len(k_map) - 1)
+        domains = problem.model.Proto().variables
+        for k, var in k_map.items():
+            self.assertEqual(list(domains[var.Index()].domain), [int(k == k_idx)] * 2)
+        # The public variable dicts keep every variable.
+        self.assertEqual(problem.pattern_assigned_vars[0][1], k_map)
+
+        status, solver = problem.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(problem.read_patterns(solver)[0][1], k_idx)
+
+    def test_contradicting_fixed_values(self):
+        self.problem.add_fixed_assignment(0, 0, 1)
+        self.problem.add_fixed_assignment(0, 0, 1, value=False)
+        status, _ = self.problem.solve()
+        self.assertEqual(status, cp_model.INFEASIBLE)
+
+    def test_fixed_past_shrinks_model(self):
+        # Re-planning: the first half of an optimal plan is fixed.
+        status, solver = self.problem.solve()
+        objective = solver.ObjectiveValue()
+        plan = self.problem.read_patterns(solver)
+        plain = Problem(self.jobs, self.pc, self.pud, self.adapter)
+        plain.build_model()
+
+        replan = Problem(self.jobs, self.pc, self.pud, self.adapter)
+        cut = replan.num_time_steps // 2
+        for j_idx, t_map in plan.items():
+            for t_idx, k_idx in t_map.items():
+                if t_idx < cut:
+                    replan.add_fixed_pattern_assignment(j_idx, t_idx, k_idx)
+        status, solver = replan.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(solver.ObjectiveValue(), objective)
+        self.assertLess(
+            len(replan.model.Proto().constraints), len(plain.model.Proto().constraints)
+        )
+        self.assertGreater(replan.fixed_reduction.determined_movements, 0)
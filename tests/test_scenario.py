@@ -0,0 +1,74 @@
+import unittest
+from datetime import timedelta
+
+from frjmp.model.scenario import Scenario, ScenarioRunner
+from frjmp.model.sets.job import Job
+from frjmp.model.sets.unit import Unit
+from tests.setup import ProblemTestSetup
+
+
+class TestScenarioRunner(ProblemTestSetup):
+    def setUp(self):
+        super().setUp()
+        self.runner = ScenarioRunner(self.jobs, self.pc, self.pud, self.adapter)
+
+    def test_delay_updates_timeline(self):
+        """Delaying job2 removes its old end tick from the timeline and adds the new one."""
+        scenario = Scenario("delay", delays={1: 2})
+        jobs, timeline = self.runner.build_scenario_jobs(scenario)
+        compressed_ticks = timeline[0]
+
+        new_end = self.adapter.to_tick(self.date2) + 2
+        self.assertIn(new_end, compressed_ticks)
+        # job3 still ends on date2 so that tick must remain.
+        self.assertIn(self.adapter.to_tick(self.date2), compressed_ticks)
+        self.assertEqual(jobs[1].end, self.date2 + timedelta(days=2))
+        # Base jobs are not modified.
+        self.assertEqual(self.jobs[1].end, self.date2)
+
+    def test_invalid_scenarios_are_reported(self):
+        overlapping = Job(self.unit1, self.phase1, self.adapter, self.date2, self.date3)
+        scenarios = [
+            Scenario("unknown position", closed_positions=["Position 99"]),
+            Scenario("overlap", added_jobs=[overlapping]),
+        ]
+        table = self.runner.run(scenarios, max_workers=1)
+        self.assertEqual(list(table["status"]), ["INVALID", "INVALID"])
+
+    def test_duplicated_names_raise(self):
+        scenarios = [
+            Scenario("closed"),
+            Scenario("closed", closed_positions=["Position 4"]),
+        ]
+        with self.assertRaises(ValueError):
+            self.runner.run(scenarios, max_workers=1)
+
+    def test_run_comparison_table(self):
+        new_unit = Unit("MSN 005", self.unit_model)
+        scenarios = [
+            Scenario("base"),
+            Scenario("close stand", closed_positions=["Position 4"]),
+            Scenario(
+                "new unit",
+                added_jobs=[
+                    Job(new_unit, self.phase1, self.adapter, self.date1, self.date2)
+                ],
+            ),
+            Scenario("too many closed", closed_positions=["Position 3", "Position 4"]),
+        ]
+        table = self.runner.run(scenarios, max_workers=2, time_limit=10)
+
+        self.assertEqual(list(table["scenario"]), [s.name for s in scenarios])
+        self.assertEqual(list(table["status"][:3]), ["OPTIMAL"] * 3)
+        # Every unit enters after t0 and units 2 and 3 leave before the horizon end.
+        self.assertEqual(list(table["objective"][:3]), [5, 5, 7])
+        self.assertEqual(list(table["movements"][:3]), [5, 5, 7])
+        # 3 units at the same time and only 2 open positions: rejected by the capacity validation.
+        self.assertEqual(table["status"][3], "INVALID")
+        self.assertIn("capacity", table["error"][3])
+        # The base positions are not closed by the scenarios.
+        self.assertTrue(all(p.capacity == 1 for p in self.pc.positions))
+
+
+if __name__ == "__main__":
+    unittest.main()
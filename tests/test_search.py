@@ -0,0 +1,55 @@
+import unittest
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.problem import Problem
+from tests.setup import ProblemTestSetup
+
+
+class ChronologicalProblem(Problem):
+    SEARCH_STRATEGY = "chronological_fixed"
+
+
+class TestSearchStrategy(ProblemTestSetup):
+    def test_no_strategy_by_default(self):
+        self.problem.build_model()
+        self.assertEqual(len(self.problem.model.Proto().search_strategy), 0)
+
+    def test_chronological_order(self):
+        problem = ChronologicalProblem(self.jobs, self.pc, self.pud, self.adapter)
+        problem.build_model()
+        (strategy,) = problem.model.Proto().search_strategy
+        self.assertEqual(
+            strategy.domain_reduction_strategy,
+            cp_model.SELECT_MAX_VALUE,
+        )
+        # t=1, unit by unit: "the unit does not move" (negated), then its patterns.
+        expected = []
+        for j_idx, unit_name in enumerate(["MSN 001", "MSN 002", "MSN 003"]):
+            movement = problem.unit_movement_vars[unit_name][0].Index()
+            expected.append((movement, -1, 1))
+            expected.extend(
+                (var.Index(), 1, 0)
+                for var in problem.pattern_assigned_vars[j_idx][1].values()
+            )
+        exprs = [
+            (e.vars[0], e.coeffs[0], e.offset) for e in strategy.exprs[: len(expected)]
+        ]
+        self.assertEqual(exprs, expected)
+
+    def test_same_objective(self):
+        status, solver = self.problem.solve()
+        problem = ChronologicalProblem(self.jobs, self.pc, self.pud, self.adapter)
+        fixed_status, fixed_solver = problem.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(fixed_status, cp_model.OPTIMAL)
+        self.assertEqual(solver.ObjectiveValue(), fixed_solver.ObjectiveValue())
+
+    def test_unknown_strategy(self):
+        self.problem.SEARCH_STRATEGY = "random"
+        with self.assertRaises(ValueError):
+            self.problem.build_model()
+
+
+if __name__ == "__main__":
+    unittest.main()
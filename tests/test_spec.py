@@ -0,0 +1,84 @@
+import os
+import pickle
+import tempfile
+import unittest
+from datetime import date
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.adapter import ShiftAdapter
+from frjmp.model.problem import Problem
+from frjmp.model.sets.job import Job
+from frjmp.model.sets.unit import Unit
+from frjmp.model.spec import ProblemSpec, adapter_config, adapter_from_config
+from tests.setup import ProblemTestSetup
+
+
+class TestProblemSpec(ProblemTestSetup):
+    def spec(self, **kwargs):
+        return ProblemSpec.from_inputs(
+            self.jobs, self.pc, self.pud, self.adapter, **kwargs
+        )
+
+    def test_serialization_round_trips(self):
+        spec = self.spec(
+            initial_conditions={"assignments": {self.unit1: [self.position1]}},
+            properties={"USE_CAPACITY_CUTS": True},
+        )
+        self.assertEqual(ProblemSpec.from_json(spec.to_json()), spec)
+        self.assertEqual(pickle.loads(pickle.dumps(spec)), spec)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "spec.npz")
+            spec.save(path)
+            loaded = ProblemSpec.load(path)
+        self.assertEqual(loaded.content_hash, spec.content_hash)
+        self.assertEqual(loaded.initial_conditions, {0: [0]})
+
+    def test_content_hash(self):
+        """Equal inputs give equal hashes, any change gives a new one."""
+        self.assertEqual(self.spec().content_hash, self.spec().content_hash)
+        self.assertEqual(len(self.spec().content_hash), 64)
+
+        moved = Job(self.unit1, self.phase1, self.adapter, self.date1, self.date4)
+        jobs = [moved] + self.jobs[1:]
+        other = ProblemSpec.from_inputs(jobs, self.pc, self.pud, self.adapter)
+        self.assertNotEqual(other.content_hash, self.spec().content_hash)
+        properties = self.spec(properties={"USE_PRESOLVE": False})
+        self.assertNotEqual(properties.content_hash, self.spec().content_hash)
+
+    def test_build_solves_like_the_original(self):
+        problem = self.spec(properties={"PRINT_SOLUTIONS": False}).build()
+        self.assertIsInstance(problem, Problem)
+        self.assertFalse(problem.PRINT_SOLUTIONS)
+        self.assertEqual(len(problem.jobs), len(self.jobs))
+        status, solver = problem.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(solver.ObjectiveValue(), 5)
+
+    def test_from_problem(self):
+        problem = Problem(self.jobs, self.pc, self.pud, self.adapter)
+        problem.USE_SYMMETRY_BREAKING = True
+        spec = ProblemSpec.from_problem(problem)
+        self.assertEqual(spec.properties, {"USE_SYMMETRY_BREAKING": True})
+        self.assertEqual(spec.t_last, problem.t_last_tick)
+        rebuilt = spec.build()
+        self.assertEqual(rebuilt.compressed_ticks, problem.compressed_ticks)
+        self.assertEqual(ProblemSpec.from_problem(rebuilt), spec)
+
+    def test_adapter_config(self):
+        adapter = ShiftAdapter((date(2025, 1, 1), "M"), ["M", "A", "N"])
+        rebuilt = adapter_from_config(adapter_config(adapter))
+        self.assertEqual(rebuilt.to_tick((date(2025, 1, 2), "N")), 5)
+
+        with self.assertRaises(ValueError):
+            adapter_config(object())
+
+    def test_unknown_unit_type_raises(self):
+        stranger = Unit("Stranger", type(self.unit_model)("Other"))
+        job = Job(stranger, self.phase1, self.adapter, self.date1, self.date2)
+        with self.assertRaises(ValueError):
+            ProblemSpec.from_inputs([job], self.pc, self.pud, self.adapter)
+
+
+if __name__ == "__main__":
+    unittest.main()
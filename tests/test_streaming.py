@@ -0,0 +1,47 @@
+import time
+import unittest
+
+from ortools.sat.python import cp_model
+
+from frjmp.model.problem import Problem
+from tests.setup import ProblemTestSetup
+
+
+class TestPlanStream(ProblemTestSetup):
+    def test_snapshots_until_optimal(self):
+        with self.problem.stream_solutions() as stream:
+            snapshots = list(stream)
+        self.assertEqual(stream.status, cp_model.OPTIMAL)
+        self.assertGreater(len(snapshots), 0)
+        objectives = [s.objective for s in snapshots]
+        self.assertEqual(objectives, sorted(objectives, reverse=True))
+        last = snapshots[-1]
+        self.assertEqual(last.objective, stream.solver.ObjectiveValue())
+        self.assertEqual(last.patterns(), self.problem.read_patterns(stream.solver))
+        self.assertEqual(len(last.values), len(stream.layout.indices))
+        self.assertEqual(len(last.pattern_array()), len(stream.layout.slots))
+
+    def test_close_cancels_search(self):
+        problem = self.random_problem()
+        start = time.time()
+        stream = problem.stream_solutions()
+        first = next(stream)
+        stream.close()
+        self.assertLess(time.time() - start, 5)
+        self.assertEqual(stream.status, cp_model.FEASIBLE)
+        self.assertGreaterEqual(first.objective, stream.solver.ObjectiveValue())
+        self.assertFalse(stream._thread.is_alive())
+        with self.assertRaises(StopIteration):
+            next(stream)
+
+    def test_interval_engine_not_supported(self):
+        class IntervalProblem(Problem):
+            MODEL_ENGINE = "interval"
+
+        problem = IntervalProblem(self.jobs, self.pc, self.pud, self.adapter)
+        with self.assertRaises(ValueError):
+            problem.stream_solutions()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,13 +4,19 @@ from datetime import date
 from frjmp.utils.timeline_utils import (
     trim_jobs_before_time_inplace,
     compress_timepoints,
+    build_event_timeline,
+    get_active_time_indices,
 )
 
+from ortools.sat.python import cp_model
+
 from frjmp.model.adapter import DailyAdapter
+from frjmp.model.problem import Problem
 from frjmp.model.sets.job import Job
 from frjmp.model.sets.phase import Phase
 from frjmp.model.sets.need import Need
 from frjmp.model.sets.unit import Unit, UnitType
+from tests.setup import ProblemTestSetup
 
 
 class TestCompressTimepoints(unittest.TestCase):
@@ -78,5 +84,60 @@ class TestCompressTimepoints(unittest.TestCase):
         )  # job3.start should have remain unmodified.
 
 
+class TestEventTimeline(unittest.TestCase):
+    def setUp(self):
+        model = UnitType("C295")
+        unit1 = Unit("185", model)
+        unit2 = Unit("186", model)
+        phase = Phase("4Y", Need("WP"))
+        self.adapter = DailyAdapter(origin=date(2025, 1, 1))
+        # Ticks: job1 [0, 5], job2 [6, 10] (same unit, back to back), job3 [2, 8].
+        self.jobs = [
+            Job(unit1, phase, self.adapter, date(2025, 1, 1), date(2025, 1, 6)),
+            Job(unit1, phase, self.adapter, date(2025, 1, 7), date(2025, 1, 11)),
+            Job(unit2, phase, self.adapter, date(2025, 1, 3), date(2025, 1, 9)),
+        ]
+
+    def test_event_boundaries(self):
+        starts = [self.adapter.to_tick(j.start) for j in self.jobs]
+        ends = [self.adapter.to_tick(j.end) for j in self.jobs]
+        timeline, reduction = build_event_timeline(
+            starts, ends, self.adapter, keep_ticks=[-1], last_tick=10
+        )
+        compressed, tick_to_index, index_to_tick, index_to_value = timeline
+
+        # job1 end (5) and job2 start (6) share the boundary 6; 11 is after last_tick.
+        self.assertEqual(compressed, [-1, 0, 2, 6, 9])
+        self.assertEqual(index_to_value[3], date(2025, 1, 7))
+        self.assertEqual(reduction.inclusive_steps, 7)
+        self.assertEqual(reduction.event_steps, 5)
+        self.assertEqual(reduction.removed_steps, 2)
+
+        # Active steps are read with the usual inclusive check.
+        active = [
+            get_active_time_indices(job, compressed, tick_to_index, self.adapter)
+            for job in self.jobs
+        ]
+        self.assertEqual(active, [[1, 2], [3, 4], [2, 3]])
+
+
+class EventTimelineProblem(Problem):
+    USE_EVENT_TIMELINE = True
+
+
+class TestProblemEventTimeline(ProblemTestSetup):
+    def test_same_objective_with_fewer_steps(self):
+        problem = EventTimelineProblem(self.jobs, self.pc, self.pud, self.adapter)
+        self.assertIsNone(self.problem.timeline_reduction)
+        self.assertEqual(problem.timeline_reduction.inclusive_steps, 4)
+        self.assertEqual(problem.num_time_steps, 3)
+
+        status, solver = self.problem.solve()
+        event_status, event_solver = problem.solve()
+        self.assertEqual(status, cp_model.OPTIMAL)
+        self.assertEqual(event_status, cp_model.OPTIMAL)
+        self.assertEqual(solver.ObjectiveValue(), event_solver.ObjectiveValue())
+
+
 if __name__ == "__main__":
     unittest.main()